@@ -2,39 +2,107 @@
 """Generate and serve a review page for eval results.
 
 Reads the workspace directory, discovers runs (directories with outputs/),
-embeds all output data into a self-contained HTML page, and serves it via
-a tiny HTTP server. Feedback auto-saves to feedback.json in the workspace.
+and serves a review page via a tiny HTTP server. Feedback auto-saves to
+feedback.json in the workspace.
+
+The served page embeds no runs: the viewer's virtualized run list pages
+through /api/runs?offset=&limit=&filter= and loads each run from
+/api/runs/<id> when it is shown. Text outputs come inline with the run,
+only their first and last few KB when large; the viewer pages through the
+rest with GET /api/text/<run_id>/<name>?offset=&length= (byte ranges);
+images, PDFs, spreadsheets and other binaries are served lazily from
+/files/<run_id>/<name> (with Range, ETag and Cache-Control). With Pillow
+(images) or pdftoppm (PDFs) available, thumbnails and downscaled previews
+are made in the background as runs are indexed, cached by content hash
+under <workspace>/.review-cache, and served as ?rendition=thumb|preview;
+the viewer fetches the full asset only on click. Spreadsheets are parsed
+server-side by a streaming stdlib reader, queued as soon as their run is
+fetched and LRU-cached; the viewer shows the first rows of each sheet and
+pages further with GET /api/xlsx/<run_id>/<name>?sheet=&rows=a-b. --static writes a
+self-contained HTML page with everything embedded instead; --static-dir
+writes a static bundle (see StaticBundle): a small page that loads runs
+from shard files, with outputs stored once per content hash across runs
+and iterations.
+
+Runs are kept in an in-memory index that is refreshed incrementally
+(inotify on Linux, stat walks elsewhere), so a reload only re-reads runs
+that changed; GET /api/index reports the index generation. While a
+viewer is open, a background watcher keeps the index fresh and
+GET /api/events streams run added/updated/graded/removed events (SSE),
+which the viewer applies in place. The page is
+cached per generation and sent gzip- or (if the brotli module is
+installed) brotli-compressed with a strong ETag, so an unchanged reload
+is a 304. Requests are handled on a small thread pool, and feedback is
+saved one run at a time (PUT /api/feedback/<run_id>) through atomic
+temp-file + rename writes.
 
 Usage:
     python generate_review.py <workspace-path> [--port PORT] [--skill-name NAME]
     python generate_review.py <workspace-path> --previous-feedback /path/to/old/feedback.json
+    python generate_review.py <workspace-path> --static-dir review-bundle/
 
-No dependencies beyond the Python stdlib are required.
+No dependencies beyond the Python stdlib are required; brotli, Pillow and
+pdftoppm are used when present.
 """
 
 import argparse
 import base64
+import contextlib
+import gzip
+import hashlib
+import io
 import json
 import mimetypes
 import os
 import re
+import select
+import shutil
 import signal
+import struct
 import subprocess
 import sys
+import tempfile
+import threading
 import time
-import webbrowser
+import xml.etree.ElementTree as ET
+import zipfile
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from email.utils import formatdate
 from functools import partial
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
+from urllib.parse import parse_qs, quote, unquote
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still serialises this server's writes
+    fcntl = None
 
 # Files to exclude from output listings
 METADATA_FILES = {"transcript.md", "user_notes.md", "metrics.json"}
 
+# Directories never searched for runs
+SKIP_DIRS = {"node_modules", ".git", "__pycache__", "skill", "inputs", ".review-cache"}
+
 # Extensions we render as inline text
 TEXT_EXTENSIONS = {
     ".txt", ".md", ".json", ".csv", ".py", ".js", ".ts", ".tsx", ".jsx",
     ".yaml", ".yml", ".xml", ".html", ".css", ".sh", ".rb", ".go", ".rs",
-    ".java", ".c", ".cpp", ".h", ".hpp", ".sql", ".r", ".toml",
+    ".java", ".c", ".cpp", ".h", ".hpp", ".sql", ".r", ".toml", ".log",
 }
 
 # Extensions we render as inline images
@@ -57,32 +125,824 @@ def get_mime_type(path: Path) -> str:
     return mime or "application/octet-stream"
 
 
-def find_runs(workspace: Path) -> list[dict]:
-    """Recursively find directories that contain an outputs/ subdirectory."""
+# Served output files are revalidated on every use; the ETag makes that a cheap 304
+FILE_CACHE_CONTROL = "private, no-cache"
+FILE_CHUNK_SIZE = 256 * 1024
+
+VIEWER_TEMPLATE = Path(__file__).parent / "viewer.html"
+
+# The review page is revalidated on every load; unchanged pages come back as 304
+PAGE_CACHE_CONTROL = "no-cache"
+# Responses smaller than this are sent uncompressed
+COMPRESS_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 6
+
+# /api/runs page size: default and largest allowed
+RUN_PAGE_SIZE = 100
+RUN_PAGE_MAX = 1000
+# Prompt characters kept in /api/runs summaries
+RUN_PROMPT_PREVIEW = 160
+
+# Image/PDF renditions (longest side in px), cached under <workspace>/.review-cache
+RENDITION_SIZES = {"thumb": 320, "preview": 1280}
+RENDITION_WORKERS = min(4, os.cpu_count() or 1)
+# Workers kept for renditions a viewer is waiting on, ahead of prefetched ones
+RENDITION_URGENT_WORKERS = 2
+# Seconds a request waits for a rendition still being made before it is
+# redirected to the full asset; a request thread is never held longer
+RENDITION_WAIT = 0.1
+RASTER_EXTENSIONS = IMAGE_EXTENSIONS - {".svg"}
+
+# Text outputs on served pages: bytes sent inline from the start and end of
+# a larger file, and the largest range /api/text returns at once
+TEXT_HEAD_BYTES = 64 * 1024
+TEXT_TAIL_BYTES = 16 * 1024
+TEXT_PAGE_MAX = 1024 * 1024
+
+# xlsx previews (/api/xlsx): rows per sheet in the first response, the
+# largest ?rows= range, columns kept per row, and workbooks kept parsed
+XLSX_PREVIEW_ROWS = 100
+XLSX_PAGE_MAX = 1000
+XLSX_MAX_COLUMNS = 256
+XLSX_CACHE_SIZE = 16
+XLSX_WORKERS = 2
+
+# Live updates (/api/events): how often the watcher refreshes without inotify,
+# how long it lets a burst of writes settle, the keep-alive interval, and how
+# many events a reconnecting client can catch up on
+WATCH_INTERVAL = 2.0
+WATCH_SETTLE = 0.25
+EVENT_HEARTBEAT = 15.0
+EVENT_LOG_SIZE = 1000
+
+# Requests handled at once; a slow page build no longer blocks feedback saves
+SERVER_WORKERS = 8
+# Event streams held open at once; each runs on its own thread, outside
+# the request pool, so open tabs never starve API and feedback requests
+MAX_EVENT_STREAMS = 32
+# Largest feedback request body accepted
+MAX_FEEDBACK_BYTES = 16 * 1024 * 1024
+# Review states the viewer saves: autosave and the final submit
+FEEDBACK_STATUSES = ("in_progress", "complete")
+
+# Static bundles (--static-dir): runs per shard file, and hex digits of the
+# content hash kept in shard names and text references
+BUNDLE_SHARD_SIZE = 50
+BUNDLE_NAME_DIGITS = 20
+
+
+def find_runs(workspace: Path, file_route: str | None = None, run_dirs: dict[str, Path] | None = None) -> list[dict]:
+    """Recursively find directories that contain an outputs/ subdirectory.
+
+    With file_route (e.g. "/files"), non-text outputs carry a URL under it
+    instead of their embedded contents, and run_dirs is filled with
+    run_id -> run directory so the server can resolve those URLs.
+    """
     runs: list[dict] = []
-    _find_runs_recursive(workspace, workspace, runs)
+    _find_runs_recursive(workspace, workspace, runs, file_route, run_dirs)
     runs.sort(key=lambda r: (r.get("eval_id", float("inf")), r["id"]))
     return runs
 
 
-def _find_runs_recursive(root: Path, current: Path, runs: list[dict]) -> None:
+def _find_runs_recursive(
+    root: Path, current: Path, runs: list[dict], file_route: str | None, run_dirs: dict[str, Path] | None
+) -> None:
     if not current.is_dir():
         return
 
     outputs_dir = current / "outputs"
     if outputs_dir.is_dir():
-        run = build_run(root, current)
+        run = build_run(root, current, file_route)
         if run:
             runs.append(run)
+            if run_dirs is not None:
+                run_dirs[run["id"]] = current
         return
 
-    skip = {"node_modules", ".git", "__pycache__", "skill", "inputs"}
     for child in sorted(current.iterdir()):
-        if child.is_dir() and child.name not in skip:
-            _find_runs_recursive(root, child, runs)
+        if child.is_dir() and child.name not in SKIP_DIRS:
+            _find_runs_recursive(root, child, runs, file_route, run_dirs)
+
+
+class _Inotify:
+    """Linux inotify through ctypes: one watch per directory, drained without blocking."""
+
+    IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+    IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x40, 0x80, 0x100, 0x200
+    IN_DELETE_SELF, IN_MOVE_SELF = 0x400, 0x800
+    IN_Q_OVERFLOW, IN_IGNORED, IN_ONLYDIR = 0x4000, 0x8000, 0x1000000
+    IN_NONBLOCK, IN_CLOEXEC = 0o4000, 0o2000000
+    MASK = (
+        IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+        | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    )
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._ctypes = ctypes
+        self.paths: dict[int, Path] = {}
+        self.wds: dict[Path, int] = {}
+
+    def watch(self, path: Path) -> None:
+        if path in self.wds:
+            return
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            raise OSError(self._ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self.paths[wd] = path
+        self.wds[path] = wd
+
+    def drain(self) -> set[Path] | None:
+        """Directories with changes since the last drain, or None if events were lost."""
+        changed: set[Path] = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_len = self.EVENT.unpack_from(data, offset)
+                offset += self.EVENT.size + name_len
+                if mask & self.IN_Q_OVERFLOW:
+                    return None
+                path = self.paths.get(wd)
+                if mask & self.IN_IGNORED and path is not None:
+                    # The directory is gone; a recreated one gets a fresh watch on the next walk
+                    del self.paths[wd]
+                    self.wds.pop(path, None)
+                if path is not None:
+                    changed.add(path)
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class RunIndex:
+    """In-memory index of a workspace's runs, refreshed incrementally.
+
+    A refresh only rebuilds runs whose signature changed: the mtime and
+    size of the run directory, its outputs/ entries and the metadata files
+    build_run reads. On Linux, inotify narrows the walk to the directories
+    that changed; elsewhere (or if inotify is unavailable) every refresh is
+    a stat-only walk, which still never re-reads an unchanged run. Each
+    refresh that changes anything bumps `generation`.
+
+    Every change after the first scan is also logged as an event ("added",
+    "updated", "graded" or "removed", with the run's summary) under an
+    increasing sequence number; events_since() blocks until there are new
+    ones. While anyone is subscribed, start_watcher()'s thread refreshes in
+    the background, so events flow without page loads.
+    """
+
+    def __init__(
+        self, workspace: Path, file_route: str | None = "/files", use_inotify: bool = True, on_build=None
+    ):
+        self.workspace = workspace
+        self.file_route = file_route
+        # Called with (run_dir, run) whenever a run is (re)built
+        self.on_build = on_build
+        self.generation = 0
+        self._runs: dict[Path, dict] = {}
+        self._signatures: dict[Path, tuple] = {}
+        self._by_id: dict[str, Path] = {}
+        self._sorted: list[dict] | None = None
+        self._summaries: list[dict] = []
+        self._haystacks: list[str] = []
+        self._lock = threading.Lock()
+        self._inotify: _Inotify | None = None
+        self._scanned = False
+        # Serialises rescans; _lock only guards swapping their results in
+        self._refresh_lock = threading.Lock()
+        self._scans_started = 0
+        self._events: deque[tuple[int, dict]] = deque(maxlen=EVENT_LOG_SIZE)
+        self.event_seq = 0
+        self._events_changed = threading.Condition(self._lock)
+        self._subscribers = 0
+        self._listening = threading.Event()
+        self.closed = False
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except OSError:
+                self._inotify = None
+
+    @property
+    def watching(self) -> bool:
+        return self._inotify is not None
+
+    def _watch(self, directory: Path) -> None:
+        if self._inotify is None:
+            return
+        try:
+            self._inotify.watch(directory)
+        except OSError:
+            # Out of watches (fs.inotify.max_user_watches): fall back to stat walks
+            self._inotify.close()
+            self._inotify = None
+
+    @staticmethod
+    def _stat(path: Path) -> tuple:
+        try:
+            st = path.stat()
+        except OSError:
+            return ()
+        return (st.st_mtime_ns, st.st_size)
+
+    def _signature(self, run_dir: Path) -> tuple:
+        parts = [self._stat(run_dir)]
+        for candidate in (
+            run_dir / "eval_metadata.json", run_dir.parent / "eval_metadata.json",
+            run_dir / "transcript.md", run_dir / "grading.json", run_dir.parent / "grading.json",
+        ):
+            parts.append(self._stat(candidate))
+        outputs = []
+        try:
+            with os.scandir(run_dir / "outputs") as entries:
+                for entry in entries:
+                    st = entry.stat()
+                    outputs.append((entry.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            pass
+        parts.append(tuple(sorted(outputs)))
+        return tuple(parts)
+
+    def _walk(self, current: Path, found: set[Path], built: dict[Path, tuple[dict, tuple]]) -> None:
+        """Find runs under current, building those whose signature changed into built."""
+        if not current.is_dir():
+            return
+        if (current / "outputs").is_dir():
+            found.add(current)
+            signature = self._signature(current)
+            if self._signatures.get(current) != signature:
+                run = build_run(self.workspace, current, self.file_route)
+                if run:
+                    built[current] = (run, signature)
+            self._watch(current)
+            self._watch(current / "outputs")
+            return
+
+        self._watch(current)
+        try:
+            children = sorted(current.iterdir())
+        except OSError:
+            return
+        for child in children:
+            if child.is_dir() and child.name not in SKIP_DIRS:
+                self._walk(child, found, built)
+
+    def _apply(self, root: Path, found: set[Path], built: dict[Path, tuple[dict, tuple]], events: list[dict]) -> bool:
+        """Swap one subtree's scan into the index (caller holds _lock); True if anything changed."""
+        for run_dir, (run, signature) in built.items():
+            previous = self._runs.get(run_dir)
+            if previous is None:
+                kind = "added"
+            elif previous.get("grading") != run.get("grading"):
+                kind = "graded"
+            else:
+                kind = "updated"
+            events.append({"type": kind, "id": run["id"], "summary": run_summary(run)})
+            self._runs[run_dir] = run
+            self._signatures[run_dir] = signature
+            self._by_id[run["id"]] = run_dir
+        removed = [d for d in self._runs if d.is_relative_to(root) and d not in found]
+        for run_dir in removed:
+            run = self._runs.pop(run_dir)
+            self._signatures.pop(run_dir, None)
+            self._by_id.pop(run["id"], None)
+            events.append({"type": "removed", "id": run["id"]})
+        return bool(built or removed)
+
+    def _dirty_roots(self) -> list[Path] | None:
+        """Smallest set of subtrees to re-walk for the pending inotify events."""
+        changed_dirs = self._inotify.drain()
+        if changed_dirs is None:
+            return None
+        roots = set()
+        for directory in changed_dirs:
+            # Changes inside a run (or its outputs/) re-walk that run; eval-level
+            # files like eval_metadata.json re-walk the runs under that directory
+            root = directory.parent if directory.name == "outputs" else directory
+            if not root.exists():
+                root = root.parent
+            roots.add(root)
+        # Drop roots nested inside another root
+        return [r for r in roots if not any(r != o and r.is_relative_to(o) for o in roots)]
+
+    def refresh(self) -> int:
+        """Bring the index up to date and return the current generation.
+
+        The walk and build_run happen under _refresh_lock only, so readers
+        (runs(), get(), events) never wait on a rescan; the results are
+        swapped in under _lock, and on_build runs after both are released.
+        A caller that waited while a newer refresh ran reuses its result.
+        """
+        started = self._scans_started
+        with self._refresh_lock:
+            if self._scans_started > started and self._scanned:
+                return self.generation
+            self._scans_started += 1
+            if not self._scanned or self._inotify is None:
+                roots = [self.workspace]
+            else:
+                roots = self._dirty_roots()
+                if roots is None:
+                    roots = [self.workspace]
+                else:
+                    roots = [root for root in roots if root.is_relative_to(self.workspace)]
+            scans = []
+            for root in roots:
+                found: set[Path] = set()
+                built: dict[Path, tuple[dict, tuple]] = {}
+                self._walk(root, found, built)
+                scans.append((root, found, built))
+
+            events: list[dict] = []
+            with self._lock:
+                changed = False
+                for root, found, built in scans:
+                    changed |= self._apply(root, found, built, events)
+                if changed:
+                    self.generation += 1
+                    self._sorted = None
+                if self._scanned:
+                    for event in events:
+                        event["generation"] = self.generation
+                        event["count"] = len(self._runs)
+                        self.event_seq += 1
+                        self._events.append((self.event_seq, event))
+                    if events:
+                        self._events_changed.notify_all()
+                self._scanned = True
+                generation = self.generation
+
+        if self.on_build:
+            for _, _, built in scans:
+                for run_dir, (run, _) in built.items():
+                    self.on_build(run_dir, run)
+        return generation
+
+    def events_since(self, seq: int, timeout: float) -> list[tuple[int, dict]] | None:
+        """Events after seq, waiting up to timeout for some; None if seq is too old to catch up from."""
+        with self._lock:
+            self._events_changed.wait_for(lambda: self.event_seq > seq or self.closed, timeout)
+            if self.event_seq > seq and (not self._events or self._events[0][0] > seq + 1):
+                return None
+            return [(n, event) for n, event in self._events if n > seq]
+
+    def subscribe(self, limit: int) -> bool:
+        """Register an event listener (at most limit at once); False if full."""
+        with self._lock:
+            if self._subscribers >= limit:
+                return False
+            self._subscribers += 1
+            self._listening.set()
+            return True
+
+    def unsubscribe(self) -> None:
+        with self._lock:
+            self._subscribers -= 1
+            if not self._subscribers:
+                self._listening.clear()
+
+    def start_watcher(self) -> None:
+        threading.Thread(target=self._watch_loop, name="run-index-watcher", daemon=True).start()
+
+    def _watch_loop(self) -> None:
+        while not self.closed:
+            self._listening.wait()
+            inotify = self._inotify
+            if inotify is not None:
+                # Wakes on the first change; then let the burst of writes settle
+                try:
+                    readable, _, _ = select.select([inotify.fd], [], [], WATCH_INTERVAL)
+                except (OSError, ValueError):
+                    # inotify was closed (out of watches); later passes poll
+                    continue
+                if not readable:
+                    continue
+                time.sleep(WATCH_SETTLE)
+            else:
+                time.sleep(WATCH_INTERVAL)
+            if not self.closed:
+                self.refresh()
+
+    def close(self) -> None:
+        """Stop the watcher and release anyone waiting in events_since()."""
+        with self._lock:
+            self.closed = True
+            self._events_changed.notify_all()
+        self._listening.set()
+
+    def _ensure_sorted(self) -> None:
+        if self._sorted is None:
+            self._sorted = sorted(self._runs.values(), key=lambda r: (r.get("eval_id", float("inf")), r["id"]))
+            self._summaries = [run_summary(run) for run in self._sorted]
+            self._haystacks = [f"{run['id']}\n{run['prompt']}".lower() for run in self._sorted]
+
+    def runs(self) -> list[dict]:
+        with self._lock:
+            self._ensure_sorted()
+            return self._sorted
+
+    def summaries(self, text: str = "") -> list[dict]:
+        """run_summary() of each run in runs() order, only those whose id or prompt contains text."""
+        with self._lock:
+            self._ensure_sorted()
+            if not text:
+                return self._summaries
+            text = text.lower()
+            return [s for s, haystack in zip(self._summaries, self._haystacks) if text in haystack]
+
+    def get(self, run_id: str) -> dict | None:
+        with self._lock:
+            run_dir = self._by_id.get(run_id)
+            return self._runs.get(run_dir) if run_dir else None
+
+    def run_dir(self, run_id: str) -> Path | None:
+        with self._lock:
+            return self._by_id.get(run_id)
+
+
+class Renditions:
+    """Thumbnails and downscaled previews of image and PDF outputs.
+
+    Made on a background thread pool as runs are indexed, and cached in
+    cache_dir as <sha256>-<variant>.png|jpg, keyed by content hash so
+    identical outputs share them across runs, iterations and restarts.
+    Raster images need Pillow and PDFs need pdftoppm (poppler); without
+    them `extensions` is empty and the viewer loads full assets as before.
+    An image rendition that would not be smaller than the original is not
+    kept, and the original is served instead. Renditions a request asks
+    for run on a separate small pool, so they never queue behind a
+    workspace's worth of prefetching.
+    """
 
+    def __init__(self, cache_dir: Path, workers: int = RENDITION_WORKERS):
+        self.cache_dir = cache_dir
+        self.pdftoppm = shutil.which("pdftoppm")
+        self.extensions = (RASTER_EXTENSIONS if Image is not None else set()) | ({".pdf"} if self.pdftoppm else set())
+        self._pool = self._urgent = None
+        if self.extensions:
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rendition")
+            self._urgent = ThreadPoolExecutor(max_workers=RENDITION_URGENT_WORKERS, thread_name_prefix="rendition-urgent")
+        self._jobs: dict[tuple, Future] = {}
+        self._urgent_keys: set[tuple] = set()
+        self._digests: dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, run_dir: Path, run: dict) -> None:
+        """Queue every rendition of a freshly indexed run's outputs."""
+        for output in run["outputs"]:
+            for variant in RENDITION_SIZES:
+                self.submit(run_dir / "outputs" / output["name"], variant)
+
+    def submit(self, path: Path, variant: str, urgent: bool = False) -> Future | None:
+        """Queue a rendition; urgent ones jump ahead of prefetched work not yet started."""
+        if self._pool is None or path.suffix.lower() not in self.extensions:
+            return None
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        key = (path, st.st_mtime_ns, st.st_size, variant)
+        with self._lock:
+            job = self._jobs.get(key)
+            # cancel() only succeeds while a prefetch job is still queued
+            if job is None or (urgent and key not in self._urgent_keys and job.cancel()):
+                pool = self._urgent if urgent else self._pool
+                job = self._jobs[key] = pool.submit(self._make, path, key[:3], variant)
+                if urgent:
+                    self._urgent_keys.add(key)
+            return job
+
+    def get(self, path: Path, variant: str, wait: float = RENDITION_WAIT) -> Path | None:
+        """The rendition's file, or None if there is none yet (serve the original)."""
+        job = self.submit(path, variant, urgent=True)
+        if job is None:
+            return None
+        try:
+            return job.result(timeout=wait)
+        except (FutureTimeoutError, CancelledError):
+            # Still rendering: this request gets the original
+            return None
+        except OSError as e:
+            print(f"Warning: could not render {path.name}: {e}", file=sys.stderr)
+            return None
+
+    def _digest(self, path: Path, stat_key: tuple) -> str:
+        with self._lock:
+            digest = self._digests.get(stat_key)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                while chunk := f.read(FILE_CHUNK_SIZE):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            with self._lock:
+                self._digests[stat_key] = digest
+        return digest
+
+    def _make(self, path: Path, stat_key: tuple, variant: str) -> Path | None:
+        digest = self._digest(path, stat_key)
+        shard = self.cache_dir / digest[:2]
+        stem = f"{digest}-{variant}"
+        for ext in (".jpg", ".png"):
+            if (shard / (stem + ext)).exists():
+                return shard / (stem + ext)
+        if (shard / (stem + ".orig")).exists():
+            return None
+
+        edge = RENDITION_SIZES[variant]
+        is_pdf = path.suffix.lower() == ".pdf"
+        try:
+            data, ext = self._render_pdf(path, edge) if is_pdf else self._render_image(path, edge)
+        except Exception as e:
+            print(f"Warning: could not render {path.name}: {e}", file=sys.stderr)
+            return None
+
+        shard.mkdir(parents=True, exist_ok=True)
+        if not is_pdf and len(data) >= stat_key[2]:
+            # No smaller than the original: remember that and serve the original
+            (shard / (stem + ".orig")).touch()
+            return None
+        target = shard / (stem + ext)
+        tmp = shard / f".{stem}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+        return target
+
+    @staticmethod
+    def _render_image(path: Path, edge: int) -> tuple[bytes, str]:
+        with Image.open(path) as im:
+            im.draft("RGB", (edge, edge))  # JPEGs decode straight at a reduced scale
+            im = ImageOps.exif_transpose(im)
+            im.thumbnail((edge, edge))
+            buf = io.BytesIO()
+            if im.mode in ("RGBA", "LA", "PA") or "transparency" in im.info:
+                im.save(buf, "PNG", optimize=True)
+                return buf.getvalue(), ".png"
+            im.convert("RGB").save(buf, "JPEG", quality=82, optimize=True)
+            return buf.getvalue(), ".jpg"
+
+    def _render_pdf(self, path: Path, edge: int) -> tuple[bytes, str]:
+        # First page only
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = Path(tmp) / "page"
+            subprocess.run(
+                [self.pdftoppm, "-png", "-f", "1", "-l", "1", "-singlefile", "-scale-to", str(edge), str(path), str(prefix)],
+                check=True, capture_output=True, timeout=60,
+            )
+            return prefix.with_suffix(".png").read_bytes(), ".png"
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._urgent.shutdown(wait=False, cancel_futures=True)
+
+
+_XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_DOC_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+# Built-in number formats that display dates or times
+_DATE_FORMAT_IDS = set(range(14, 23)) | {45, 46, 47}
+
+
+def _column_index(ref: str) -> int:
+    """0-based column of a cell reference like "AB12"."""
+    col = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        col = col * 26 + ord(ch.upper()) - 64
+    return col - 1
+
+
+def _is_date_format(code: str) -> bool:
+    # Drop quoted literals, [colour]/[condition] sections and escaped characters first
+    code = re.sub(r'"[^"]*"|\[[^\]]*\]|\\.', "", code)
+    return bool(re.search(r"[dmyhs]", code, re.IGNORECASE))
+
+
+def _excel_date(serial: float, date1904: bool) -> str | float:
+    base = datetime(1904, 1, 1) if date1904 else datetime(1899, 12, 30)
+    try:
+        value = base + timedelta(days=serial)
+    except OverflowError:
+        return serial
+    if serial == int(serial):
+        return value.date().isoformat()
+    return value.isoformat(sep=" ", timespec="seconds")
+
+
+class XlsxWorkbook:
+    """Streaming .xlsx reader: sheet list and shared strings up front, rows on demand.
+
+    Stdlib only (zipfile + iterparse). Sheets are read row by row and
+    abandoned as soon as the requested range has been read, so the first
+    rows of a huge sheet cost no more than those of a small one. Values
+    are the stored ones (dates rendered as ISO strings), not Excel's
+    formatted text.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with zipfile.ZipFile(path) as zf:
+            names = set(zf.namelist())
+            self.date1904 = False
+            self.sheets = self._sheet_list(zf)
+            self.strings = self._shared_strings(zf) if "xl/sharedStrings.xml" in names else []
+            self.date_styles = self._date_styles(zf) if "xl/styles.xml" in names else set()
+
+    def _sheet_list(self, zf: zipfile.ZipFile) -> list[tuple[str, str]]:
+        """(name, zip member) of each worksheet, in workbook order."""
+        targets = {}
+        with zf.open("xl/_rels/workbook.xml.rels") as f:
+            for rel in ET.parse(f).getroot().iter(_PKG_REL_NS + "Relationship"):
+                if rel.get("Type", "").endswith("/worksheet"):
+                    target = rel.get("Target", "")
+                    targets[rel.get("Id")] = target.lstrip("/") if target.startswith("/") else "xl/" + target
+        with zf.open("xl/workbook.xml") as f:
+            root = ET.parse(f).getroot()
+        pr = root.find(_XLSX_NS + "workbookPr")
+        self.date1904 = pr is not None and pr.get("date1904") in ("1", "true")
+        sheets = []
+        for sheet in root.iter(_XLSX_NS + "sheet"):
+            member = targets.get(sheet.get(_DOC_REL_NS + "id"))
+            if member:
+                sheets.append((sheet.get("name", ""), member))
+        return sheets
+
+    @staticmethod
+    def _shared_strings(zf: zipfile.ZipFile) -> list[str]:
+        strings = []
+        with zf.open("xl/sharedStrings.xml") as f:
+            for _, elem in ET.iterparse(f):
+                if elem.tag == _XLSX_NS + "si":
+                    # Plain (<si><t>) or rich text (<si><r><t>); phonetic runs are skipped
+                    parts = [t.text or "" for t in elem.findall(_XLSX_NS + "t")]
+                    parts += [t.text or "" for t in elem.findall(f"{_XLSX_NS}r/{_XLSX_NS}t")]
+                    strings.append("".join(parts))
+                    elem.clear()
+        return strings
+
+    @staticmethod
+    def _date_styles(zf: zipfile.ZipFile) -> set[int]:
+        """Indexes of the cell styles (cellXfs) whose number format is a date or time."""
+        with zf.open("xl/styles.xml") as f:
+            root = ET.parse(f).getroot()
+        date_formats = set(_DATE_FORMAT_IDS)
+        for fmt in root.iter(_XLSX_NS + "numFmt"):
+            if _is_date_format(fmt.get("formatCode", "")):
+                date_formats.add(int(fmt.get("numFmtId", -1)))
+        cell_xfs = root.find(_XLSX_NS + "cellXfs")
+        if cell_xfs is None:
+            return set()
+        return {i for i, xf in enumerate(cell_xfs) if int(xf.get("numFmtId", 0)) in date_formats}
+
+    def _cell_value(self, cell: ET.Element):
+        kind = cell.get("t", "n")
+        if kind == "inlineStr":
+            return "".join(t.text or "" for t in cell.iter(_XLSX_NS + "t"))
+        v = cell.find(_XLSX_NS + "v")
+        if v is None or v.text is None:
+            return None
+        text = v.text
+        if kind == "s":
+            index = int(text)
+            return self.strings[index] if index < len(self.strings) else None
+        if kind == "b":
+            return text == "1"
+        if kind in ("str", "e", "d"):
+            return text
+        try:
+            number = float(text)
+        except ValueError:
+            return text
+        style = cell.get("s")
+        if style is not None and int(style) in self.date_styles:
+            return _excel_date(number, self.date1904)
+        return int(number) if number.is_integer() and abs(number) < 2**53 else number
+
+    def rows(self, sheet: int, start: int, stop: int) -> tuple[list, bool]:
+        """Rows at positions [start, stop) of a sheet as [row_number, values], and whether more follow."""
+        rows = []
+        more = False
+        position = 0
+        row_number = 0
+        cells: dict[int, object] = {}
+        sheet_data = None
+        with zipfile.ZipFile(self.path) as zf, zf.open(self.sheets[sheet][1]) as f:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == _XLSX_NS + "sheetData":
+                        sheet_data = elem
+                    continue
+                if elem.tag == _XLSX_NS + "c" and position >= start:
+                    ref = elem.get("r")
+                    col = _column_index(ref) if ref else len(cells)
+                    if col < XLSX_MAX_COLUMNS:
+                        cells[col] = self._cell_value(elem)
+                elif elem.tag == _XLSX_NS + "row":
+                    row_number = int(elem.get("r") or row_number + 1)
+                    if position >= stop:
+                        more = True
+                        break
+                    if position >= start:
+                        width = max(cells) + 1 if cells else 0
+                        rows.append([row_number, [cells.get(i) for i in range(width)]])
+                    cells = {}
+                    position += 1
+                    # Drop parsed rows so memory stays flat however long the sheet is
+                    if sheet_data is not None:
+                        sheet_data.clear()
+        return rows, more
+
+
+def xlsx_preview(workbook: XlsxWorkbook) -> dict:
+    """Every sheet's name and first XLSX_PREVIEW_ROWS rows."""
+    sheets = []
+    for i, (name, _) in enumerate(workbook.sheets):
+        rows, more = workbook.rows(i, 0, XLSX_PREVIEW_ROWS)
+        sheets.append({"name": name, "rows": rows, "more": more})
+    return {"sheets": sheets, "preview_rows": XLSX_PREVIEW_ROWS}
+
+
+class XlsxPreviews:
+    """Parsed workbooks with the first rows of every sheet, made on a worker pool.
+
+    Workbooks are parsed in the background as runs are indexed (and on
+    demand otherwise), and the most recent XLSX_CACHE_SIZE are kept,
+    keyed by path, mtime and size, with their sheet list and first
+    XLSX_PREVIEW_ROWS rows. Later rows are streamed per request.
+    """
+
+    def __init__(self, workers: int = XLSX_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="xlsx")
+        self._jobs: OrderedDict[tuple, Future] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def prefetch(self, run_dir: Path, run: dict) -> None:
+        for output in run["outputs"]:
+            if output["name"].lower().endswith(".xlsx"):
+                self._job(run_dir / "outputs" / output["name"])
+
+    def _job(self, path: Path) -> Future:
+        st = path.stat()
+        key = (path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                job = self._jobs[key] = self._pool.submit(self._load, path)
+                while len(self._jobs) > XLSX_CACHE_SIZE:
+                    self._jobs.popitem(last=False)
+            else:
+                self._jobs.move_to_end(key)
+            return job
+
+    @staticmethod
+    def _load(path: Path) -> tuple[XlsxWorkbook, dict]:
+        workbook = XlsxWorkbook(path)
+        return workbook, xlsx_preview(workbook)
+
+    def preview(self, path: Path) -> dict:
+        """Sheet names and each sheet's first rows (raises OSError/ValueError/KeyError/ParseError on bad files)."""
+        return self._job(path).result()[1]
+
+    def rows(self, path: Path, sheet: int, start: int, stop: int) -> dict:
+        workbook = self._job(path).result()[0]
+        if not 0 <= sheet < len(workbook.sheets):
+            raise IndexError(f"No sheet {sheet}")
+        rows, more = workbook.rows(sheet, start, stop)
+        return {"sheet": sheet, "start": start, "rows": rows, "more": more}
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_summary(run: dict) -> dict:
+    """What the run list needs to show a run, without its outputs or grading details."""
+    grading = run.get("grading")
+    summary = grading.get("summary") if isinstance(grading, dict) else None
+    prompt = run["prompt"]
+    return {
+        "id": run["id"],
+        "eval_id": run.get("eval_id"),
+        "prompt": prompt if len(prompt) <= RUN_PROMPT_PREVIEW else prompt[:RUN_PROMPT_PREVIEW] + "…",
+        "outputs": len(run["outputs"]),
+        "pass_rate": summary.get("pass_rate") if isinstance(summary, dict) else None,
+    }
 
-def build_run(root: Path, run_dir: Path) -> dict | None:
+
+def build_run(root: Path, run_dir: Path, file_route: str | None = None) -> dict | None:
     """Build a run dict with prompt, outputs, and grading data."""
     prompt = ""
     eval_id = None
@@ -104,10 +964,7 @@ def build_run(root: Path, run_dir: Path) -> dict | None:
         for candidate in [run_dir / "transcript.md", run_dir / "outputs" / "transcript.md"]:
             if candidate.exists():
                 try:
-                    text = candidate.read_text()
-                    match = re.search(r"## Eval Prompt\n\n([\s\S]*?)(?=\n##|$)", text)
-                    if match:
-                        prompt = match.group(1).strip()
+                    prompt = transcript_prompt(candidate)
                 except OSError:
                     pass
                 if prompt:
@@ -124,7 +981,8 @@ def build_run(root: Path, run_dir: Path) -> dict | None:
     if outputs_dir.is_dir():
         for f in sorted(outputs_dir.iterdir()):
             if f.is_file() and f.name not in METADATA_FILES:
-                output_files.append(embed_file(f))
+                url = f"{file_route}/{quote(run_id, safe='')}/{quote(f.name, safe='')}" if file_route else None
+                output_files.append(embed_file(f, url))
 
     # Load grading if present
     grading = None
@@ -146,11 +1004,131 @@ def build_run(root: Path, run_dir: Path) -> dict | None:
     }
 
 
-def embed_file(path: Path) -> dict:
-    """Read a file and return an embedded representation."""
+def transcript_prompt(path: Path) -> str:
+    """The "## Eval Prompt" section of a transcript, read only up to the next heading."""
+    with open(path, errors="replace") as f:
+        for line in f:
+            if not line.endswith("## Eval Prompt\n"):
+                continue
+            if f.readline() != "\n":
+                continue
+            lines = []
+            for line in f:
+                if line.startswith("##"):
+                    break
+                lines.append(line)
+            return "".join(lines).strip()
+    return ""
+
+
+def _utf8_bounds(data: bytes, trim_start: bool, trim_end: bool) -> tuple[int, int]:
+    """data[i:j] without the partial UTF-8 characters cut off at either end."""
+    i, j = 0, len(data)
+    if trim_start:
+        while i < min(3, j) and data[i] & 0xC0 == 0x80:
+            i += 1
+    if trim_end:
+        for back in range(1, min(4, j - i) + 1):
+            byte = data[j - back]
+            if byte & 0xC0 == 0x80:
+                continue
+            # Lead byte: drop its character if fewer bytes follow than it needs
+            if byte < 0x80:
+                needed = 1
+            elif byte >= 0xF0:
+                needed = 4
+            elif byte >= 0xE0:
+                needed = 3
+            else:
+                needed = 2
+            if back < needed:
+                j -= back
+            break
+    return i, j
+
+
+def read_text_range(path: Path, offset: int, length: int) -> dict:
+    """Up to length bytes of a text file from offset, decoded on UTF-8 character boundaries.
+
+    The range is narrowed to whole characters; end is where the next range
+    should start.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        f.seek(offset)
+        data = f.read(length)
+    i, j = _utf8_bounds(data, offset > 0, offset + len(data) < size)
+    if j <= i:
+        i, j = 0, len(data)
+    return {
+        "offset": offset + i,
+        "end": offset + j,
+        "size": size,
+        "content": data[i:j].decode("utf-8", errors="replace"),
+    }
+
+
+def embed_text(path: Path, url: str) -> dict:
+    """A text output for a served page: whole if small, else its head and tail.
+
+    Larger files carry size, head_bytes and tail_offset so the viewer can
+    page through the rest from /api/text.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= TEXT_HEAD_BYTES + TEXT_TAIL_BYTES:
+            content = f.read().decode("utf-8", errors="replace")
+            return {"name": path.name, "type": "text", "content": content, "size": size}
+        head = f.read(TEXT_HEAD_BYTES)
+        f.seek(size - TEXT_TAIL_BYTES)
+        tail = f.read(TEXT_TAIL_BYTES)
+    _, head_end = _utf8_bounds(head, False, True)
+    tail_start, _ = _utf8_bounds(tail, True, False)
+    return {
+        "name": path.name,
+        "type": "text",
+        "content": head[:head_end].decode("utf-8", errors="replace"),
+        "tail": tail[tail_start:].decode("utf-8", errors="replace"),
+        "size": size,
+        "head_bytes": head_end,
+        "tail_offset": size - len(tail) + tail_start,
+        "url": url,
+    }
+
+
+def file_type(path: Path) -> str:
+    ext = path.suffix.lower()
+    if ext in TEXT_EXTENSIONS:
+        return "text"
+    if ext in IMAGE_EXTENSIONS:
+        return "image"
+    if ext in (".pdf", ".xlsx"):
+        return ext[1:]
+    return "binary"
+
+
+def embed_file(path: Path, url: str | None = None) -> dict:
+    """Read a file and return an embedded representation.
+
+    With a url, anything but text is returned as metadata plus that URL
+    and is not read at all, and large text files only in part (embed_text).
+    """
     ext = path.suffix.lower()
     mime = get_mime_type(path)
 
+    if url is not None and ext in TEXT_EXTENSIONS:
+        try:
+            return embed_text(path, url)
+        except OSError:
+            return {"name": path.name, "type": "text", "content": "(Error reading file)"}
+
+    if url is not None and ext not in TEXT_EXTENSIONS:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return {"name": path.name, "type": "error", "content": "(Error reading file)"}
+        return {"name": path.name, "type": file_type(path), "mime": mime, "size": size, "url": url}
+
     if ext in TEXT_EXTENSIONS:
         try:
             content = path.read_text(errors="replace")
@@ -210,10 +1188,13 @@ def embed_file(path: Path) -> dict:
         }
 
 
-def load_previous_iteration(workspace: Path) -> dict[str, dict]:
+def load_previous_iteration(
+    workspace: Path, file_route: str | None = None, run_dirs: dict[str, Path] | None = None
+) -> dict[str, dict]:
     """Load previous iteration's feedback and outputs.
 
     Returns a map of run_id -> {"feedback": str, "outputs": list[dict]}.
+    file_route and run_dirs work as in find_runs.
     """
     result: dict[str, dict] = {}
 
@@ -232,7 +1213,7 @@ def load_previous_iteration(workspace: Path) -> dict[str, dict]:
             pass
 
     # Load runs (to get outputs)
-    prev_runs = find_runs(workspace)
+    prev_runs = find_runs(workspace, file_route, run_dirs)
     for run in prev_runs:
         result[run["id"]] = {
             "feedback": feedback_map.get(run["id"], ""),
@@ -252,10 +1233,40 @@ def generate_html(
     skill_name: str,
     previous: dict[str, dict] | None = None,
     benchmark: dict | None = None,
+    generation: int | None = None,
+    lazy: bool = False,
+    renditions: list[str] | None = None,
+    bundle: dict | None = None,
 ) -> str:
-    """Generate the complete standalone HTML page with embedded data."""
-    template_path = Path(__file__).parent / "viewer.html"
-    template = template_path.read_text()
+    """Generate the complete standalone HTML page with embedded data.
+
+    generation is the run index generation the page was built from (served
+    pages only). With lazy, runs and previous-iteration data are left out;
+    the viewer fetches them from /api/runs as needed, so the page size does
+    not grow with the workspace. renditions lists the output extensions
+    the server can make thumbnails/previews of. bundle ({"summaries",
+    "shards"}, see StaticBundle) leaves them out the same way for a static
+    page that loads them from shard files next to it.
+    """
+    template = VIEWER_TEMPLATE.read_text()
+
+    if lazy or bundle:
+        embedded = {
+            "skill_name": skill_name,
+            "run_count": len(runs),
+            "has_previous": bool(previous),
+        }
+        if lazy:
+            embedded["lazy"] = True
+        if bundle:
+            embedded["bundle"] = bundle
+        if renditions:
+            embedded["renditions"] = renditions
+        if benchmark:
+            embedded["benchmark"] = benchmark
+        if generation is not None:
+            embedded["index_generation"] = generation
+        return template.replace("/*__EMBEDDED_DATA__*/", f"const EMBEDDED_DATA = {json.dumps(embedded)};")
 
     # Build previous_feedback and previous_outputs maps for the template
     previous_feedback: dict[str, str] = {}
@@ -275,12 +1286,165 @@ def generate_html(
     }
     if benchmark:
         embedded["benchmark"] = benchmark
+    if generation is not None:
+        embedded["index_generation"] = generation
 
     data_json = json.dumps(embedded)
 
     return template.replace("/*__EMBEDDED_DATA__*/", f"const EMBEDDED_DATA = {data_json};")
 
 
+class StaticBundle:
+    """A static export split into a small page and content-addressed files.
+
+    out_dir gets index.html (no runs embedded), runs/<hash>.js with the run
+    summaries and with full runs BUNDLE_SHARD_SIZE at a time, and
+    assets/<hh>/<sha256><ext> with every non-text output. Shards are script
+    files calling reviewBundle() so the viewer can load them as it goes,
+    even from file://. Outputs are stored once per content hash, however
+    many runs or iterations share them; identical text within a shard is
+    stored once too. Files already in out_dir are kept rather than
+    rewritten, and files the new export no longer references are removed,
+    so re-exporting only touches what changed.
+    """
+
+    def __init__(self, out_dir: Path):
+        self.out_dir = out_dir
+        self._written: set[str] = set()  # paths relative to out_dir
+        self._digests: dict[Path, str] = {}
+        self._xlsx: dict[str, dict | None] = {}  # asset name -> preview
+        self.stats = {"outputs": 0, "assets": 0, "bytes_saved": 0}
+
+    def _keep(self, name: str, data: bytes | None = None, source: Path | None = None) -> None:
+        """Write out_dir/name from data or source unless it is already there."""
+        self._written.add(name)
+        target = self.out_dir / name
+        if target.exists():
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        if source is not None:
+            shutil.copyfile(source, tmp)
+        else:
+            tmp.write_bytes(data)
+        os.replace(tmp, target)
+
+    def _asset(self, path: Path, size: int) -> str:
+        digest = self._digests.get(path)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                while chunk := f.read(FILE_CHUNK_SIZE):
+                    h.update(chunk)
+            digest = self._digests[path] = h.hexdigest()
+        name = f"assets/{digest[:2]}/{digest}{path.suffix.lower()}"
+        self.stats["outputs"] += 1
+        if name in self._written:
+            self.stats["bytes_saved"] += size
+        else:
+            self.stats["assets"] += 1
+        self._keep(name, source=path)
+        return name
+
+    def _outputs(self, outputs: list[dict], run_dir: Path | None, texts: dict[str, str]) -> list[dict]:
+        """Outputs with text moved to the shard's texts table and other files to assets/.
+
+        Text too large to embed whole keeps its head and tail inline and is
+        linked in full from assets/. Workbooks carry the first rows of each
+        sheet (xlsx_preview), since the viewer cannot fetch from file://.
+        """
+        bundled = []
+        for output in outputs:
+            output = dict(output)
+            if output.get("type") == "text":
+                content = output.pop("content")
+                raw = content.encode("utf-8", "surrogatepass")
+                ref = hashlib.sha256(raw).hexdigest()[:BUNDLE_NAME_DIGITS]
+                if ref in texts:
+                    self.stats["bytes_saved"] += len(raw)
+                texts[ref] = content
+                output["content_ref"] = ref
+            if "url" in output:
+                path = run_dir / "outputs" / output["name"] if run_dir else None
+                try:
+                    output["url"] = self._asset(path, output.get("size", 0))
+                except (OSError, TypeError):
+                    output = {"name": output["name"], "type": "error", "content": "(Error reading file)"}
+                if output.get("type") == "xlsx":
+                    preview = self._xlsx_preview(output["url"], path)
+                    if preview:
+                        output["preview"] = preview
+            bundled.append(output)
+        return bundled
+
+    def _xlsx_preview(self, name: str, path: Path) -> dict | None:
+        """xlsx_preview() of a workbook asset, parsed once however many runs share it."""
+        if name not in self._xlsx:
+            try:
+                self._xlsx[name] = xlsx_preview(XlsxWorkbook(path))
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+                print(f"Warning: could not preview {path.name}: {e}", file=sys.stderr)
+                self._xlsx[name] = None
+        return self._xlsx[name]
+
+    def _script(self, payload: dict) -> str:
+        """Write payload as a content-addressed reviewBundle() script; returns its name."""
+        data = json.dumps(payload, separators=(",", ":"))
+        key = hashlib.sha256(data.encode()).hexdigest()[:BUNDLE_NAME_DIGITS]
+        name = f"runs/{key}.js"
+        self._keep(name, f'reviewBundle("{key}",{data});\n'.encode())
+        return name
+
+    def export(
+        self,
+        runs: list[dict],
+        run_dirs: dict[str, Path],
+        skill_name: str,
+        previous: dict[str, dict] | None = None,
+        previous_run_dirs: dict[str, Path] | None = None,
+        benchmark: dict | None = None,
+    ) -> Path:
+        """Write the bundle for runs found with file_route set; returns index.html."""
+        previous = previous or {}
+        previous_run_dirs = previous_run_dirs or {}
+        summaries = []
+        shards = []
+        for start in range(0, len(runs), BUNDLE_SHARD_SIZE):
+            texts: dict[str, str] = {}
+            shard_runs = []
+            for run in runs[start:start + BUNDLE_SHARD_SIZE]:
+                prev = previous.get(run["id"], {})
+                bundled = dict(run)
+                bundled["outputs"] = self._outputs(run["outputs"], run_dirs.get(run["id"]), texts)
+                bundled["previous_outputs"] = self._outputs(
+                    prev.get("outputs", []), previous_run_dirs.get(run["id"]), texts
+                )
+                bundled["previous_feedback"] = prev.get("feedback", "")
+                shard_runs.append(bundled)
+                summaries.append(run_summary(run) | {"shard": len(shards)})
+            shards.append(self._script({"runs": shard_runs, "texts": texts}))
+
+        bundle = {"summaries": self._script({"runs": summaries}), "shards": shards}
+        html = generate_html(runs, skill_name, previous, benchmark, bundle=bundle).encode()
+        index_path = self.out_dir / "index.html"
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.out_dir / f".index.html.{os.getpid()}.tmp"
+        tmp.write_bytes(html)
+        os.replace(tmp, index_path)
+        self._prune()
+        return index_path
+
+    def _prune(self) -> None:
+        """Remove shard and asset files a previous export left behind."""
+        for sub in ("runs", "assets"):
+            for path in sorted((self.out_dir / sub).rglob("*"), reverse=True):
+                name = path.relative_to(self.out_dir).as_posix()
+                if path.is_file() and name not in self._written:
+                    path.unlink()
+                elif path.is_dir() and not any(path.iterdir()):
+                    path.rmdir()
+
+
 # ---------------------------------------------------------------------------
 # HTTP server (stdlib only, zero dependencies)
 # ---------------------------------------------------------------------------
@@ -305,51 +1469,307 @@ def _kill_port(port: int) -> None:
     except FileNotFoundError:
         print("Note: lsof not found, cannot check if port is in use", file=sys.stderr)
 
+def accepted_encodings(header: str | None) -> set[str]:
+    """Content codings an Accept-Encoding header allows (q=0 excludes one)."""
+    accepted: set[str] = set()
+    rejected: set[str] = set()
+    wildcard = False
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        match = re.search(r"q\s*=\s*([0-9.]+)", params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        if coding == "*":
+            wildcard = q > 0
+        elif q > 0:
+            accepted.add(coding)
+        else:
+            rejected.add(coding)
+    if wildcard:
+        accepted |= {"br", "gzip"} - rejected
+    return accepted
+
+
+def etag_matches(if_none_match: str | None, *etags: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETags."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return any(etag in tags for etag in etags)
+
+
+class RenderedPage:
+    """One build of the review page, with its compressed bodies made on demand."""
+
+    ENCODING_SUFFIX = {"identity": "", "gzip": "-gz", "br": "-br"}
+
+    def __init__(self, content: bytes, tag: str):
+        self.tag = tag
+        self._bodies = {"identity": content}
+        self._lock = threading.Lock()
+
+    def etag(self, encoding: str = "identity") -> str:
+        # One strong tag per representation
+        return f'"{self.tag}{self.ENCODING_SUFFIX[encoding]}"'
+
+    def etags(self) -> list[str]:
+        return [self.etag(encoding) for encoding in self.ENCODING_SUFFIX]
+
+    def negotiate(self, accept_encoding: str | None) -> str:
+        """Best encoding for this client: br (if available), then gzip, else identity."""
+        if len(self._bodies["identity"]) < COMPRESS_MIN_SIZE:
+            return "identity"
+        accepted = accepted_encodings(accept_encoding)
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return "identity"
+
+    def body(self, encoding: str) -> bytes:
+        with self._lock:
+            if encoding not in self._bodies:
+                content = self._bodies["identity"]
+                if encoding == "br":
+                    self._bodies[encoding] = brotli.compress(content, quality=BROTLI_QUALITY)
+                else:
+                    self._bodies[encoding] = gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+            return self._bodies[encoding]
+
+
+class PageCache:
+    """The last rendered review page, rebuilt only when what it embeds changes.
+
+    The key is the run index generation plus the signatures of the
+    benchmark.json and viewer.html the page embeds; compressed bodies are
+    made once per build and reused by every reload after. ETags combine a
+    per-server token (generations restart with the server), the generation
+    and a hash of the rest of the key.
+    """
+
+    def __init__(self):
+        self.token = f"{os.getpid():x}{time.time_ns():x}"
+        self._key: tuple | None = None
+        self._page: RenderedPage | None = None
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, build) -> RenderedPage:
+        """The page for key, calling build() for its HTML bytes if it isn't cached."""
+        with self._lock:
+            if key != self._key or self._page is None:
+                tag = f"{self.token}-{key[0]}-{zlib.crc32(repr(key[1:]).encode()):08x}"
+                self._page = RenderedPage(build(), tag)
+                self._key = key
+            return self._page
+
+
+def _file_signature(path: Path | None) -> tuple:
+    try:
+        st = path.stat()
+    except (AttributeError, OSError):
+        return ()
+    return (st.st_mtime_ns, st.st_size)
+
+
+class FeedbackStore:
+    """feedback.json, written atomically so concurrent saves and crashes can't corrupt it.
+
+    Every write goes to a temp file in the same directory, is fsynced and
+    renamed over feedback.json, under a thread lock plus an flock on
+    feedback.json.lock (so two servers on one workspace also serialise).
+    upsert() changes a single run's review, so autosave no longer resends
+    and rewrites every review.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.path.with_name(self.path.name + ".lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def read_bytes(self) -> bytes:
+        # Renames are atomic, so readers never see a partial file and need no lock
+        try:
+            return self.path.read_bytes()
+        except FileNotFoundError:
+            return b"{}"
+
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        if not isinstance(data, dict):
+            raise ValueError(f"{self.path} is not a JSON object")
+        return data
+
+    def _write(self, data: dict) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps(data, indent=2) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+        if hasattr(os, "O_DIRECTORY"):
+            # Persist the rename itself
+            dir_fd = os.open(self.path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def replace(self, data: dict) -> None:
+        """Replace feedback.json wholesale (the final "complete" submit)."""
+        with self._locked():
+            self._write(data)
+
+    def upsert(self, run_id: str, feedback: str, timestamp: str | None = None, status: str | None = None) -> int:
+        """Set (or, with empty feedback, remove) one run's review; returns the review count."""
+        with self._locked():
+            data = self._load()
+            reviews = [r for r in data.get("reviews", []) if r.get("run_id") != run_id]
+            if feedback.strip():
+                reviews.append({
+                    "run_id": run_id,
+                    "feedback": feedback,
+                    "timestamp": timestamp or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                })
+            data["reviews"] = reviews
+            data["status"] = status or "in_progress"
+            self._write(data)
+            return len(reviews)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles each request on a bounded pool of worker threads."""
+
+    def __init__(self, server_address, handler, workers: int = SERVER_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="review")
+        self._detached: set = set()
+        super().__init__(server_address, handler)
+
+    def process_request(self, request, client_address) -> None:
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address) -> None:
+        # Same as ThreadingMixIn.process_request_thread, minus a thread per request
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            if request in self._detached:
+                self._detached.discard(request)
+            else:
+                self.shutdown_request(request)
+
+    def detach(self, request, stream) -> None:
+        """Finish a long-lived response on its own thread, freeing the pool worker.
+
+        stream() writes to the request's socket directly (the handler's
+        files are closed once it returns); the connection is closed after.
+        """
+        self._detached.add(request)
+
+        def run() -> None:
+            try:
+                stream()
+            finally:
+                self.shutdown_request(request)
+
+        threading.Thread(target=run, name="review-stream", daemon=True).start()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
 class ReviewHandler(BaseHTTPRequestHandler):
     """Serves the review HTML and handles feedback saves.
 
     Regenerates the HTML on each page load so that refreshing the browser
-    picks up new eval outputs without restarting the server.
+    picks up new eval outputs without restarting the server. The shared
+    RunIndex keeps that cheap: only runs that changed since the last load
+    are re-read, and the page carries the index generation it was built from.
     """
 
     def __init__(
         self,
         workspace: Path,
         skill_name: str,
-        feedback_path: Path,
+        feedback: FeedbackStore,
         previous: dict[str, dict],
         benchmark_path: Path | None,
+        index: RunIndex,
+        previous_run_dirs: dict[str, Path],
+        page_cache: PageCache,
+        renditions: Renditions | None,
+        xlsx: XlsxPreviews | None,
         *args,
         **kwargs,
     ):
         self.workspace = workspace
         self.skill_name = skill_name
-        self.feedback_path = feedback_path
+        self.feedback = feedback
         self.previous = previous
         self.benchmark_path = benchmark_path
+        self.index = index
+        self.previous_run_dirs = previous_run_dirs
+        self.page_cache = page_cache
+        self.renditions = renditions
+        self.xlsx = xlsx
         super().__init__(*args, **kwargs)
 
     def do_GET(self) -> None:
-        if self.path == "/" or self.path == "/index.html":
-            # Regenerate HTML on each request (re-scans workspace for new outputs)
-            runs = find_runs(self.workspace)
-            benchmark = None
-            if self.benchmark_path and self.benchmark_path.exists():
-                try:
-                    benchmark = json.loads(self.benchmark_path.read_text())
-                except (json.JSONDecodeError, OSError):
-                    pass
-            html = generate_html(runs, self.skill_name, self.previous, benchmark)
-            content = html.encode("utf-8")
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.send_header("Content-Length", str(len(content)))
-            self.end_headers()
-            self.wfile.write(content)
-        elif self.path == "/api/feedback":
-            data = b"{}"
-            if self.feedback_path.exists():
-                data = self.feedback_path.read_bytes()
+        path, _, query = self.path.partition("?")
+        if path.startswith(("/files/", "/previous-files/")):
+            self._serve_output(path, query=query)
+        elif path == "/" or path == "/index.html":
+            self._serve_page()
+        elif path == "/api/index":
+            generation = self.index.refresh()
+            self._send_json(200, {
+                "generation": generation,
+                "runs": len(self.index.runs()),
+                "watching": self.index.watching,
+            }, {"X-Index-Generation": str(generation)})
+        elif path == "/api/runs":
+            self._serve_run_page(query)
+        elif path.startswith("/api/runs/"):
+            self._serve_run(unquote(path[len("/api/runs/"):]))
+        elif path.startswith("/api/xlsx/"):
+            self._serve_xlsx(path, query)
+        elif path.startswith("/api/text/"):
+            self._serve_text(path, query)
+        elif path == "/api/events":
+            self._serve_events()
+        elif path == "/api/feedback":
+            data = self.feedback.read_bytes()
             self.send_response(200)
             self.send_header("Content-Type", "application/json")
             self.send_header("Content-Length", str(len(data)))
@@ -358,27 +1778,424 @@ class ReviewHandler(BaseHTTPRequestHandler):
         else:
             self.send_error(404)
 
+    def do_HEAD(self) -> None:
+        path, _, query = self.path.partition("?")
+        if path.startswith(("/files/", "/previous-files/")):
+            self._serve_output(path, head_only=True, query=query)
+        elif path == "/" or path == "/index.html":
+            self._serve_page(head_only=True)
+        else:
+            self.send_error(405)
+
+    def _render_page(self, generation: int) -> bytes:
+        benchmark = None
+        if self.benchmark_path and self.benchmark_path.exists():
+            try:
+                benchmark = json.loads(self.benchmark_path.read_text())
+            except (json.JSONDecodeError, OSError):
+                pass
+        html = generate_html(
+            self.index.runs(), self.skill_name, self.previous, benchmark, generation, lazy=True,
+            renditions=sorted(self.renditions.extensions) if self.renditions else None,
+        )
+        return html.encode("utf-8")
+
+    def _serve_page(self, head_only: bool = False) -> None:
+        """Serve the review page, compressed if the client accepts it, or 304 if unchanged."""
+        # Refresh the run index (only changed runs are re-read); the page itself is
+        # only re-rendered when the generation, benchmark.json or viewer.html changed
+        generation = self.index.refresh()
+        key = (generation, _file_signature(self.benchmark_path), _file_signature(VIEWER_TEMPLATE))
+        page = self.page_cache.get(key, lambda: self._render_page(generation))
+        encoding = page.negotiate(self.headers.get("Accept-Encoding"))
+        headers = {
+            "ETag": page.etag(encoding),
+            "Cache-Control": PAGE_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+            "X-Index-Generation": str(generation),
+        }
+
+        if etag_matches(self.headers.get("If-None-Match"), *page.etags()):
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+
+        body = page.body(encoding)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def _serve_events(self) -> None:
+        """GET /api/events — server-sent run added/updated/graded/removed events.
+
+        Starts with a "hello" carrying the current generation, so a page
+        built before the stream opened can tell it missed something. A
+        client reconnecting with a Last-Event-ID older than the event log
+        (or from an earlier server) gets "reset" and reloads its run list.
+        The stream itself runs on its own thread (PooledHTTPServer.detach).
+        """
+        if not self.index.subscribe(MAX_EVENT_STREAMS):
+            self.send_response(503)
+            self.send_header("Retry-After", "30")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        try:
+            seq = self.index.event_seq
+            last_id = self.headers.get("Last-Event-ID", "")
+            reset = False
+            if last_id.isdigit():
+                reset = int(last_id) > seq
+                seq = min(int(last_id), seq)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            hello = {"generation": self.index.generation, "count": len(self.index.runs())}
+            self.wfile.write(f"retry: 3000\nevent: {'reset' if reset else 'hello'}\ndata: {json.dumps(hello)}\n\n".encode())
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.index.unsubscribe()
+            return
+        self.close_connection = True
+        self.server.detach(self.request, partial(self._stream_events, seq))
+
+    def _stream_events(self, seq: int) -> None:
+        """Send events after seq until the client goes away or the index closes."""
+        try:
+            while not self.index.closed:
+                events = self.index.events_since(seq, EVENT_HEARTBEAT)
+                if events is None:
+                    seq = self.index.event_seq
+                    hello = {"generation": self.index.generation, "count": len(self.index.runs())}
+                    chunk = f"id: {seq}\nevent: reset\ndata: {json.dumps(hello)}\n\n"
+                elif not events:
+                    chunk = ": keep-alive\n\n"
+                else:
+                    chunk = "".join(
+                        f"id: {n}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n" for n, event in events
+                    )
+                    seq = events[-1][0]
+                self.connection.sendall(chunk.encode())
+        except OSError:
+            # Client gone (broken pipe, reset) or the socket was closed
+            pass
+        finally:
+            self.index.unsubscribe()
+
+    def _serve_run_page(self, query: str) -> None:
+        """GET /api/runs?offset=&limit=&filter= — one page of run summaries."""
+        params = parse_qs(query)
+        try:
+            offset = max(0, int(params.get("offset", ["0"])[0]))
+            limit = min(max(1, int(params.get("limit", [str(RUN_PAGE_SIZE)])[0])), RUN_PAGE_MAX)
+        except ValueError:
+            self._send_json(400, {"error": "offset and limit must be integers"})
+            return
+        text = params.get("filter", [""])[0].strip()
+        generation = self.index.refresh()
+        summaries = self.index.summaries(text)
+        self._send_json(200, {
+            "generation": generation,
+            "count": len(self.index.runs()),
+            "total": len(summaries),
+            "offset": offset,
+            "runs": summaries[offset:offset + limit],
+        }, {"X-Index-Generation": str(generation)})
+
+    def _serve_run(self, run_id: str) -> None:
+        """GET /api/runs/<id> — the full run, plus its previous-iteration outputs and feedback."""
+        run = self.index.get(run_id)
+        if run is None:
+            # A run added since the list was fetched
+            self.index.refresh()
+            run = self.index.get(run_id)
+        if run is None:
+            self._send_json(404, {"error": f"No run {run_id!r}"})
+            return
+        run_dir = self.index.run_dir(run_id)
+        if self.xlsx and run_dir:
+            # The viewer asks for the workbooks next; start parsing them now
+            self.xlsx.prefetch(run_dir, run)
+        payload = dict(run)
+        previous = self.previous.get(run_id) or {}
+        if previous.get("outputs"):
+            payload["previous_outputs"] = previous["outputs"]
+        if previous.get("feedback"):
+            payload["previous_feedback"] = previous["feedback"]
+        self._send_json(200, payload, {"X-Index-Generation": str(self.index.generation)})
+
+    def _serve_xlsx(self, path: str, query: str) -> None:
+        """GET /api/xlsx/<run_id>/<name>[?sheet=&rows=START-END][&previous=1] — parsed workbook rows.
+
+        Without sheet: every sheet's name and first XLSX_PREVIEW_ROWS rows.
+        With sheet (an index) and rows (0-based row positions, inclusive):
+        just that range. previous=1 reads the previous iteration's output.
+        """
+        run_id, _, name = path[len("/api/xlsx/"):].partition("/")
+        params = parse_qs(query)
+        file_path = self._output_path(unquote(run_id), unquote(name), previous=params.get("previous") == ["1"])
+        if self.xlsx is None or file_path is None or file_path.suffix.lower() != ".xlsx" or not file_path.is_file():
+            self._send_json(404, {"error": "No such spreadsheet"})
+            return
+
+        sheet = None
+        if "sheet" in params:
+            match = re.fullmatch(r"(\d+)-(\d+)", params.get("rows", [""])[0])
+            if not params["sheet"][0].isdigit() or not match:
+                self._send_json(400, {"error": "Expected sheet=<index>&rows=<start>-<end>"})
+                return
+            sheet, start, end = int(params["sheet"][0]), int(match.group(1)), int(match.group(2))
+            if not 0 < end - start + 1 <= XLSX_PAGE_MAX:
+                self._send_json(400, {"error": f"rows must span 1 to {XLSX_PAGE_MAX} rows"})
+                return
+
+        try:
+            if sheet is None:
+                payload = self.xlsx.preview(file_path)
+            else:
+                payload = self.xlsx.rows(file_path, sheet, start, end + 1)
+        except IndexError as e:
+            self._send_json(404, {"error": str(e)})
+            return
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+            self._send_json(422, {"error": f"Could not read workbook: {e}"})
+            return
+        self._send_json(200, payload)
+
+    def _serve_text(self, path: str, query: str) -> None:
+        """GET /api/text/<run_id>/<name>?offset=&length=[&previous=1] — a byte range of a text output.
+
+        The range is narrowed to whole UTF-8 characters; the response's end
+        is the next offset to ask for.
+        """
+        run_id, _, name = path[len("/api/text/"):].partition("/")
+        params = parse_qs(query)
+        file_path = self._output_path(unquote(run_id), unquote(name), previous=params.get("previous") == ["1"])
+        if file_path is None or file_path.suffix.lower() not in TEXT_EXTENSIONS or not file_path.is_file():
+            self._send_json(404, {"error": "No such text output"})
+            return
+        offset = params.get("offset", ["0"])[0]
+        length = params.get("length", [str(TEXT_PAGE_MAX)])[0]
+        if not offset.isdigit() or not length.isdigit() or not 0 < int(length) <= TEXT_PAGE_MAX:
+            self._send_json(400, {"error": f"Expected offset=<byte>&length=<1 to {TEXT_PAGE_MAX}>"})
+            return
+        try:
+            payload = read_text_range(file_path, int(offset), int(length))
+        except OSError as e:
+            self._send_json(404, {"error": str(e)})
+            return
+        self._send_json(200, payload)
+
+    def _output_path(self, run_id: str, name: str, previous: bool = False) -> Path | None:
+        """A run's output file (current or previous iteration), or None if there is no such run."""
+        if previous:
+            run_dir = self.previous_run_dirs.get(run_id)
+        else:
+            run_dir = self.index.run_dir(run_id)
+            if run_dir is None:
+                # A run added since the page was built
+                self.index.refresh()
+                run_dir = self.index.run_dir(run_id)
+        if run_dir is None or not name or "/" in name or "\\" in name or name in (".", ".."):
+            return None
+        return run_dir / "outputs" / name
+
+    def _serve_output(self, path: str, head_only: bool = False, query: str = "") -> None:
+        """Serve /files/<run_id>/<name> from the run's outputs/.
+
+        With ?rendition=thumb|preview, serves that downscaled rendition
+        instead, or redirects to the original when there is none.
+        """
+        route, _, rest = path.lstrip("/").partition("/")
+        run_id, _, name = rest.partition("/")
+        file_path = self._output_path(unquote(run_id), unquote(name), previous=route == "previous-files")
+        if file_path is None:
+            self.send_error(404)
+            return
+
+        variant = parse_qs(query).get("rendition", [None])[0]
+        if variant is not None:
+            if variant not in RENDITION_SIZES:
+                self.send_error(400)
+                return
+            rendition = self.renditions.get(file_path, variant) if self.renditions else None
+            if rendition is None:
+                self.send_response(302)
+                self.send_header("Location", path)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            file_path = rendition
+        self._send_file(file_path, head_only)
+
+    def _send_file(self, file_path: Path, head_only: bool = False) -> None:
+        """Send a file, honouring Range, If-Range and If-None-Match."""
+        try:
+            st = file_path.stat()
+        except OSError:
+            self.send_error(404)
+            return
+        if not file_path.is_file():
+            self.send_error(404)
+            return
+
+        size = st.st_size
+        etag = f'"{st.st_mtime_ns:x}-{size:x}"'
+        validators = {
+            "ETag": etag,
+            "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+            "Cache-Control": FILE_CACHE_CONTROL,
+            "Accept-Ranges": "bytes",
+        }
+
+        if etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            for key, value in validators.items():
+                self.send_header(key, value)
+            self.end_headers()
+            return
+
+        start, end = 0, size - 1
+        status = 200
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        # Multiple ranges are answered with the whole file, which the spec allows
+        if range_header and "," not in range_header and (not if_range or if_range.strip() == etag):
+            match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", range_header)
+            # An invalid range-spec (last < first) is ignored: full 200 response (RFC 9110 14.2)
+            if match and (match.group(1) or match.group(2)) and not (
+                match.group(1) and match.group(2) and int(match.group(2)) < int(match.group(1))
+            ):
+                if match.group(1):
+                    start = int(match.group(1))
+                    end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+                else:
+                    start = max(0, size - int(match.group(2)))
+                if start >= size:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = 206
+
+        length = end - start + 1 if size else 0
+        self.send_response(status)
+        self.send_header("Content-Type", get_mime_type(file_path))
+        self.send_header("Content-Length", str(length))
+        self.send_header("X-Content-Type-Options", "nosniff")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        for key, value in validators.items():
+            self.send_header(key, value)
+        self.end_headers()
+        if head_only:
+            return
+        try:
+            with open(file_path, "rb") as f:
+                f.seek(start)
+                remaining = length
+                while remaining > 0:
+                    chunk = f.read(min(FILE_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _read_json_body(self) -> dict:
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            raise ValueError("Invalid Content-Length")
+        if length > MAX_FEEDBACK_BYTES:
+            raise ValueError("Request body too large")
+        data = json.loads(self.rfile.read(length))
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object")
+        return data
+
+    def _send_json(self, status: int, payload: dict, headers: dict[str, str] | None = None) -> None:
+        resp = json.dumps(payload).encode()
+        encoding = None
+        if len(resp) >= COMPRESS_MIN_SIZE and "gzip" in accepted_encodings(self.headers.get("Accept-Encoding")):
+            resp = gzip.compress(resp, compresslevel=GZIP_LEVEL, mtime=0)
+            encoding = "gzip"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(resp)))
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(resp)
+
     def do_POST(self) -> None:
         if self.path == "/api/feedback":
-            length = int(self.headers.get("Content-Length", 0))
-            body = self.rfile.read(length)
             try:
-                data = json.loads(body)
-                if not isinstance(data, dict) or "reviews" not in data:
-                    raise ValueError("Expected JSON object with 'reviews' key")
-                self.feedback_path.write_text(json.dumps(data, indent=2) + "\n")
-                resp = b'{"ok":true}'
-                self.send_response(200)
-            except (json.JSONDecodeError, OSError, ValueError) as e:
-                resp = json.dumps({"error": str(e)}).encode()
-                self.send_response(500)
-            self.send_header("Content-Type", "application/json")
-            self.send_header("Content-Length", str(len(resp)))
-            self.end_headers()
-            self.wfile.write(resp)
+                data = self._read_json_body()
+                if not isinstance(data.get("reviews"), list):
+                    raise ValueError("Expected JSON object with a 'reviews' list")
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            try:
+                self.feedback.replace(data)
+            except OSError as e:
+                self._send_json(500, {"error": str(e)})
+                return
+            self._send_json(200, {"ok": True})
         else:
             self.send_error(404)
 
+    def do_PUT(self) -> None:
+        # PUT /api/feedback/<run_id> {"feedback": "...", "timestamp"?, "status"?}
+        path = self.path.split("?", 1)[0]
+        if not path.startswith("/api/feedback/"):
+            self.send_error(404)
+            return
+        run_id = unquote(path[len("/api/feedback/"):])
+        try:
+            data = self._read_json_body()
+            feedback = data.get("feedback", "")
+            timestamp = data.get("timestamp")
+            status = data.get("status")
+            if not run_id or not isinstance(feedback, str):
+                raise ValueError("Expected a run id and a 'feedback' string")
+            if timestamp is not None and not isinstance(timestamp, str):
+                raise ValueError("'timestamp' must be a string")
+            if status is not None and status not in FEEDBACK_STATUSES:
+                raise ValueError(f"'status' must be one of {', '.join(FEEDBACK_STATUSES)}")
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        if self.index.get(run_id) is None:
+            # A run added since the last refresh
+            self.index.refresh()
+            if self.index.get(run_id) is None:
+                self._send_json(404, {"error": f"No run {run_id!r}"})
+                return
+        try:
+            count = self.feedback.upsert(run_id, feedback, timestamp, status)
+        except (OSError, ValueError) as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, {"ok": True, "reviews": count})
+
     def log_message(self, format: str, *args: object) -> None:
         # Suppress request logging to keep terminal clean
         pass
@@ -401,6 +2218,10 @@ def main() -> None:
         "--static", "-s", type=Path, default=None,
         help="Write standalone HTML to this path instead of starting a server",
     )
+    parser.add_argument(
+        "--static-dir", type=Path, default=None,
+        help="Write a static bundle (index.html plus shared, content-addressed run and output files) to this directory",
+    )
     args = parser.parse_args()
 
     workspace = args.workspace.resolve()
@@ -408,7 +2229,23 @@ def main() -> None:
         print(f"Error: {workspace} is not a directory", file=sys.stderr)
         sys.exit(1)
 
-    runs = find_runs(workspace)
+    # Served pages link to non-text outputs instead of embedding them
+    index = page_cache = renditions = xlsx = None
+    run_dirs: dict[str, Path] = {}
+    if args.static_dir:
+        # Bundles link outputs like a served page; StaticBundle copies them
+        runs = find_runs(workspace, "/files", run_dirs)
+    elif args.static:
+        runs = find_runs(workspace)
+    else:
+        # Thumbnails/previews are queued as runs are indexed
+        renditions = Renditions(workspace / ".review-cache" / "renditions")
+        xlsx = XlsxPreviews()
+        index = RunIndex(workspace, "/files", on_build=renditions.prefetch if renditions.extensions else None)
+        page_cache = PageCache()
+        index.refresh()
+        index.start_watcher()
+        runs = index.runs()
     if not runs:
         print(f"No runs found in {workspace}", file=sys.stderr)
         sys.exit(1)
@@ -417,8 +2254,13 @@ def main() -> None:
     feedback_path = workspace / "feedback.json"
 
     previous: dict[str, dict] = {}
+    previous_run_dirs: dict[str, Path] = {}
     if args.previous_workspace:
-        previous = load_previous_iteration(args.previous_workspace.resolve())
+        previous = load_previous_iteration(
+            args.previous_workspace.resolve(),
+            None if args.static and not args.static_dir else "/previous-files",
+            previous_run_dirs,
+        )
 
     benchmark_path = args.benchmark.resolve() if args.benchmark else None
     benchmark = None
@@ -428,6 +2270,17 @@ def main() -> None:
         except (json.JSONDecodeError, OSError):
             pass
 
+    if args.static_dir:
+        bundle = StaticBundle(args.static_dir.resolve())
+        index_path = bundle.export(runs, run_dirs, skill_name, previous, previous_run_dirs, benchmark)
+        stats = bundle.stats
+        print(f"\n  Static bundle written to: {index_path}")
+        print(
+            f"  {stats['outputs']} outputs stored as {stats['assets']} files, "
+            f"{stats['bytes_saved']:,} duplicate bytes skipped\n"
+        )
+        sys.exit(0)
+
     if args.static:
         html = generate_html(runs, skill_name, previous, benchmark)
         args.static.parent.mkdir(parents=True, exist_ok=True)
@@ -438,12 +2291,15 @@ def main() -> None:
     # Kill any existing process on the target port
     port = args.port
     _kill_port(port)
-    handler = partial(ReviewHandler, workspace, skill_name, feedback_path, previous, benchmark_path)
+    handler = partial(
+        ReviewHandler, workspace, skill_name, FeedbackStore(feedback_path), previous, benchmark_path, index, previous_run_dirs,
+        page_cache, renditions, xlsx,
+    )
     try:
-        server = HTTPServer(("127.0.0.1", port), handler)
+        server = PooledHTTPServer(("127.0.0.1", port), handler)
     except OSError:
         # Port still in use after kill attempt — find a free one
-        server = HTTPServer(("127.0.0.1", 0), handler)
+        server = PooledHTTPServer(("127.0.0.1", 0), handler)
         port = server.server_address[1]
 
     url = f"http://localhost:{port}"
@@ -458,6 +2314,8 @@ def main() -> None:
         print(f"  Benchmark: {benchmark_path}")
     print(f"\n  Press Ctrl+C to stop.\n")
 
+    import webbrowser
+
     webbrowser.open(url)
 
     try:
@@ -465,7 +2323,16 @@ def main() -> None:
     except KeyboardInterrupt:
         print("\nStopped.")
         server.server_close()
+        index.close()
+        if renditions:
+            renditions.close()
+        if xlsx:
+            xlsx.close()
 
 
 if __name__ == "__main__":
-    main()
+    # Profiling helpers live in the sibling scripts package
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "generate_review")
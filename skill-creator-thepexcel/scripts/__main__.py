@@ -0,0 +1,5 @@
+"""Allow `python -m scripts <subcommand>`; see scripts/cli.py."""
+
+from scripts.cli import main
+
+main(prog="python -m scripts")
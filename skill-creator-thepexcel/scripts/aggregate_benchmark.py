@@ -32,160 +32,374 @@ The script supports two directory layouts:
             │   └── run-1/grading.json
             └── without_skill/
                 └── run-1/grading.json
+
+Re-aggregation is incremental: benchmark.manifest.json (next to
+benchmark.json) records each run's grading.json/timing.json mtime, size and
+content hash with the metrics extracted from them, so only new or changed
+runs are parsed again. The significance tests and pairwise comparisons are
+kept there too, keyed by a hash of their inputs, so an unchanged workspace
+skips the resampling. Pass --no-manifest to force a full re-read.
+
+Sharded aggregation: run with --partial on each shard to write mergeable
+accumulators (count, Welford mean/variance, min/max, percentile reservoir)
+to benchmark.partial.json, then combine them anywhere with
+    python -m scripts.aggregate_benchmark --merge shard1.json shard2.json -o benchmark.json
 """
 
 import argparse
+import hashlib
+import heapq
 import json
-import math
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+from scripts.expectation_index import index_expectations
+from scripts.significance import CONFIDENCE, DEFAULT_RESAMPLES, backend, compare_samples
+from scripts.streaming_stats import RunningStats
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bump when the per-run record format changes so stale manifests are rebuilt
+MANIFEST_VERSION = 1
+
+# Version of the --partial shard format read by --merge
+PARTIAL_VERSION = 1
+
+SUMMARY_METRICS = ("pass_rate", "time_seconds", "tokens")
+# Resource metrics whose tails matter: these also get p50/p90/p95/p99
+PERCENTILE_METRICS = ("time_seconds", "tokens", "tool_calls")
+ACCUMULATED_METRICS = SUMMARY_METRICS + ("tool_calls",)
+SLOWEST_RUNS = 10
+
+# Threads for directory scans and file reads
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _file_signature(path: Path) -> list | None:
+    """(mtime_ns, size) of a file, or None if it doesn't exist."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_manifest(manifest_path: Path) -> dict:
+    """Load an aggregation manifest, or return an empty one if missing or stale."""
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return {"version": MANIFEST_VERSION, "evals": {}, "runs": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "evals": {}, "runs": {}}
+    return manifest
+
+
+def save_manifest(manifest_path: Path, manifest: dict) -> None:
+    tmp_path = manifest_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest))
+    tmp_path.replace(manifest_path)
+
+
+def manifest_path_for(output_json: Path) -> Path:
+    """The manifest lives next to benchmark.json as benchmark.manifest.json."""
+    return output_json.with_name(output_json.stem + ".manifest.json")
+
+
+def _loads(data: bytes):
+    """Parse JSON with orjson when installed, else the stdlib."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Fall through so inputs only the stdlib accepts (NaN, huge ints) parse the same
+            pass
+    return json.loads(data)
+
+
+def _read_eval_id(eval_dir: Path, eval_idx: int, cached: dict | None) -> tuple[int, dict]:
+    """Resolve an eval dir's eval_id. Returns (eval_id, manifest entry)."""
+    metadata_path = eval_dir / "eval_metadata.json"
+    signature = _file_signature(metadata_path)
+    if cached and cached["file"] == signature and cached["eval_idx"] == eval_idx:
+        return cached["eval_id"], cached
+
+    if signature is not None:
+        try:
+            eval_id = _loads(metadata_path.read_bytes()).get("eval_id", eval_idx)
+        except (json.JSONDecodeError, OSError):
+            eval_id = eval_idx
+    else:
+        try:
+            eval_id = int(eval_dir.name.split("-")[1])
+        except ValueError:
+            eval_id = eval_idx
 
-def calculate_stats(values: list[float]) -> dict:
-    """Calculate mean, stddev, min, max for a list of values."""
-    if not values:
-        return {"mean": 0.0, "stddev": 0.0, "min": 0.0, "max": 0.0}
+    return eval_id, {"file": signature, "eval_idx": eval_idx, "eval_id": eval_id}
 
-    n = len(values)
-    mean = sum(values) / n
 
-    if n > 1:
-        variance = sum((x - mean) ** 2 for x in values) / (n - 1)
-        stddev = math.sqrt(variance)
-    else:
-        stddev = 0.0
+def _scan_eval_dir(eval_dir: Path) -> list[tuple[str, list[Path]]]:
+    """List an eval dir's configs and their run dirs, both sorted by name.
 
-    return {
-        "mean": round(mean, 4),
-        "stddev": round(stddev, 4),
-        "min": round(min(values), 4),
-        "max": round(max(values), 4)
+    Config directories are discovered dynamically rather than hardcoded;
+    directories without run-* entries (inputs, outputs, etc.) are skipped.
+    """
+    with os.scandir(eval_dir) as it:
+        config_entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+    configs = []
+    for entry in config_entries:
+        with os.scandir(entry.path) as it:
+            run_names = sorted(e.name for e in it if e.name.startswith("run-"))
+        if run_names:
+            configs.append((entry.name, [Path(entry.path, name) for name in run_names]))
+    return configs
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def parse_run(run_dir: Path, grading_bytes: bytes, timing_bytes: bytes | None) -> dict | None:
+    """Extract one run's metrics from its grading.json (and timing.json) contents.
+
+    Returns None if grading.json is not valid JSON. eval_id is filled in by the caller.
+    """
+    grading_file = run_dir / "grading.json"
+    try:
+        grading = _loads(grading_bytes)
+    except json.JSONDecodeError as e:
+        print(f"Warning: Invalid JSON in {grading_file}: {e}")
+        return None
+
+    # Extract metrics
+    result = {
+        "run_number": int(run_dir.name.split("-")[1]),
+        "pass_rate": grading.get("summary", {}).get("pass_rate", 0.0),
+        "passed": grading.get("summary", {}).get("passed", 0),
+        "failed": grading.get("summary", {}).get("failed", 0),
+        "total": grading.get("summary", {}).get("total", 0),
     }
 
+    # Extract timing — check grading.json first, then sibling timing.json
+    timing = grading.get("timing", {})
+    result["time_seconds"] = timing.get("total_duration_seconds", 0.0)
+    if result["time_seconds"] == 0.0 and timing_bytes is not None:
+        try:
+            timing_data = _loads(timing_bytes)
+            result["time_seconds"] = timing_data.get("total_duration_seconds", 0.0)
+            result["tokens"] = timing_data.get("total_tokens", 0)
+        except json.JSONDecodeError:
+            pass
+
+    # Extract metrics if available
+    metrics = grading.get("execution_metrics", {})
+    result["tool_calls"] = metrics.get("total_tool_calls", 0)
+    if not result.get("tokens"):
+        result["tokens"] = metrics.get("output_chars", 0)
+    result["errors"] = metrics.get("errors_encountered", 0)
+
+    # Extract expectations — viewer requires fields: text, passed, evidence
+    raw_expectations = grading.get("expectations", [])
+    for exp in raw_expectations:
+        if "text" not in exp or "passed" not in exp:
+            print(f"Warning: expectation in {grading_file} missing required fields (text, passed, evidence): {exp}")
+    result["expectations"] = raw_expectations
+
+    # Extract notes from user_notes_summary
+    notes_summary = grading.get("user_notes_summary", {})
+    notes = []
+    notes.extend(notes_summary.get("uncertainties", []))
+    notes.extend(notes_summary.get("needs_review", []))
+    notes.extend(notes_summary.get("workarounds", []))
+    result["notes"] = notes
+
+    return result
+
+
+def _load_run(run_dir: Path, cached: dict | None) -> tuple[dict | None, dict | None, bool]:
+    """Load one run, reusing the manifest's record when its files are unchanged.
+
+    Safe to call from worker threads: nothing shared is mutated. Returns
+    (record, new manifest entry, reused).
+    """
+    grading_file = run_dir / "grading.json"
+    timing_file = run_dir / "timing.json"
+    signatures = [_file_signature(grading_file), _file_signature(timing_file)]
+    if signatures[0] is None:
+        print(f"Warning: grading.json not found in {run_dir}")
+        return None, None, False
+
+    if cached and cached["files"] == signatures:
+        return cached["record"], cached, True
+
+    try:
+        grading_bytes = grading_file.read_bytes()
+        timing_bytes = timing_file.read_bytes() if signatures[1] is not None else None
+    except OSError as e:
+        print(f"Warning: could not read {run_dir}: {e}")
+        return None, None, False
+
+    hashes = [_content_hash(grading_bytes), _content_hash(timing_bytes) if timing_bytes is not None else None]
+    if cached and cached["hashes"] == hashes:
+        # Touched but unchanged (e.g. copied or re-saved): keep the parsed record
+        record, reused = cached["record"], True
+    else:
+        record, reused = parse_run(run_dir, grading_bytes, timing_bytes), False
+    if record is None:
+        # Failures aren't cached, so the file is re-parsed (and warned about) until it's fixed
+        return None, None, False
+
+    return record, {"files": signatures, "hashes": hashes, "record": record}, reused
+
 
-def load_run_results(benchmark_dir: Path) -> dict:
+def load_run_results(benchmark_dir: Path, manifest: dict | None = None, workers: int = DEFAULT_WORKERS) -> dict:
     """
     Load all run results from a benchmark directory.
 
     Returns dict keyed by config name (e.g. "with_skill"/"without_skill",
     or "new_skill"/"old_skill"), each containing a list of run results.
+    Each result's run_dir is its directory relative to benchmark_dir.
+
+    Directory scans and file reads run on a pool of `workers` threads (they
+    are I/O bound, which matters on network storage); results come back in
+    the same sorted eval/config/run order as a serial walk.
+
+    If a manifest (from load_manifest) is given, runs whose grading.json and
+    timing.json are unchanged since the last aggregation reuse the cached
+    record instead of being re-parsed, and the manifest is updated in place.
     """
     # Support both layouts: eval dirs directly under benchmark_dir, or under runs/
     runs_dir = benchmark_dir / "runs"
     if runs_dir.exists():
         search_dir = runs_dir
+        prefix = "runs/"
     elif list(benchmark_dir.glob("eval-*")):
         search_dir = benchmark_dir
+        prefix = ""
     else:
         print(f"No eval directories found in {benchmark_dir} or {benchmark_dir / 'runs'}")
         return {}
 
+    with os.scandir(search_dir) as it:
+        eval_dirs = [Path(e.path) for e in sorted(it, key=lambda e: e.name) if e.name.startswith("eval-") and e.is_dir()]
+
+    cached_evals = manifest["evals"] if manifest is not None else {}
+    cached_runs = manifest["runs"] if manifest is not None else {}
+
+    def load_evals(batch: list[tuple[int, Path]]) -> list[tuple]:
+        """Scan and load a batch of eval dirs; one pool task amortizes per-task overhead."""
+        loaded = []
+        for eval_idx, eval_dir in batch:
+            eval_id, eval_entry = _read_eval_id(eval_dir, eval_idx, cached_evals.get(eval_dir.name))
+            configs = []
+            for config, run_dirs in _scan_eval_dir(eval_dir):
+                runs = []
+                for run_dir in run_dirs:
+                    key = f"{eval_dir.name}/{config}/{run_dir.name}"
+                    runs.append((key, *_load_run(run_dir, cached_runs.get(key))))
+                configs.append((config, runs))
+            loaded.append((eval_dir.name, eval_id, eval_entry, configs))
+        return loaded
+
+    indexed = list(enumerate(eval_dirs))
+    if workers <= 1:
+        batches = [load_evals(indexed)]
+    else:
+        # A few batches per thread keeps threads busy without a future per file
+        batch_size = max(1, len(indexed) // (workers * 4))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            batches = list(pool.map(load_evals, [indexed[i:i + batch_size] for i in range(0, len(indexed), batch_size)]))
+
     results: dict[str, list] = {}
+    seen_evals: dict[str, dict] = {}
+    seen_runs: dict[str, dict] = {}
+    stats = {"reused": 0, "parsed": 0}
+    for batch in batches:
+        for eval_name, eval_id, eval_entry, configs in batch:
+            seen_evals[eval_name] = eval_entry
+            for config, runs in configs:
+                config_results = results.setdefault(config, [])
+                for key, record, entry, reused in runs:
+                    if entry is not None:
+                        seen_runs[key] = entry
+                        stats["reused" if reused else "parsed"] += 1
+                    if record is not None:
+                        config_results.append({"eval_id": eval_id, **record, "run_dir": prefix + key})
+
+    if manifest is not None:
+        # Entries for runs and evals that no longer exist are dropped
+        manifest["runs"] = seen_runs
+        manifest["evals"] = seen_evals
+        print(f"Manifest: reused {stats['reused']} runs, parsed {stats['parsed']}")
 
-    for eval_idx, eval_dir in enumerate(sorted(search_dir.glob("eval-*"))):
-        metadata_path = eval_dir / "eval_metadata.json"
-        if metadata_path.exists():
-            try:
-                with open(metadata_path) as mf:
-                    eval_id = json.load(mf).get("eval_id", eval_idx)
-            except (json.JSONDecodeError, OSError):
-                eval_id = eval_idx
-        else:
-            try:
-                eval_id = int(eval_dir.name.split("-")[1])
-            except ValueError:
-                eval_id = eval_idx
+    return results
 
-        # Discover config directories dynamically rather than hardcoding names
-        for config_dir in sorted(eval_dir.iterdir()):
-            if not config_dir.is_dir():
-                continue
-            # Skip non-config directories (inputs, outputs, etc.)
-            if not list(config_dir.glob("run-*")):
-                continue
-            config = config_dir.name
-            if config not in results:
-                results[config] = []
 
-            for run_dir in sorted(config_dir.glob("run-*")):
-                run_number = int(run_dir.name.split("-")[1])
-                grading_file = run_dir / "grading.json"
+def accumulate_results(results: dict) -> dict:
+    """Fold run results into mergeable per-config, per-metric RunningStats."""
+    return {
+        config: {
+            "pass_rate": RunningStats().extend(r["pass_rate"] for r in runs),
+            "time_seconds": RunningStats().extend(r["time_seconds"] for r in runs),
+            "tokens": RunningStats().extend(r.get("tokens", 0) for r in runs),
+            "tool_calls": RunningStats().extend(r.get("tool_calls", 0) for r in runs),
+        }
+        for config, runs in results.items()
+    }
 
-                if not grading_file.exists():
-                    print(f"Warning: grading.json not found in {run_dir}")
-                    continue
 
-                try:
-                    with open(grading_file) as f:
-                        grading = json.load(f)
-                except json.JSONDecodeError as e:
-                    print(f"Warning: Invalid JSON in {grading_file}: {e}")
-                    continue
+def _metric_summary(stats: RunningStats, metric: str) -> dict:
+    summary = stats.summary()
+    if metric in PERCENTILE_METRICS:
+        summary.update(stats.percentiles())
+    return summary
 
-                # Extract metrics
-                result = {
-                    "eval_id": eval_id,
-                    "run_number": run_number,
-                    "pass_rate": grading.get("summary", {}).get("pass_rate", 0.0),
-                    "passed": grading.get("summary", {}).get("passed", 0),
-                    "failed": grading.get("summary", {}).get("failed", 0),
-                    "total": grading.get("summary", {}).get("total", 0),
-                }
-
-                # Extract timing — check grading.json first, then sibling timing.json
-                timing = grading.get("timing", {})
-                result["time_seconds"] = timing.get("total_duration_seconds", 0.0)
-                timing_file = run_dir / "timing.json"
-                if result["time_seconds"] == 0.0 and timing_file.exists():
-                    try:
-                        with open(timing_file) as tf:
-                            timing_data = json.load(tf)
-                        result["time_seconds"] = timing_data.get("total_duration_seconds", 0.0)
-                        result["tokens"] = timing_data.get("total_tokens", 0)
-                    except json.JSONDecodeError:
-                        pass
-
-                # Extract metrics if available
-                metrics = grading.get("execution_metrics", {})
-                result["tool_calls"] = metrics.get("total_tool_calls", 0)
-                if not result.get("tokens"):
-                    result["tokens"] = metrics.get("output_chars", 0)
-                result["errors"] = metrics.get("errors_encountered", 0)
-
-                # Extract expectations — viewer requires fields: text, passed, evidence
-                raw_expectations = grading.get("expectations", [])
-                for exp in raw_expectations:
-                    if "text" not in exp or "passed" not in exp:
-                        print(f"Warning: expectation in {grading_file} missing required fields (text, passed, evidence): {exp}")
-                result["expectations"] = raw_expectations
-
-                # Extract notes from user_notes_summary
-                notes_summary = grading.get("user_notes_summary", {})
-                notes = []
-                notes.extend(notes_summary.get("uncertainties", []))
-                notes.extend(notes_summary.get("needs_review", []))
-                notes.extend(notes_summary.get("workarounds", []))
-                result["notes"] = notes
-
-                results[config].append(result)
 
-    return results
+def merge_accumulators(shards: list[dict]) -> dict:
+    """Combine accumulate_results() outputs from several shards, keeping first-seen config order."""
+    merged: dict[str, dict] = {}
+    for shard in shards:
+        for config, metrics in shard.items():
+            target = merged.setdefault(config, {metric: RunningStats() for metric in ACCUMULATED_METRICS})
+            for metric in ACCUMULATED_METRICS:
+                # Partials written before a metric was tracked simply lack it
+                if metric in metrics:
+                    target[metric].merge(metrics[metric])
+    return merged
 
 
-def aggregate_results(results: dict) -> dict:
+def resolve_baseline(configs: list[str], baseline: str | None = None) -> tuple[str | None, str | None]:
     """
-    Aggregate run results into summary statistics.
+    Pick (primary, baseline) configs. The baseline defaults to the second
+    config, so two-config benchmarks keep comparing first vs second; the
+    primary is the first config that isn't the baseline.
+    """
+    if baseline is not None and baseline not in configs:
+        raise ValueError(f"Baseline '{baseline}' is not one of the configurations: {', '.join(configs) or 'none'}")
+    if baseline is None:
+        baseline = configs[1] if len(configs) >= 2 else None
+    primary = next((c for c in configs if c != baseline), None)
+    return primary, baseline
 
-    Returns run_summary with stats for each configuration and delta.
+
+def summarize_accumulators(accumulators: dict, baseline: str | None = None) -> dict:
+    """
+    Turn per-config accumulators into run_summary with stats for each configuration and delta
+    (primary minus baseline; see resolve_baseline).
     """
     run_summary = {}
-    configs = list(results.keys())
+    configs = list(accumulators.keys())
 
     for config in configs:
-        runs = results.get(config, [])
+        metrics = accumulators[config]
 
-        if not runs:
+        if metrics["pass_rate"].count == 0:
             run_summary[config] = {
                 "pass_rate": {"mean": 0.0, "stddev": 0.0, "min": 0.0, "max": 0.0},
                 "time_seconds": {"mean": 0.0, "stddev": 0.0, "min": 0.0, "max": 0.0},
@@ -193,27 +407,15 @@ def aggregate_results(results: dict) -> dict:
             }
             continue
 
-        pass_rates = [r["pass_rate"] for r in runs]
-        times = [r["time_seconds"] for r in runs]
-        tokens = [r.get("tokens", 0) for r in runs]
-
-        run_summary[config] = {
-            "pass_rate": calculate_stats(pass_rates),
-            "time_seconds": calculate_stats(times),
-            "tokens": calculate_stats(tokens)
-        }
+        run_summary[config] = {metric: _metric_summary(metrics[metric], metric) for metric in ACCUMULATED_METRICS}
 
-    # Calculate delta between the first two configs (if two exist)
-    if len(configs) >= 2:
-        primary = run_summary.get(configs[0], {})
-        baseline = run_summary.get(configs[1], {})
-    else:
-        primary = run_summary.get(configs[0], {}) if configs else {}
-        baseline = {}
+    primary_name, baseline_name = resolve_baseline(configs, baseline)
+    primary = run_summary.get(primary_name, {}) if primary_name else {}
+    baseline_summary = run_summary.get(baseline_name, {}) if baseline_name else {}
 
-    delta_pass_rate = primary.get("pass_rate", {}).get("mean", 0) - baseline.get("pass_rate", {}).get("mean", 0)
-    delta_time = primary.get("time_seconds", {}).get("mean", 0) - baseline.get("time_seconds", {}).get("mean", 0)
-    delta_tokens = primary.get("tokens", {}).get("mean", 0) - baseline.get("tokens", {}).get("mean", 0)
+    delta_pass_rate = primary.get("pass_rate", {}).get("mean", 0) - baseline_summary.get("pass_rate", {}).get("mean", 0)
+    delta_time = primary.get("time_seconds", {}).get("mean", 0) - baseline_summary.get("time_seconds", {}).get("mean", 0)
+    delta_tokens = primary.get("tokens", {}).get("mean", 0) - baseline_summary.get("tokens", {}).get("mean", 0)
 
     run_summary["delta"] = {
         "pass_rate": f"{delta_pass_rate:+.2f}",
@@ -224,12 +426,299 @@ def aggregate_results(results: dict) -> dict:
     return run_summary
 
 
-def generate_benchmark(benchmark_dir: Path, skill_name: str = "", skill_path: str = "") -> dict:
+def aggregate_results(results: dict, baseline: str | None = None) -> dict:
+    """
+    Aggregate run results into summary statistics.
+
+    Returns run_summary with stats for each configuration and delta.
+    """
+    return summarize_accumulators(accumulate_results(results), baseline)
+
+
+def summarize_per_eval(results: dict) -> list[dict]:
+    """Percentile profile of time, tokens and tool calls for each eval and config."""
+    per_eval: dict = {}
+    for config, runs in results.items():
+        for r in runs:
+            eval_configs = per_eval.setdefault(r["eval_id"], {})
+            metrics = eval_configs.setdefault(config, {metric: RunningStats() for metric in PERCENTILE_METRICS})
+            for metric in PERCENTILE_METRICS:
+                metrics[metric].add(r.get(metric, 0))
+    return [
+        {
+            "eval_id": eval_id,
+            "configs": {
+                config: {metric: _metric_summary(stats, metric) for metric, stats in metrics.items()}
+                for config, metrics in per_eval[eval_id].items()
+            },
+        }
+        for eval_id in sorted(per_eval)
+    ]
+
+
+def find_slowest_runs(results: dict, limit: int = SLOWEST_RUNS) -> dict:
+    """The `limit` largest runs by each resource metric, with their run directories."""
+    all_runs = [(config, r) for config, runs in results.items() for r in runs]
+    slowest = {}
+    for metric in PERCENTILE_METRICS:
+        top = heapq.nlargest(limit, all_runs, key=lambda item: item[1].get(metric, 0))
+        slowest[metric] = [
+            {
+                "eval_id": r["eval_id"],
+                "configuration": config,
+                "run_number": r["run_number"],
+                "run_dir": r.get("run_dir", ""),
+                "value": r.get(metric, 0),
+            }
+            for config, r in top
+        ]
+    return slowest
+
+
+def group_values(results: dict) -> tuple[dict, dict]:
+    """
+    One pass over the runs: metric values per config, and per eval and config.
+
+    Returns (overall, per_eval) with overall[config][metric] and
+    per_eval[eval_id][config][metric] as lists, for the significance tests.
+    """
+    overall: dict = {}
+    per_eval: dict = {}
+    for config, runs in results.items():
+        config_values = overall.setdefault(config, {metric: [] for metric in SUMMARY_METRICS})
+        for r in runs:
+            eval_values = per_eval.setdefault(r["eval_id"], {}).setdefault(config, {metric: [] for metric in SUMMARY_METRICS})
+            for metric in SUMMARY_METRICS:
+                value = r.get(metric, 0)
+                config_values[metric].append(value)
+                eval_values[metric].append(value)
+    return overall, per_eval
+
+
+def _compare_configs(values_a: dict | None, values_b: dict | None, resamples: int, seed: int) -> dict:
+    return {
+        metric: compare_samples((values_a or {}).get(metric, []), (values_b or {}).get(metric, []), resamples, seed)
+        for metric in SUMMARY_METRICS
+    }
+
+
+def compute_significance(
+    overall: dict,
+    per_eval: dict,
+    primary: str | None,
+    baseline: str | None,
+    resamples: int = DEFAULT_RESAMPLES,
+    seed: int = 0,
+    comparisons: dict | None = None,
+) -> dict | None:
+    """
+    Bootstrap CIs, permutation p-values and effect sizes for primary vs
+    baseline, overall and per eval, from group_values() output. None if
+    there is nothing to compare.
+
+    Pass compute_comparisons() output to read the overall test off its
+    primary-vs-baseline pair instead of running it again.
+    """
+    if primary is None or baseline is None or resamples <= 0:
+        return None
+    vs_baseline = (comparisons or {}).get("vs_baseline", {})
+    if comparisons and comparisons["baseline"] == baseline and primary in vs_baseline:
+        overall_stats = vs_baseline[primary]
+    else:
+        overall_stats = _compare_configs(overall.get(primary), overall.get(baseline), resamples, seed)
+    return {
+        "primary": primary,
+        "baseline": baseline,
+        "backend": backend(),
+        "overall": overall_stats,
+        "per_eval": [
+            {"eval_id": eval_id, **_compare_configs(configs.get(primary), configs.get(baseline), resamples, seed)}
+            for eval_id, configs in sorted(per_eval.items())
+            if primary in configs or baseline in configs
+        ],
+    }
+
+
+def _flip_comparison(stats: dict | None) -> dict | None:
+    """The same comparison seen from the other side (b - a instead of a - b)."""
+    if stats is None:
+        return None
+    flipped = dict(stats)
+    flipped.update({
+        "n_a": stats["n_b"],
+        "n_b": stats["n_a"],
+        "delta": -stats["delta"],
+        "ci_low": -stats["ci_high"],
+        "ci_high": -stats["ci_low"],
+        "hedges_g": -stats["hedges_g"] if stats["hedges_g"] is not None else None,
+        "cliffs_delta": -stats["cliffs_delta"],
+    })
+    return flipped
+
+
+def compute_comparisons(
+    overall: dict,
+    baseline: str | None,
+    resamples: int = DEFAULT_RESAMPLES,
+    seed: int = 0,
+) -> dict | None:
+    """
+    Every unordered pair of configs, each with delta (a - b), bootstrap CI,
+    p-value and effect sizes, plus every config against the baseline (read
+    off the pairs, not recomputed). None with fewer than two configs.
+    """
+    configs = list(overall.keys())
+    if len(configs) < 2 or baseline is None or resamples <= 0:
+        return None
+    pairs = []
+    vs_baseline = {}
+    for i, a in enumerate(configs):
+        for b in configs[i + 1:]:
+            metrics = _compare_configs(overall[a], overall[b], resamples, seed)
+            pairs.append({"a": a, "b": b, **metrics})
+            if b == baseline:
+                vs_baseline[a] = metrics
+            elif a == baseline:
+                vs_baseline[b] = {metric: _flip_comparison(stats) for metric, stats in metrics.items()}
+    return {
+        "baseline": baseline,
+        "configs": configs,
+        "vs_baseline": {config: vs_baseline[config] for config in configs if config in vs_baseline},
+        "pairs": pairs,
+    }
+
+
+def _cached_tests(
+    manifest: dict | None,
+    overall: dict,
+    per_eval: dict,
+    primary: str | None,
+    baseline: str | None,
+    resamples: int,
+) -> tuple[dict | None, dict | None]:
+    """(comparisons, significance), reused from the manifest when their inputs are unchanged."""
+    inputs = [overall, sorted(per_eval.items(), key=lambda item: str(item[0])), primary, baseline, resamples, CONFIDENCE, backend()]
+    key = _content_hash(json.dumps(inputs).encode())
+    cached = manifest.get("tests") if manifest is not None else None
+    if cached and cached.get("key") == key:
+        return cached["comparisons"], cached["significance"]
+
+    comparisons = compute_comparisons(overall, baseline, resamples)
+    significance = compute_significance(overall, per_eval, primary, baseline, resamples, comparisons=comparisons)
+    if manifest is not None:
+        manifest["tests"] = {"key": key, "comparisons": comparisons, "significance": significance}
+    return comparisons, significance
+
+
+def _benchmark_metadata(skill_name: str, skill_path: str, eval_ids: list) -> dict:
+    return {
+        "skill_name": skill_name or "<skill-name>",
+        "skill_path": skill_path or "<path/to/skill>",
+        "executor_model": "<model-name>",
+        "analyzer_model": "<model-name>",
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "evals_run": eval_ids,
+        "runs_per_configuration": 3
+    }
+
+
+def generate_partial(
+    benchmark_dir: Path,
+    skill_name: str = "",
+    skill_path: str = "",
+    manifest: dict | None = None,
+    workers: int = DEFAULT_WORKERS,
+) -> dict:
+    """
+    Aggregate one shard into serialized accumulators instead of a final summary.
+
+    Partials from shards aggregated on different machines are combined with
+    merge_partials (--merge) without moving the raw runs.
+    """
+    results = load_run_results(benchmark_dir, manifest, workers)
+    eval_ids = sorted(set(r["eval_id"] for config in results.values() for r in config))
+    return {
+        "kind": "benchmark_partial",
+        "version": PARTIAL_VERSION,
+        "metadata": _benchmark_metadata(skill_name, skill_path, eval_ids),
+        "accumulators": {
+            config: {metric: stats.to_dict() for metric, stats in metrics.items()}
+            for config, metrics in accumulate_results(results).items()
+        },
+    }
+
+
+def merge_partials(
+    partials: list[dict],
+    skill_name: str = "",
+    skill_path: str = "",
+    resamples: int = DEFAULT_RESAMPLES,
+    baseline: str | None = None,
+) -> dict:
+    """Combine shard partials into a benchmark.json-shaped dict (without per-run records)."""
+    shards = []
+    eval_ids = set()
+    for partial in partials:
+        if partial.get("kind") != "benchmark_partial" or partial.get("version") != PARTIAL_VERSION:
+            raise ValueError(f"Not a version-{PARTIAL_VERSION} benchmark partial")
+        shards.append({
+            config: {metric: RunningStats.from_dict(data) for metric, data in metrics.items()}
+            for config, metrics in partial["accumulators"].items()
+        })
+        eval_ids.update(partial["metadata"].get("evals_run", []))
+
+    first = partials[0]["metadata"] if partials else {}
+    metadata = _benchmark_metadata(
+        skill_name or first.get("skill_name", ""),
+        skill_path or first.get("skill_path", ""),
+        sorted(eval_ids),
+    )
+    metadata["shards_merged"] = len(partials)
+    merged = merge_accumulators(shards)
+
+    primary, baseline = resolve_baseline(list(merged.keys()), baseline)
+
+    # Raw runs stay on the shards; test on the merged reservoir samples instead
+    samples = {
+        config: {metric: metrics[metric].reservoir for metric in SUMMARY_METRICS}
+        for config, metrics in merged.items()
+    }
+    comparisons = compute_comparisons(samples, baseline, resamples)
+    significance = compute_significance(samples, {}, primary, baseline, resamples, comparisons=comparisons)
+    if significance:
+        significance["source"] = "reservoir"
+
+    return {
+        "metadata": metadata,
+        "runs": [],
+        "run_summary": summarize_accumulators(merged, baseline),
+        "comparisons": comparisons,
+        "significance": significance,
+        "notes": []  # To be filled by analyzer
+    }
+
+
+def generate_benchmark(
+    benchmark_dir: Path,
+    skill_name: str = "",
+    skill_path: str = "",
+    manifest: dict | None = None,
+    workers: int = DEFAULT_WORKERS,
+    resamples: int = DEFAULT_RESAMPLES,
+    slowest: int = SLOWEST_RUNS,
+    baseline: str | None = None,
+) -> dict:
     """
     Generate complete benchmark.json from run results.
+
+    Pass a manifest to reuse per-run records and, when nothing changed, the
+    significance tests from the previous aggregation.
+    Deltas and comparisons are against `baseline` (default: the second config).
     """
-    results = load_run_results(benchmark_dir)
-    run_summary = aggregate_results(results)
+    results = load_run_results(benchmark_dir, manifest, workers)
+    primary, baseline = resolve_baseline(list(results.keys()), baseline)
+    run_summary = aggregate_results(results, baseline)
+    overall_values, per_eval_values = group_values(results)
 
     # Build runs array for benchmark.json
     runs = []
@@ -239,6 +728,7 @@ def generate_benchmark(benchmark_dir: Path, skill_name: str = "", skill_path: st
                 "eval_id": result["eval_id"],
                 "configuration": config,
                 "run_number": result["run_number"],
+                "run_dir": result["run_dir"],
                 "result": {
                     "pass_rate": result["pass_rate"],
                     "passed": result["passed"],
@@ -260,67 +750,272 @@ def generate_benchmark(benchmark_dir: Path, skill_name: str = "", skill_path: st
         for r in config
     ))
 
+    metadata = _benchmark_metadata(skill_name, skill_path, eval_ids)
+    metadata["baseline"] = baseline
+    comparisons, significance = _cached_tests(manifest, overall_values, per_eval_values, primary, baseline, resamples)
     benchmark = {
-        "metadata": {
-            "skill_name": skill_name or "<skill-name>",
-            "skill_path": skill_path or "<path/to/skill>",
-            "executor_model": "<model-name>",
-            "analyzer_model": "<model-name>",
-            "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-            "evals_run": eval_ids,
-            "runs_per_configuration": 3
-        },
+        "metadata": metadata,
         "runs": runs,
         "run_summary": run_summary,
+        "per_eval_summary": summarize_per_eval(results),
+        "slowest_runs": find_slowest_runs(results, slowest),
+        "comparisons": comparisons,
+        "significance": significance,
+        "expectation_summary": index_expectations([results]),
         "notes": []  # To be filled by analyzer
     }
 
     return benchmark
 
 
-def generate_markdown(benchmark: dict) -> str:
-    """Generate human-readable benchmark.md from benchmark data."""
+SIGNIFICANCE_FORMATS = {"pass_rate": ("Pass Rate", "{:+.2f}"), "time_seconds": ("Time", "{:+.1f}s"), "tokens": ("Tokens", "{:+.0f}")}
+
+
+def _format_comparison(stats: dict | None, fmt: str) -> tuple[str, str]:
+    """(delta with CI, p-value) cells for one metric."""
+    if not stats:
+        return "—", "—"
+    interval = f"{fmt.format(stats['delta'])} [{fmt.format(stats['ci_low'])}, {fmt.format(stats['ci_high'])}]"
+    p_value = f"{stats['p_value']:.3f}" + ("*" if stats["p_exact"] else "")
+    return interval, p_value
+
+
+def _significance_markdown(significance: dict) -> list[str]:
+    primary = significance["primary"].replace("_", " ").title()
+    baseline = significance["baseline"].replace("_", " ").title()
+    overall = significance["overall"]
+    lines = [
+        "",
+        f"## Significance ({primary} vs {baseline})",
+        "",
+        "| Metric | Delta [95% CI] | p-value | Hedges' g | Cliff's δ |",
+        "|--------|----------------|---------|-----------|-----------|",
+    ]
+    resamples = 0
+    for metric, (label, fmt) in SIGNIFICANCE_FORMATS.items():
+        stats = overall.get(metric)
+        interval, p_value = _format_comparison(stats, fmt)
+        g = stats.get("hedges_g") if stats else None
+        cliffs = f"{stats['cliffs_delta']:+.2f}" if stats else "—"
+        lines.append(f"| {label} | {interval} | {p_value} | {f'{g:+.2f}' if g is not None else '—'} | {cliffs} |")
+        if stats:
+            resamples = max(resamples, stats["resamples"])
+
+    if significance.get("per_eval"):
+        lines.extend([
+            "",
+            "### Per Eval",
+            "",
+            "| Eval | Pass Rate Δ [95% CI] | p | Time Δ [95% CI] | p | Tokens Δ [95% CI] | p |",
+            "|------|----------------------|---|-----------------|---|-------------------|---|",
+        ])
+        for entry in significance["per_eval"]:
+            cells = []
+            for metric, (_, fmt) in SIGNIFICANCE_FORMATS.items():
+                cells.extend(_format_comparison(entry.get(metric), fmt))
+            lines.append(f"| {entry['eval_id']} | " + " | ".join(cells) + " |")
+
+    source = " on merged shard samples" if significance.get("source") == "reservoir" else ""
+    lines.extend([
+        "",
+        f"_Percentile bootstrap CIs and two-sided permutation tests ({resamples} resamples, {significance['backend']}{source}); "
+        "* marks exact p-values from enumerating every relabelling._",
+    ])
+    return lines
+
+
+SUMMARY_ROWS = (
+    ("pass_rate", "Pass Rate", lambda st: f"{st.get('mean', 0)*100:.0f}% ± {st.get('stddev', 0)*100:.0f}%", "{:+.2f}"),
+    ("time_seconds", "Time", lambda st: f"{st.get('mean', 0):.1f}s ± {st.get('stddev', 0):.1f}s", "{:+.1f}s"),
+    ("tokens", "Tokens", lambda st: f"{st.get('mean', 0):.0f} ± {st.get('stddev', 0):.0f}", "{:+.0f}"),
+)
+
+
+def _comparison_matrix_markdown(comparisons: dict) -> list[str]:
+    """Row-minus-column delta matrices for every metric, from the pairwise comparisons."""
+    configs = comparisons["configs"]
+    labels = {c: c.replace("_", " ").title() for c in configs}
+    cells: dict = {}
+    for pair in comparisons["pairs"]:
+        for metric in SUMMARY_METRICS:
+            cells[(pair["a"], pair["b"], metric)] = pair.get(metric)
+            cells[(pair["b"], pair["a"], metric)] = _flip_comparison(pair.get(metric))
+
+    lines = [
+        "",
+        "## Pairwise Comparisons",
+        "",
+        f"Each cell is row minus column, with the permutation-test p-value; **bold** when the 95% CI excludes zero. Baseline: {labels[comparisons['baseline']]}.",
+    ]
+    for metric, (label, fmt) in SIGNIFICANCE_FORMATS.items():
+        lines.extend([
+            "",
+            f"### {label}",
+            "",
+            "| | " + " | ".join(labels[c] for c in configs) + " |",
+            "|---|" + "---|" * len(configs),
+        ])
+        for row in configs:
+            row_cells = []
+            for col in configs:
+                stats = cells.get((row, col, metric))
+                if row == col or not stats:
+                    row_cells.append("—")
+                    continue
+                text = f"{fmt.format(stats['delta'])} (p={stats['p_value']:.2f})"
+                excludes_zero = stats["ci_low"] > 0 or stats["ci_high"] < 0
+                row_cells.append(f"**{text}**" if excludes_zero else text)
+            lines.append(f"| {labels[row]} | " + " | ".join(row_cells) + " |")
+    return lines
+
+
+FLAKY_EXPECTATIONS = 10
+
+
+def _flaky_markdown(expectations: list[dict], configs: list[str]) -> list[str]:
+    """The costliest expectations whose verdict differs between reruns of the same eval/config."""
+    flaky = [e for e in expectations if e["flakiness"] > 0][:FLAKY_EXPECTATIONS]
+    if not flaky:
+        return []
+    labels = [c.replace("_", " ").title() for c in configs]
+    lines = [
+        "",
+        "## Flaky Assertions",
+        "",
+        f"{sum(e['flakiness'] > 0 for e in expectations)} of {len(expectations)} expectations disagree between runs of the same eval and configuration. "
+        "Flakiness is the share of same-eval, same-config run pairs that disagree; disagreeing runs are the minority verdicts.",
+        "",
+        "| Expectation | Flakiness | Disagreeing Runs | " + " | ".join(labels) + " |",
+        "|-------------|-----------|------------------|" + "|".join("-" * (len(label) + 2) for label in labels) + "|",
+    ]
+    for entry in flaky:
+        text = entry["text"].replace("|", "\\|")
+        if len(text) > 80:
+            text = text[:77] + "..."
+        rates = []
+        for config in configs:
+            stats = entry["configs"].get(config)
+            rates.append(f"{stats['pass_rate']*100:.0f}% ({stats['runs']})" if stats else "—")
+        lines.append(f"| {text} | {entry['flakiness']:.2f} | {entry['disagreeing_runs']} | " + " | ".join(rates) + " |")
+    return lines
+
+
+RESOURCE_FORMATS = {"time_seconds": ("Time", "{:.1f}s"), "tokens": ("Tokens", "{:.0f}"), "tool_calls": ("Tool Calls", "{:.0f}")}
+
+
+def _resource_markdown(benchmark: dict, configs: list[str], link_base: str) -> list[str]:
+    """Tail percentiles per config and eval, plus the slowest-runs index."""
+    run_summary = benchmark["run_summary"]
+    lines = [
+        "",
+        "## Resource Profile",
+        "",
+        "| Metric | Configuration | p50 | p90 | p95 | p99 | Max |",
+        "|--------|---------------|-----|-----|-----|-----|-----|",
+    ]
+    for metric, (label, fmt) in RESOURCE_FORMATS.items():
+        for config in configs:
+            stats = run_summary.get(config, {}).get(metric)
+            if not stats or "p50" not in stats:
+                continue
+            cells = [fmt.format(stats[key]) for key in ("p50", "p90", "p95", "p99", "max")]
+            lines.append(f"| {label} | {config.replace('_', ' ').title()} | " + " | ".join(cells) + " |")
+
+    per_eval = benchmark.get("per_eval_summary") or []
+    if per_eval:
+        lines.extend([
+            "",
+            "### Per Eval (p50 / p95)",
+            "",
+            "| Eval | Configuration | Time | Tokens | Tool Calls |",
+            "|------|---------------|------|--------|------------|",
+        ])
+        for entry in per_eval:
+            for config, metrics in entry["configs"].items():
+                cells = [
+                    f"{fmt.format(metrics[metric]['p50'])} / {fmt.format(metrics[metric]['p95'])}"
+                    for metric, (_, fmt) in RESOURCE_FORMATS.items()
+                ]
+                lines.append(f"| {entry['eval_id']} | {config.replace('_', ' ').title()} | " + " | ".join(cells) + " |")
+
+    slowest = benchmark.get("slowest_runs") or {}
+    if any(slowest.values()):
+        lines.extend(["", "## Slowest Runs"])
+        for metric, (label, fmt) in RESOURCE_FORMATS.items():
+            if not slowest.get(metric):
+                continue
+            lines.extend(["", f"### By {label}", ""])
+            for i, run in enumerate(slowest[metric], 1):
+                target = f"{link_base}/{run['run_dir']}" if link_base not in ("", ".") else run["run_dir"]
+                lines.append(
+                    f"{i}. {fmt.format(run['value'])} — eval {run['eval_id']}, "
+                    f"{run['configuration'].replace('_', ' ').title()} run {run['run_number']} "
+                    f"([{run['run_dir']}]({target}/))"
+                )
+    return lines
+
+
+def generate_markdown(benchmark: dict, link_base: str = "") -> str:
+    """Generate human-readable benchmark.md from benchmark data.
+
+    link_base is the benchmark directory relative to where benchmark.md is
+    written, used for links to run directories.
+    """
     metadata = benchmark["metadata"]
     run_summary = benchmark["run_summary"]
 
     # Determine config names (excluding "delta")
     configs = [k for k in run_summary if k != "delta"]
-    config_a = configs[0] if len(configs) >= 1 else "config_a"
-    config_b = configs[1] if len(configs) >= 2 else "config_b"
-    label_a = config_a.replace("_", " ").title()
-    label_b = config_b.replace("_", " ").title()
+    baseline = metadata.get("baseline") or (configs[1] if len(configs) >= 2 else None)
+    others = [c for c in configs if c != baseline]
+    labels = {c: c.replace("_", " ").title() for c in configs}
 
+    # Two configs keep the single Delta column; more get one delta column per non-baseline config
+    if len(configs) == 2:
+        delta_headers = ["Delta"]
+    else:
+        delta_headers = [f"Δ {labels[c]}" for c in others] if baseline else []
+
+    header = ["Metric", *(labels[c] for c in configs), *delta_headers]
     lines = [
         f"# Skill Benchmark: {metadata['skill_name']}",
         "",
         f"**Model**: {metadata['executor_model']}",
         f"**Date**: {metadata['timestamp']}",
         f"**Evals**: {', '.join(map(str, metadata['evals_run']))} ({metadata['runs_per_configuration']} runs each per configuration)",
+    ]
+    if baseline and len(configs) > 2:
+        lines.append(f"**Baseline**: {labels[baseline]}")
+    lines.extend([
         "",
         "## Summary",
         "",
-        f"| Metric | {label_a} | {label_b} | Delta |",
-        "|--------|------------|---------------|-------|",
-    ]
+        "| " + " | ".join(header) + " |",
+        "|" + "|".join("-" * (len(h) + 2) for h in header) + "|",
+    ])
 
-    a_summary = run_summary.get(config_a, {})
-    b_summary = run_summary.get(config_b, {})
     delta = run_summary.get("delta", {})
-
-    # Format pass rate
-    a_pr = a_summary.get("pass_rate", {})
-    b_pr = b_summary.get("pass_rate", {})
-    lines.append(f"| Pass Rate | {a_pr.get('mean', 0)*100:.0f}% ± {a_pr.get('stddev', 0)*100:.0f}% | {b_pr.get('mean', 0)*100:.0f}% ± {b_pr.get('stddev', 0)*100:.0f}% | {delta.get('pass_rate', '—')} |")
-
-    # Format time
-    a_time = a_summary.get("time_seconds", {})
-    b_time = b_summary.get("time_seconds", {})
-    lines.append(f"| Time | {a_time.get('mean', 0):.1f}s ± {a_time.get('stddev', 0):.1f}s | {b_time.get('mean', 0):.1f}s ± {b_time.get('stddev', 0):.1f}s | {delta.get('time_seconds', '—')}s |")
-
-    # Format tokens
-    a_tokens = a_summary.get("tokens", {})
-    b_tokens = b_summary.get("tokens", {})
-    lines.append(f"| Tokens | {a_tokens.get('mean', 0):.0f} ± {a_tokens.get('stddev', 0):.0f} | {b_tokens.get('mean', 0):.0f} ± {b_tokens.get('stddev', 0):.0f} | {delta.get('tokens', '—')} |")
+    for metric, label, cell, delta_fmt in SUMMARY_ROWS:
+        cells = [cell(run_summary.get(c, {}).get(metric, {})) for c in configs]
+        if len(configs) == 2:
+            legacy = delta.get(metric, "—")
+            cells.append(f"{legacy}s" if metric == "time_seconds" else legacy)
+        elif baseline:
+            base_mean = run_summary.get(baseline, {}).get(metric, {}).get("mean", 0)
+            for c in others:
+                cells.append(delta_fmt.format(run_summary.get(c, {}).get(metric, {}).get("mean", 0) - base_mean))
+        lines.append(f"| {label} | " + " | ".join(cells) + " |")
+
+    comparisons = benchmark.get("comparisons")
+    if comparisons and len(comparisons.get("configs", [])) > 2:
+        lines.extend(_comparison_matrix_markdown(comparisons))
+
+    significance = benchmark.get("significance")
+    if significance:
+        lines.extend(_significance_markdown(significance))
+
+    lines.extend(_resource_markdown(benchmark, configs, link_base))
+    lines.extend(_flaky_markdown(benchmark.get("expectation_summary", []), configs))
 
     # Notes section
     if benchmark.get("notes"):
@@ -342,7 +1037,8 @@ def main():
     parser.add_argument(
         "benchmark_dir",
         type=Path,
-        help="Path to the benchmark directory"
+        nargs="?",
+        help="Path to the benchmark directory (omit with --merge)"
     )
     parser.add_argument(
         "--skill-name",
@@ -359,19 +1055,104 @@ def main():
         type=Path,
         help="Output path for benchmark.json (default: <benchmark_dir>/benchmark.json)"
     )
+    parser.add_argument(
+        "--no-manifest",
+        action="store_true",
+        help="Re-read every run instead of reusing unchanged ones from benchmark.manifest.json"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Threads for scanning and reading run files (default: {DEFAULT_WORKERS}; 1 = serial)"
+    )
+    parser.add_argument(
+        "--resamples",
+        type=int,
+        default=DEFAULT_RESAMPLES,
+        help=f"Bootstrap/permutation resamples for significance tests (default: {DEFAULT_RESAMPLES}; 0 = skip)"
+    )
+    parser.add_argument(
+        "--slowest",
+        type=int,
+        default=SLOWEST_RUNS,
+        help=f"How many of the slowest / most expensive runs to index (default: {SLOWEST_RUNS})"
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="Configuration to compare the others against (default: the second configuration)"
+    )
+    parser.add_argument(
+        "--warehouse",
+        type=Path,
+        default=None,
+        help="Also ingest the result into this benchmark warehouse database (see benchmark_store)"
+    )
+    parser.add_argument(
+        "--partial",
+        action="store_true",
+        help="Write this shard's mergeable accumulators (default: <benchmark_dir>/benchmark.partial.json) instead of benchmark.json/.md"
+    )
+    parser.add_argument(
+        "--merge",
+        type=Path,
+        nargs="+",
+        metavar="PARTIAL",
+        help="Combine --partial outputs from several shards into one benchmark.json/.md"
+    )
 
     args = parser.parse_args()
 
-    if not args.benchmark_dir.exists():
-        print(f"Directory not found: {args.benchmark_dir}")
-        sys.exit(1)
-
-    # Generate benchmark
-    benchmark = generate_benchmark(args.benchmark_dir, args.skill_name, args.skill_path)
-
-    # Determine output paths
-    output_json = args.output or (args.benchmark_dir / "benchmark.json")
-    output_md = output_json.with_suffix(".md")
+    if args.merge:
+        partials = []
+        for path in args.merge:
+            try:
+                partials.append(json.loads(path.read_text()))
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Could not read partial {path}: {e}")
+                sys.exit(1)
+        try:
+            benchmark = merge_partials(partials, args.skill_name, args.skill_path, args.resamples, args.baseline)
+        except ValueError as e:
+            print(f"{e}")
+            sys.exit(1)
+        output_json = args.output or ((args.benchmark_dir or Path(".")) / "benchmark.json")
+        output_md = output_json.with_suffix(".md")
+    else:
+        if args.benchmark_dir is None:
+            parser.error("benchmark_dir is required unless --merge is given")
+        if not args.benchmark_dir.exists():
+            print(f"Directory not found: {args.benchmark_dir}")
+            sys.exit(1)
+
+        # Determine output paths
+        default_name = "benchmark.partial.json" if args.partial else "benchmark.json"
+        output_json = args.output or (args.benchmark_dir / default_name)
+        output_md = output_json.with_suffix(".md")
+        manifest_path = manifest_path_for(output_json)
+
+        # Aggregate, reusing per-run records whose files haven't changed
+        manifest = None if args.no_manifest else load_manifest(manifest_path)
+        if args.partial:
+            partial = generate_partial(args.benchmark_dir, args.skill_name, args.skill_path, manifest, args.workers)
+        else:
+            try:
+                benchmark = generate_benchmark(
+                    args.benchmark_dir, args.skill_name, args.skill_path, manifest, args.workers, args.resamples,
+                    args.slowest, args.baseline,
+                )
+            except ValueError as e:
+                print(f"{e}")
+                sys.exit(1)
+        if manifest is not None:
+            save_manifest(manifest_path, manifest)
+
+        if args.partial:
+            with open(output_json, "w") as f:
+                json.dump(partial, f)
+            print(f"Generated: {output_json}")
+            return
 
     # Write benchmark.json
     with open(output_json, "w") as f:
@@ -379,11 +1160,22 @@ def main():
     print(f"Generated: {output_json}")
 
     # Write benchmark.md
-    markdown = generate_markdown(benchmark)
+    link_base = os.path.relpath(args.benchmark_dir, output_md.parent) if args.benchmark_dir else ""
+    markdown = generate_markdown(benchmark, Path(link_base).as_posix())
     with open(output_md, "w") as f:
         f.write(markdown)
     print(f"Generated: {output_md}")
 
+    if args.warehouse:
+        from scripts.benchmark_store import BenchmarkStore
+
+        store = BenchmarkStore(args.warehouse)
+        try:
+            benchmark_id = store.ingest(output_json)
+        finally:
+            store.close()
+        print(f"Warehouse: {'ingested as #' + str(benchmark_id) if benchmark_id else 'already present'} in {args.warehouse}")
+
     # Print summary
     run_summary = benchmark["run_summary"]
     configs = [k for k in run_summary if k != "delta"]
@@ -398,4 +1190,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "aggregate_benchmark")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Benchmark aggregate_benchmark's run loader on synthetic workspaces.
+
+Generates eval-N/<config>/run-K workspaces of the requested sizes (with
+grading.json, timing.json and eval_metadata.json shaped like real ones),
+then times loading them serially, with the thread pool, and with a warm
+manifest. Every mode must return exactly the same results.
+
+On a local disk with a warm page cache loading is CPU bound and threads
+gain little; --latency-ms adds a sleep to every stat/read to model network
+storage, where the thread pool pays off.
+
+Usage:
+    python -m scripts.bench_aggregate [--sizes 1000 10000 100000] [--workers 32] [--latency-ms 2] [--json]
+    python -m scripts.bench_aggregate --generate-only 5000 --workspace-dir /tmp/ws
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from scripts.aggregate_benchmark import DEFAULT_WORKERS, MANIFEST_VERSION, load_run_results
+
+CONFIGS = ("with_skill", "without_skill")
+RUNS_PER_CONFIG = 3
+EXPECTATIONS_PER_RUN = 5
+
+
+def generate_workspace(root: Path, runs: int, seed: int = 0) -> Path:
+    """Write a synthetic benchmark workspace with `runs` run directories under root."""
+    rng = random.Random(seed)
+    per_eval = len(CONFIGS) * RUNS_PER_CONFIG
+    n_evals = -(-runs // per_eval)
+    written = 0
+    for eval_idx in range(n_evals):
+        eval_dir = root / f"eval-{eval_idx}"
+        eval_dir.mkdir(parents=True, exist_ok=True)
+        (eval_dir / "eval_metadata.json").write_text(json.dumps({
+            "eval_id": eval_idx,
+            "eval_name": f"synthetic-{eval_idx}",
+            "prompt": f"Synthetic task {eval_idx}",
+        }))
+        for config in CONFIGS:
+            for run_number in range(1, RUNS_PER_CONFIG + 1):
+                if written >= runs:
+                    return root
+                run_dir = eval_dir / config / f"run-{run_number}"
+                run_dir.mkdir(parents=True, exist_ok=True)
+                expectations = [
+                    {"text": f"Output satisfies check {i}", "passed": rng.random() < 0.7, "evidence": "x" * rng.randint(40, 200)}
+                    for i in range(EXPECTATIONS_PER_RUN)
+                ]
+                passed = sum(e["passed"] for e in expectations)
+                duration = round(rng.uniform(5, 120), 1)
+                (run_dir / "grading.json").write_text(json.dumps({
+                    "expectations": expectations,
+                    "summary": {
+                        "passed": passed,
+                        "failed": EXPECTATIONS_PER_RUN - passed,
+                        "total": EXPECTATIONS_PER_RUN,
+                        "pass_rate": passed / EXPECTATIONS_PER_RUN,
+                    },
+                    "execution_metrics": {
+                        "total_tool_calls": rng.randint(1, 40),
+                        "output_chars": rng.randint(500, 20000),
+                        "errors_encountered": rng.randint(0, 2),
+                    },
+                    "user_notes_summary": {"uncertainties": [], "needs_review": [], "workarounds": []},
+                }, indent=2))
+                (run_dir / "timing.json").write_text(json.dumps({
+                    "total_tokens": rng.randint(2000, 80000),
+                    "duration_ms": int(duration * 1000),
+                    "total_duration_seconds": duration,
+                }, indent=2))
+                written += 1
+    return root
+
+
+@contextlib.contextmanager
+def simulated_latency(latency_ms: float):
+    """Add a blocking delay to each Path.stat/read_bytes, like a network filesystem."""
+    if latency_ms <= 0:
+        yield
+        return
+    delay = latency_ms / 1000
+    original_stat, original_read_bytes = Path.stat, Path.read_bytes
+
+    def slow_stat(self, *args, **kwargs):
+        time.sleep(delay)
+        return original_stat(self, *args, **kwargs)
+
+    def slow_read_bytes(self):
+        time.sleep(delay)
+        return original_read_bytes(self)
+
+    Path.stat, Path.read_bytes = slow_stat, slow_read_bytes
+    try:
+        yield
+    finally:
+        Path.stat, Path.read_bytes = original_stat, original_read_bytes
+
+
+def _timed_load(workspace: Path, workers: int, manifest: dict | None = None) -> tuple[float, dict]:
+    # load_run_results prints warnings and manifest stats; keep the table clean
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        results = load_run_results(workspace, manifest, workers)
+        elapsed = time.perf_counter() - start
+    return elapsed, results
+
+
+def bench_size(workspace: Path, workers: int) -> dict:
+    serial_s, serial = _timed_load(workspace, workers=1)
+    parallel_s, parallel = _timed_load(workspace, workers=workers)
+
+    manifest = {"version": MANIFEST_VERSION, "evals": {}, "runs": {}}
+    _timed_load(workspace, workers, manifest)
+    warm_s, warm = _timed_load(workspace, workers, manifest)
+
+    if not (serial == parallel == warm):
+        raise AssertionError(f"Loader modes disagree on {workspace}")
+    return {
+        "serial_s": round(serial_s, 3),
+        "parallel_s": round(parallel_s, 3),
+        "manifest_warm_s": round(warm_s, 3),
+        "parallel_speedup": round(serial_s / parallel_s, 2) if parallel_s else None,
+        "manifest_speedup": round(serial_s / warm_s, 2) if warm_s else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark benchmark-workspace loading on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Run counts to benchmark")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Threads for the parallel loader")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated per-file I/O latency")
+    parser.add_argument("--workspace-dir", type=Path, default=None, help="Where to generate workspaces (default: a temp dir)")
+    parser.add_argument("--keep", action="store_true", help="Keep generated workspaces")
+    parser.add_argument("--generate-only", type=int, metavar="RUNS", help="Only generate a workspace with this many runs")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    base = args.workspace_dir or Path(tempfile.mkdtemp(prefix="bench-aggregate-"))
+
+    if args.generate_only:
+        generate_workspace(base, args.generate_only)
+        print(f"Generated {args.generate_only} runs in {base}")
+        return
+
+    results = {}
+    try:
+        for size in args.sizes:
+            workspace = base / f"runs-{size}"
+            start = time.perf_counter()
+            generate_workspace(workspace, size)
+            print(f"Generated {size} runs in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+            with simulated_latency(args.latency_ms):
+                results[size] = bench_size(workspace, args.workers)
+            if not args.keep:
+                shutil.rmtree(workspace)
+    finally:
+        if not args.keep and args.workspace_dir is None:
+            shutil.rmtree(base, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'runs':>8}  {'serial':>9}  {'parallel':>9}  {'manifest':>9}  speedup (parallel / manifest)")
+        for size, r in results.items():
+            print(
+                f"{size:>8}  {r['serial_s']:>8.3f}s  {r['parallel_s']:>8.3f}s  {r['manifest_warm_s']:>8.3f}s"
+                f"  {r['parallel_speedup']}x / {r['manifest_speedup']}x"
+            )
+
+
+if __name__ == "__main__":
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "bench_aggregate")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Startup-latency guard for the skill-creator CLI.
+
+Runs `python -X importtime -m scripts <subcommand> --help` for every
+subcommand, records wall time and the modules imported, and fails if any
+subcommand imports a heavy dependency it does not need at startup or is
+slower than the budget.
+
+Usage:
+    python -m scripts.bench_startup [--repeat 5] [--max-ms 250] [--json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from scripts.cli import SUBCOMMANDS
+
+SKILL_CREATOR_ROOT = Path(__file__).resolve().parent.parent
+
+# Top-level packages that must never load just to parse arguments
+FORBIDDEN_AT_STARTUP = {"anthropic", "httpx", "pydantic", "webbrowser", "numpy"}
+
+
+def measure(subcommand: str) -> tuple[float, set[str]]:
+    """Return (wall seconds, imported top-level modules) for one --help invocation.
+
+    Raises RuntimeError if the invocation fails, so error paths are never
+    timed as startup.
+    """
+    cmd = [sys.executable, "-X", "importtime", "-m", "scripts", subcommand, "--help"]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=SKILL_CREATOR_ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        output = [line for line in proc.stderr.splitlines() if line.strip() and not line.startswith("import time:")]
+        output = output or proc.stdout.strip().splitlines()
+        raise RuntimeError(f"exited {proc.returncode}: {output[-1] if output else ''}")
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        name = line.rsplit("|", 1)[1].strip()
+        modules.add(name.split(".")[0])
+    return elapsed, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guard CLI startup latency and lazy imports")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per subcommand (median is reported)")
+    parser.add_argument("--max-ms", type=float, default=250.0, help="Fail if a subcommand's median --help time exceeds this")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+    for subcommand in SUBCOMMANDS:
+        times = []
+        modules: set[str] = set()
+        try:
+            for _ in range(args.repeat):
+                elapsed, modules = measure(subcommand)
+                times.append(elapsed)
+        except RuntimeError as e:
+            results[subcommand] = {"median_ms": None, "forbidden_imports": [], "error": str(e)}
+            failures.append(f"{subcommand}: --help {e}")
+            continue
+        median_ms = statistics.median(times) * 1000
+        forbidden = sorted(modules & FORBIDDEN_AT_STARTUP)
+        results[subcommand] = {"median_ms": round(median_ms, 1), "forbidden_imports": forbidden}
+        if forbidden:
+            failures.append(f"{subcommand}: imports {', '.join(forbidden)} at startup")
+        if median_ms > args.max_ms:
+            failures.append(f"{subcommand}: {median_ms:.0f}ms > {args.max_ms:.0f}ms budget")
+
+    if args.json:
+        print(json.dumps({"results": results, "failures": failures}, indent=2))
+    else:
+        for subcommand, r in results.items():
+            if r.get("error"):
+                print(f"  {subcommand:<12}   error")
+                continue
+            flag = " FORBIDDEN: " + ", ".join(r["forbidden_imports"]) if r["forbidden_imports"] else ""
+            print(f"  {subcommand:<12} {r['median_ms']:>7.1f} ms{flag}")
+        for failure in failures:
+            print(f"FAIL {failure}", file=sys.stderr)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
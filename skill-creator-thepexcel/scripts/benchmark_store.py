@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""Local SQLite warehouse of benchmark.json results.
+
+Every aggregate_benchmark run writes a standalone benchmark.json; this
+store ingests them (deduplicated by a hash of their runs and summaries,
+so re-aggregating the same runs is not a new benchmark) into one database indexed
+by skill, configuration, eval_id, model and timestamp, so results can be
+compared across skill versions and model updates without opening files.
+
+- trend: one metric over the last N benchmarks of a skill
+- check: compares the latest benchmark (or a candidate benchmark.json)
+  against the pooled runs of the previous --window benchmarks with a
+  permutation test and bootstrap CI, and exits 1 on a significant
+  regression, so it can gate CI
+
+Usage:
+    python -m scripts.benchmark_store <db> ingest <benchmark.json|dir>... [--skill NAME] [--model NAME]
+    python -m scripts.benchmark_store <db> list [--skill NAME]
+    python -m scripts.benchmark_store <db> trend --skill deep-research --metric pass_rate --last 20
+    python -m scripts.benchmark_store <db> check --skill deep-research [--candidate benchmark.json] [--window 5]
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from scripts.significance import DEFAULT_RESAMPLES, compare_samples
+
+METRICS = ("pass_rate", "time_seconds", "tokens", "tool_calls")
+# Which direction is a regression for each metric
+HIGHER_IS_BETTER = {"pass_rate": True, "time_seconds": False, "tokens": False, "tool_calls": False}
+SPARK = "▁▂▃▄▅▆▇█"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS benchmarks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    skill TEXT NOT NULL,
+    skill_path TEXT,
+    model TEXT,
+    timestamp TEXT NOT NULL,
+    source TEXT,
+    content_hash TEXT NOT NULL UNIQUE,
+    ingested_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_benchmarks_skill ON benchmarks(skill, timestamp);
+CREATE INDEX IF NOT EXISTS idx_benchmarks_model ON benchmarks(model);
+CREATE INDEX IF NOT EXISTS idx_benchmarks_timestamp ON benchmarks(timestamp);
+CREATE TABLE IF NOT EXISTS config_summary (
+    benchmark_id INTEGER NOT NULL REFERENCES benchmarks(id),
+    config TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    metric TEXT NOT NULL,
+    mean REAL,
+    stddev REAL,
+    min REAL,
+    max REAL,
+    p50 REAL,
+    p95 REAL,
+    PRIMARY KEY (benchmark_id, config, metric)
+);
+CREATE INDEX IF NOT EXISTS idx_config_summary_config ON config_summary(config, metric);
+CREATE TABLE IF NOT EXISTS runs (
+    benchmark_id INTEGER NOT NULL REFERENCES benchmarks(id),
+    eval_id INTEGER,
+    config TEXT NOT NULL,
+    run_number INTEGER,
+    pass_rate REAL,
+    time_seconds REAL,
+    tokens REAL,
+    tool_calls REAL,
+    errors INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_runs_benchmark ON runs(benchmark_id, config);
+CREATE INDEX IF NOT EXISTS idx_runs_eval ON runs(eval_id, config);
+"""
+
+
+def content_hash(benchmark: dict) -> str:
+    """Hash of a benchmark's runs and run_summary.
+
+    metadata (notably its timestamp) is left out: it changes every time
+    the same runs are aggregated again.
+    """
+    canonical = json.dumps(
+        {"runs": benchmark.get("runs", []), "run_summary": benchmark.get("run_summary", {})},
+        sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32]
+
+
+class BenchmarkStore:
+    """SQLite warehouse of ingested benchmark.json files."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def ingest(self, benchmark_path: Path, skill: str | None = None, model: str | None = None) -> int | None:
+        """Ingest one benchmark.json. Returns its id, or None if it was already ingested."""
+        benchmark = json.loads(benchmark_path.read_bytes())
+        digest = content_hash(benchmark)
+        if self.db.execute("SELECT 1 FROM benchmarks WHERE content_hash = ?", (digest,)).fetchone():
+            return None
+
+        metadata = benchmark.get("metadata", {})
+        skill = skill or metadata.get("skill_name") or "<skill-name>"
+        model = model or metadata.get("executor_model")
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO benchmarks (skill, skill_path, model, timestamp, source, content_hash, ingested_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    skill,
+                    metadata.get("skill_path"),
+                    model,
+                    metadata.get("timestamp") or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    str(benchmark_path.resolve()),
+                    digest,
+                    time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                ),
+            )
+            benchmark_id = cursor.lastrowid
+
+            configs = [k for k in benchmark.get("run_summary", {}) if k != "delta"]
+            summary_rows = []
+            for position, config in enumerate(configs):
+                for metric in METRICS:
+                    stats = benchmark["run_summary"][config].get(metric)
+                    if not isinstance(stats, dict):
+                        continue
+                    summary_rows.append((
+                        benchmark_id, config, position, metric,
+                        stats.get("mean"), stats.get("stddev"), stats.get("min"), stats.get("max"),
+                        stats.get("p50"), stats.get("p95"),
+                    ))
+            self.db.executemany("INSERT INTO config_summary VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", summary_rows)
+
+            run_rows = []
+            for run in benchmark.get("runs", []):
+                result = run.get("result", {})
+                run_rows.append((
+                    benchmark_id, run.get("eval_id"), run.get("configuration"), run.get("run_number"),
+                    result.get("pass_rate"), result.get("time_seconds"), result.get("tokens"),
+                    result.get("tool_calls"), result.get("errors"),
+                ))
+            self.db.executemany("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", run_rows)
+        return benchmark_id
+
+    def list_benchmarks(self, skill: str | None = None, limit: int = 50) -> list[dict]:
+        sql = (
+            "SELECT b.id, b.skill, b.model, b.timestamp, b.source,"
+            " (SELECT COUNT(*) FROM runs r WHERE r.benchmark_id = b.id) AS runs"
+            " FROM benchmarks b"
+        )
+        params: list = []
+        if skill:
+            sql += " WHERE b.skill = ?"
+            params.append(skill)
+        sql += " ORDER BY b.timestamp DESC, b.id DESC LIMIT ?"
+        params.append(limit)
+        cols = ["id", "skill", "model", "timestamp", "source", "runs"]
+        return [dict(zip(cols, row)) for row in self.db.execute(sql, params)]
+
+    def default_config(self, skill: str) -> str | None:
+        """The primary (first) configuration of the skill's latest benchmark."""
+        row = self.db.execute(
+            "SELECT c.config FROM config_summary c JOIN benchmarks b ON b.id = c.benchmark_id"
+            " WHERE b.skill = ? AND c.position = 0 ORDER BY b.timestamp DESC, b.id DESC LIMIT 1",
+            (skill,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def trend(
+        self,
+        skill: str,
+        metric: str,
+        config: str | None = None,
+        last: int = 20,
+        model: str | None = None,
+        eval_id: int | None = None,
+    ) -> list[dict]:
+        """metric's mean per benchmark, oldest first, over the skill's last `last` benchmarks."""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}' (expected one of {', '.join(METRICS)})")
+        config = config or self.default_config(skill)
+        filters = "b.skill = ?"
+        params: list = [skill]
+        if model:
+            filters += " AND b.model = ?"
+            params.append(model)
+
+        if eval_id is None:
+            sql = (
+                f"SELECT b.id, b.timestamp, b.model, c.mean, c.p95 FROM benchmarks b"
+                f" JOIN config_summary c ON c.benchmark_id = b.id AND c.config = ? AND c.metric = ?"
+                f" WHERE {filters} ORDER BY b.timestamp DESC, b.id DESC LIMIT ?"
+            )
+            rows = self.db.execute(sql, [config, metric, *params, last]).fetchall()
+        else:
+            # Per-eval trends come from the run rows
+            sql = (
+                f"SELECT b.id, b.timestamp, b.model, AVG(r.{metric}), NULL FROM benchmarks b"
+                f" JOIN runs r ON r.benchmark_id = b.id AND r.config = ? AND r.eval_id = ?"
+                f" WHERE {filters} GROUP BY b.id ORDER BY b.timestamp DESC, b.id DESC LIMIT ?"
+            )
+            rows = self.db.execute(sql, [config, eval_id, *params, last]).fetchall()
+
+        cols = ["benchmark_id", "timestamp", "model", "mean", "p95"]
+        return [dict(zip(cols, row), config=config) for row in reversed(rows)]
+
+    def run_values(self, benchmark_ids: list[int], config: str, metric: str) -> list[float]:
+        if not benchmark_ids:
+            return []
+        placeholders = ",".join("?" * len(benchmark_ids))
+        rows = self.db.execute(
+            f"SELECT {metric} FROM runs WHERE benchmark_id IN ({placeholders}) AND config = ? AND {metric} IS NOT NULL",
+            [*benchmark_ids, config],
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def check(
+        self,
+        skill: str,
+        metrics: tuple[str, ...] = METRICS,
+        config: str | None = None,
+        window: int = 5,
+        alpha: float = 0.05,
+        candidate: dict | None = None,
+        resamples: int = DEFAULT_RESAMPLES,
+    ) -> list[dict]:
+        """Test the latest benchmark (or a candidate) against the previous `window` for regressions.
+
+        A candidate that was already ingested is left out of its own history.
+        Returns one result per metric; `regression` is True when the metric
+        moved in the worse direction with p < alpha and a CI excluding zero.
+        """
+        config = config or self.default_config(skill)
+        ids = [row[0] for row in self.db.execute(
+            "SELECT id FROM benchmarks WHERE skill = ? AND content_hash != ? ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (skill, content_hash(candidate) if candidate else "", window + (0 if candidate else 1)),
+        )]
+        if candidate is not None:
+            latest_id, history_ids = None, ids
+            if config is None:
+                config = next((k for k in candidate.get("run_summary", {}) if k != "delta"), None)
+        else:
+            latest_id, history_ids = (ids[0], ids[1:]) if ids else (None, [])
+
+        results = []
+        for metric in metrics:
+            if candidate is not None:
+                current = [
+                    run["result"][metric] for run in candidate.get("runs", [])
+                    if run.get("configuration") == config and run.get("result", {}).get(metric) is not None
+                ]
+            else:
+                current = self.run_values([latest_id], config, metric) if latest_id else []
+            history = self.run_values(history_ids, config, metric)
+            stats = compare_samples(current, history, resamples)
+            entry = {"metric": metric, "config": config, "benchmark_id": latest_id, "history": history_ids, "stats": stats}
+            if stats is None:
+                entry["regression"] = False
+                entry["reason"] = "not enough run data"
+            else:
+                worse = stats["delta"] < 0 if HIGHER_IS_BETTER[metric] else stats["delta"] > 0
+                excludes_zero = stats["ci_low"] > 0 or stats["ci_high"] < 0
+                entry["regression"] = worse and stats["p_value"] < alpha and excludes_zero
+            results.append(entry)
+        return results
+
+
+def _sparkline(values: list[float]) -> str:
+    present = [v for v in values if v is not None]
+    if not present:
+        return ""
+    low, high = min(present), max(present)
+    span = (high - low) or 1.0
+    return "".join(" " if v is None else SPARK[int((v - low) / span * (len(SPARK) - 1))] for v in values)
+
+
+def _benchmark_files(paths: list[Path]) -> list[Path]:
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(path.rglob("benchmark.json")))
+        else:
+            files.append(path)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark warehouse: ingest benchmark.json, query trends, detect regressions")
+    parser.add_argument("db", type=Path, help="Path to the warehouse database (created on first ingest)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ingest = sub.add_parser("ingest", help="Ingest benchmark.json files (directories are searched recursively)")
+    p_ingest.add_argument("paths", type=Path, nargs="+", help="benchmark.json files or directories")
+    p_ingest.add_argument("--skill", default=None, help="Skill name (default: metadata.skill_name)")
+    p_ingest.add_argument("--model", default=None, help="Model name (default: metadata.executor_model)")
+
+    p_list = sub.add_parser("list", help="List ingested benchmarks, newest first")
+    p_list.add_argument("--skill", default=None, help="Only this skill")
+    p_list.add_argument("--limit", type=int, default=50, help="Max rows to print")
+    p_list.add_argument("--json", action="store_true", help="Print rows as JSON")
+
+    p_trend = sub.add_parser("trend", help="A metric across a skill's recent benchmarks")
+    p_trend.add_argument("--skill", required=True, help="Skill name")
+    p_trend.add_argument("--metric", default="pass_rate", choices=METRICS, help="Metric to trend")
+    p_trend.add_argument("--config", default=None, help="Configuration (default: the primary config)")
+    p_trend.add_argument("--last", type=int, default=20, help="Number of most recent benchmarks")
+    p_trend.add_argument("--model", default=None, help="Only benchmarks run with this model")
+    p_trend.add_argument("--eval-id", type=int, default=None, help="Only this eval")
+    p_trend.add_argument("--json", action="store_true", help="Print rows as JSON")
+
+    p_check = sub.add_parser("check", help="Exit 1 if the latest benchmark significantly regressed")
+    p_check.add_argument("--skill", required=True, help="Skill name")
+    p_check.add_argument("--metric", default=None, choices=METRICS, help="Only this metric (default: all)")
+    p_check.add_argument("--config", default=None, help="Configuration (default: the primary config)")
+    p_check.add_argument("--window", type=int, default=5, help="How many earlier benchmarks form the reference")
+    p_check.add_argument("--alpha", type=float, default=0.05, help="Significance level")
+    p_check.add_argument("--candidate", type=Path, default=None, help="Check this benchmark.json instead of the latest ingested one")
+    p_check.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    args = parser.parse_args()
+
+    if args.command != "ingest" and not args.db.exists():
+        print(f"Error: No benchmark warehouse found at {args.db}", file=sys.stderr)
+        sys.exit(1)
+
+    store = BenchmarkStore(args.db)
+    try:
+        if args.command == "ingest":
+            added = skipped = 0
+            for path in _benchmark_files(args.paths):
+                try:
+                    benchmark_id = store.ingest(path, args.skill, args.model)
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"Warning: skipping {path}: {e}", file=sys.stderr)
+                    continue
+                if benchmark_id is None:
+                    skipped += 1
+                else:
+                    added += 1
+                    print(f"Ingested #{benchmark_id}: {path}")
+            print(f"Ingested {added} benchmarks ({skipped} already present)")
+        elif args.command == "list":
+            rows = store.list_benchmarks(args.skill, args.limit)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+                return
+            for row in rows:
+                print(f"{row['id']:>5}  {row['timestamp']}  {row['skill']:<24} {str(row['model']):<28} runs={row['runs']:<5} {row['source']}")
+        elif args.command == "trend":
+            rows = store.trend(args.skill, args.metric, args.config, args.last, args.model, args.eval_id)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+                return
+            if not rows:
+                print(f"No benchmarks for {args.skill}")
+                return
+            print(f"{args.metric} of {args.skill} [{rows[0]['config']}] over last {len(rows)} benchmarks: {_sparkline([r['mean'] for r in rows])}")
+            for row in rows:
+                mean = f"{row['mean']:.4g}" if row["mean"] is not None else "—"
+                p95 = f"  p95={row['p95']:.4g}" if row["p95"] is not None else ""
+                print(f"  #{row['benchmark_id']:<5} {row['timestamp']}  {str(row['model']):<28} {mean}{p95}")
+        elif args.command == "check":
+            candidate = json.loads(args.candidate.read_text()) if args.candidate else None
+            metrics = (args.metric,) if args.metric else METRICS
+            results = store.check(args.skill, metrics, args.config, args.window, args.alpha, candidate)
+            regressed = [r for r in results if r["regression"]]
+            if args.json:
+                print(json.dumps(results, indent=2))
+            else:
+                for r in results:
+                    stats = r["stats"]
+                    if stats is None:
+                        print(f"  {r['metric']:<13} skipped ({r['reason']})")
+                        continue
+                    flag = "REGRESSION" if r["regression"] else "ok"
+                    print(
+                        f"  {r['metric']:<13} {flag:<10} delta={stats['delta']:+.4g} "
+                        f"[{stats['ci_low']:+.4g}, {stats['ci_high']:+.4g}] p={stats['p_value']:.3f} "
+                        f"(n={stats['n_a']} vs {stats['n_b']} over {len(r['history'])} benchmarks)"
+                    )
+            if regressed:
+                print(f"Regression detected in {', '.join(r['metric'] for r in regressed)}", file=sys.stderr)
+                sys.exit(1)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "benchmark_store")
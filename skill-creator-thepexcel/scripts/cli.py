@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Unified skill-creator command line.
+
+One entry point for every script, with subcommands dispatched lazily: only
+the module behind the chosen subcommand is imported, so `--help`, `validate`
+or `eval` never pay for anthropic/httpx/pydantic, webbrowser or the report
+generator.
+
+Usage:
+    python -m scripts <subcommand> [args...]
+    python -m scripts.cli <subcommand> [args...]
+
+Examples:
+    python -m scripts eval --eval-set evals.json --skill-path ../my-skill
+    python -m scripts loop --eval-set evals.json --skill-path ../my-skill --model <model>
+    python -m scripts aggregate workspace/iteration-1 --skill-name my-skill
+    python -m scripts review workspace/iteration-1 --static /tmp/review.html
+"""
+
+import sys
+from pathlib import Path
+
+SKILL_CREATOR_ROOT = Path(__file__).resolve().parent.parent
+
+# subcommand -> (target, summary). Targets are "module:function" for the
+# scripts package, or a path relative to the skill-creator root for
+# standalone scripts that are run as __main__.
+SUBCOMMANDS = {
+    "eval": ("scripts.run_eval:main", "Run trigger evaluation for a skill description"),
+    "loop": ("scripts.run_loop:main", "Run the eval + improve description loop"),
+    "improve": ("scripts.improve_description:main", "Improve a description from eval results"),
+    "benchmark": ("scripts.run_benchmark:main", "Run evals x configurations x runs in parallel with claude -p"),
+    "grade": ("scripts.grade_runs:main", "Grade benchmark runs: cached verdicts, local checks, parallel LLM grader"),
+    "aggregate": ("scripts.aggregate_benchmark:main", "Aggregate benchmark runs into benchmark.json/.md"),
+    "history": ("scripts.benchmark_store:main", "Benchmark warehouse: ingest, trend queries, regression checks"),
+    "flaky": ("scripts.expectation_index:main", "Per-expectation pass rates and flakiness across runs and iterations"),
+    "report": ("scripts.generate_report:main", "Generate an HTML report from run_loop output"),
+    "review": ("eval-viewer/generate_review.py", "Serve or export the eval review viewer"),
+    "package": ("scripts.package_skill:main", "Package a skill folder into a .skill file"),
+    "validate": ("scripts.quick_validate:main", "Validate a skill's SKILL.md frontmatter"),
+    "init": ("scripts.init_skill:main", "Create a new skill from the template"),
+    "transcripts": ("scripts.transcript_store:main", "Query and extract stored improve transcripts"),
+}
+
+
+def print_help(prog: str) -> None:
+    print(f"usage: {prog} <subcommand> [args...]\n")
+    print("Skill creation, evaluation and benchmarking tools.\n")
+    print("subcommands:")
+    width = max(len(name) for name in SUBCOMMANDS)
+    for name, (_, summary) in SUBCOMMANDS.items():
+        print(f"  {name:<{width}}  {summary}")
+    print(f"\nRun '{prog} <subcommand> --help' for subcommand options.")
+
+
+def run_subcommand(name: str, argv: list[str], prog: str = "skill-creator") -> None:
+    """Import the subcommand's module and run it with argv as its arguments."""
+    target, _ = SUBCOMMANDS[name]
+    sys.argv = [f"{prog} {name}", *argv]
+    if ":" in target:
+        import importlib
+
+        from scripts.profiling import run_profiled
+
+        module_name, func_name = target.split(":")
+        run_profiled(getattr(importlib.import_module(module_name), func_name), module_name.rsplit(".", 1)[1])
+    else:
+        # The script's own __main__ block handles --profile
+        import runpy
+
+        script = SKILL_CREATOR_ROOT / target
+        # Standalone scripts import their siblings, so put their directory first
+        sys.path.insert(0, str(script.parent))
+        runpy.run_path(str(script), run_name="__main__")
+
+
+def main(argv: list[str] | None = None, prog: str = "skill-creator") -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print_help(prog)
+        sys.exit(0 if argv else 1)
+
+    name, rest = argv[0], argv[1:]
+    if name not in SUBCOMMANDS:
+        print(f"Error: unknown subcommand '{name}'\n", file=sys.stderr)
+        print_help(prog)
+        sys.exit(2)
+
+    run_subcommand(name, rest, prog)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Per-expectation pass rates and flakiness across runs and iterations.
+
+Every run's grading.json lists the expectations it was graded against.
+This indexes them by expectation text so the assertions that cost the most
+reruns and grading time can be found directly:
+
+- pass_rate: across every run (and per configuration) that graded it
+- flakiness: how often two runs of the same eval and configuration disagree
+  on it (0 = always agree, 1 = every pair disagrees)
+- disagreeing_runs: runs on the minority side of their eval/configuration,
+  i.e. verdicts a rerun would be needed to settle
+- history / changes: only with several iterations, the per-iteration pass
+  rate and verdict ("pass", "fail", "mixed") and how often it changed
+
+aggregate_benchmark stores the single-iteration index in benchmark.json
+as `expectation_summary`.
+
+Usage:
+    python -m scripts.expectation_index <iteration-dir|benchmark.json>... [--top 20] [--config with_skill] [--json]
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+from pathlib import Path
+
+TOP_EXPECTATIONS = 20
+
+
+def _verdict(passed: int, runs: int) -> str:
+    if passed == runs:
+        return "pass"
+    if passed == 0:
+        return "fail"
+    return "mixed"
+
+
+def _disagreement(groups) -> tuple[float, int]:
+    """(pairwise disagreement rate, minority-side runs) over [runs, passed] groups."""
+    disagreeing_pairs = total_pairs = minority = 0
+    for runs, passed in groups:
+        disagreeing_pairs += passed * (runs - passed)
+        total_pairs += runs * (runs - 1) // 2
+        minority += min(passed, runs - passed)
+    return (round(disagreeing_pairs / total_pairs, 4) if total_pairs else 0.0), minority
+
+
+def index_expectations(iterations: list[dict], labels: list[str] | None = None) -> list[dict]:
+    """Index expectations by text across one or more iterations of run results.
+
+    Each iteration is load_run_results() output ({config: [run records]}).
+    Returns one entry per expectation text, costliest (most disagreeing
+    runs, then highest flakiness) first.
+    """
+    labels = labels or [str(i + 1) for i in range(len(iterations))]
+    # text -> (iteration, eval_id, config) -> [runs, passed]
+    counts: dict[str, dict[tuple, list[int]]] = {}
+    for iteration, results in enumerate(iterations):
+        for config, records in results.items():
+            for record in records:
+                eval_id = record["eval_id"]
+                for exp in record.get("expectations", []):
+                    text = exp.get("text")
+                    if text is None or "passed" not in exp:
+                        continue
+                    group = counts.setdefault(text, {}).setdefault((iteration, eval_id, config), [0, 0])
+                    group[0] += 1
+                    group[1] += bool(exp["passed"])
+
+    index = []
+    for text, groups in counts.items():
+        runs = sum(g[0] for g in groups.values())
+        passed = sum(g[1] for g in groups.values())
+        flakiness, disagreeing = _disagreement(groups.values())
+
+        configs: dict[str, list[int]] = {}
+        per_iteration: dict[int, list] = {}
+        for (iteration, _, config), group in groups.items():
+            totals = configs.setdefault(config, [0, 0])
+            totals[0] += group[0]
+            totals[1] += group[1]
+            per_iteration.setdefault(iteration, []).append(group)
+
+        history = []
+        for iteration in sorted(per_iteration):
+            it_groups = per_iteration[iteration]
+            it_runs = sum(g[0] for g in it_groups)
+            it_passed = sum(g[1] for g in it_groups)
+            history.append({
+                "iteration": labels[iteration],
+                "runs": it_runs,
+                "pass_rate": round(it_passed / it_runs, 4),
+                "flakiness": _disagreement(it_groups)[0],
+                "verdict": _verdict(it_passed, it_runs),
+            })
+
+        entry = {
+            "text": text,
+            "evals": sorted({eval_id for _, eval_id, _ in groups}),
+            "runs": runs,
+            "passed": passed,
+            "pass_rate": round(passed / runs, 4),
+            "configs": {
+                config: {"runs": c[0], "passed": c[1], "pass_rate": round(c[1] / c[0], 4)}
+                for config, c in sorted(configs.items())
+            },
+            "flakiness": flakiness,
+            "disagreeing_runs": disagreeing,
+        }
+        if len(iterations) > 1:
+            entry["history"] = history
+            entry["changes"] = sum(a["verdict"] != b["verdict"] for a, b in zip(history, history[1:]))
+        index.append(entry)
+
+    index.sort(key=lambda e: (-e["disagreeing_runs"], -e["flakiness"], -e.get("changes", 0), e["text"]))
+    return index
+
+
+def _results_from_benchmark(benchmark: dict) -> dict:
+    """benchmark.json runs[] back into load_run_results() shape."""
+    results: dict[str, list] = {}
+    for run in benchmark.get("runs", []):
+        results.setdefault(run["configuration"], []).append({
+            "eval_id": run["eval_id"],
+            "run_number": run.get("run_number"),
+            "expectations": run.get("expectations", []),
+        })
+    return results
+
+
+def load_iteration(path: Path) -> dict:
+    """Run results from a benchmark.json, or from an iteration dir's run directories."""
+    if path.is_file():
+        return _results_from_benchmark(json.loads(path.read_text()))
+
+    from scripts.aggregate_benchmark import load_manifest, load_run_results, manifest_path_for
+
+    # Reuse aggregate_benchmark's manifest when there is one; never rewrite it here
+    manifest_path = manifest_path_for(path / "benchmark.json")
+    manifest = load_manifest(manifest_path) if manifest_path.exists() else None
+    return load_run_results(path, manifest)
+
+
+def _print_table(index: list[dict], labels: list[str], top: int) -> None:
+    flaky = sum(1 for e in index if e["flakiness"] > 0)
+    print(f"{len(index)} expectations, {flaky} flaky, {sum(e['disagreeing_runs'] for e in index)} disagreeing runs")
+    if not index:
+        return
+    multi = len(labels) > 1
+    width = max(7, len(labels))
+    header = f"{'flaky':>6} {'disagree':>8} {'pass':>6} {'runs':>6}"
+    if multi:
+        header += f" {'changes':>7}  {'history':<{width}}"
+    print(f"\n{header}  expectation")
+    for entry in index[:top]:
+        line = f"{entry['flakiness']:>6.2f} {entry['disagreeing_runs']:>8} {entry['pass_rate']:>6.0%} {entry['runs']:>6}"
+        if multi:
+            by_label = {h["iteration"]: h["verdict"][0].upper() for h in entry["history"]}
+            line += f" {entry['changes']:>7}  {''.join(by_label.get(label, '.') for label in labels):<{width}}"
+        text = entry["text"] if len(entry["text"]) <= 80 else entry["text"][:77] + "..."
+        print(f"{line}  {text}")
+    if multi:
+        print("\nhistory: one letter per iteration — P(ass) F(ail) M(ixed) .(absent)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index expectations by pass rate and flakiness across runs and iterations")
+    parser.add_argument("paths", type=Path, nargs="+", help="Iteration dirs or benchmark.json files, oldest first")
+    parser.add_argument("--config", default=None, help="Only runs of this configuration")
+    parser.add_argument("--top", type=int, default=TOP_EXPECTATIONS, help="Expectations to print")
+    parser.add_argument("--json", action="store_true", help="Print the full index as JSON")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Also write the full index as JSON here")
+    args = parser.parse_args()
+
+    iterations = []
+    for path in args.paths:
+        if not path.exists():
+            print(f"Not found: {path}", file=sys.stderr)
+            sys.exit(1)
+        # Loader warnings and manifest stats go to stderr so --json stays clean
+        with contextlib.redirect_stdout(sys.stderr):
+            results = load_iteration(path)
+        if args.config:
+            results = {c: r for c, r in results.items() if c == args.config}
+        iterations.append(results)
+
+    labels = [p.parent.name if p.is_file() else p.name for p in args.paths]
+    if len(set(labels)) != len(labels):
+        labels = [str(p) for p in args.paths]
+    index = index_expectations(iterations, labels)
+
+    report = {"iterations": labels, "expectations": index}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_table(index, labels, args.top)
+
+
+if __name__ == "__main__":
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "expectation_index")
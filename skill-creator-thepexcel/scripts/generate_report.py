@@ -12,6 +12,30 @@ import json
 import sys
 from pathlib import Path
 
+from scripts.token_usage import total_tokens
+
+
+def cost_summary_html(cost_summary: dict | None) -> str:
+    """Render the token/cost line of the summary box (empty if no usage was recorded)."""
+    if not cost_summary:
+        return ""
+    total = cost_summary.get("total", {})
+    cost = f"${cost_summary.get('cost_usd') or 0:.4f}"
+    if cost_summary.get("unpriced_calls"):
+        cost += f" + {cost_summary['unpriced_calls']} unpriced calls"
+    budget = ""
+    if cost_summary.get("max_tokens_budget"):
+        budget = f" of {cost_summary['max_tokens_budget']:,} budget"
+    return (
+        f"        <p><strong>Tokens:</strong> {cost_summary.get('total_tokens', 0):,}{budget}"
+        f" (in {total.get('input_tokens', 0):,}, out {total.get('output_tokens', 0):,},"
+        f" cache write {total.get('cache_creation_input_tokens', 0):,}, cache read {total.get('cache_read_input_tokens', 0):,},"
+        f" thinking ~{total.get('thinking_tokens', 0):,})"
+        f" | <strong>Eval:</strong> {total_tokens(cost_summary.get('eval', {})):,}"
+        f" | <strong>Improve:</strong> {total_tokens(cost_summary.get('improve', {})):,}"
+        f" | <strong>Cost:</strong> {cost}</p>\n"
+    )
+
 
 def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "") -> str:
     """Generate HTML report from loop output data. If auto_refresh is True, adds a meta refresh tag."""
@@ -103,6 +127,11 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
             word-wrap: break-word;
             max-width: 400px;
         }
+        td.tokens {
+            text-align: right;
+            font-family: monospace;
+            font-size: 11px;
+        }
         td.result {
             text-align: center;
             font-size: 16px;
@@ -159,9 +188,9 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
     <div class="summary">
         <p><strong>Original:</strong> {html.escape(data.get('original_description', 'N/A'))}</p>
         <p class="best"><strong>Best:</strong> {html.escape(data.get('best_description', 'N/A'))}</p>
-        <p><strong>Best Score:</strong> {data.get('best_score', 'N/A')} {'(test)' if best_test_score else '(train)'}</p>
+        <p><strong>Best Score:</strong> {data.get('best_score') or 'N/A'} {'(test)' if best_test_score else '(train)'}</p>
         <p><strong>Iterations:</strong> {data.get('iterations_run', 0)} | <strong>Train:</strong> {data.get('train_size', '?')} | <strong>Test:</strong> {data.get('test_size', '?')}</p>
-    </div>
+{cost_summary_html(data.get('cost_summary'))}    </div>
 """)
 
     # Legend
@@ -184,6 +213,7 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
                 <th>Iter</th>
                 <th>Train</th>
                 <th>Test</th>
+                <th>Tokens</th>
                 <th class="query-col">Description</th>
 """)
 
@@ -206,7 +236,12 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
     if test_queries:
         best_iter = max(history, key=lambda h: h.get("test_passed") or 0).get("iteration")
     else:
-        best_iter = max(history, key=lambda h: h.get("train_passed", h.get("passed", 0))).get("iteration")
+        best_iter = max(history, key=lambda h: h.get("train_passed", h.get("passed", 0)), default={}).get("iteration")
+
+    tokens_by_iteration = {
+        row["iteration"]: row["total_tokens"]
+        for row in (data.get("cost_summary") or {}).get("per_iteration", [])
+    }
 
     # Add rows for each iteration
     for h in history:
@@ -254,11 +289,13 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
         test_class = score_class(test_correct, test_runs)
 
         row_class = "best-row" if iteration == best_iter else ""
+        tokens_cell = f"{tokens_by_iteration[iteration]:,}" if iteration in tokens_by_iteration else "—"
 
         html_parts.append(f"""            <tr class="{row_class}">
                 <td>{iteration}</td>
                 <td><span class="score {train_class}">{train_correct}/{train_runs}</span></td>
                 <td><span class="score {test_class}">{test_correct}/{test_runs}</span></td>
+                <td class="tokens">{tokens_cell}</td>
                 <td class="description">{html.escape(description)}</td>
 """)
 
@@ -323,4 +360,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "generate_report")
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""Grade benchmark runs with a content-addressed cache.
+
+Writes grading.json for every eval-N/<config>/run-K directory of an
+iteration, in three tiers:
+
+1. Cache: each expectation's verdict is stored under
+   sha256(outputs/ contents, expectation, grader version), so an identical
+   output graded against the same expectation in any earlier iteration
+   (or another run of this one) is reused without grading it again.
+2. Local checks: expectations written as objects with a "check" run in a
+   process pool, no LLM involved:
+
+       {"text": "Produces a PDF", "check": {"type": "file_exists", "path": "*.pdf"}}
+       {"text": "Total is 42", "check": {"type": "file_contains", "path": "*.md", "pattern": "Total:\\s*42"}}
+       {"text": "No TODOs left", "check": {"type": "file_not_contains", "path": "**/*", "pattern": "TODO"}}
+       {"text": "Valid JSON", "check": {"type": "json_valid", "path": "result.json"}}
+       {"text": "Tests pass", "check": {"type": "command", "command": "python check.py outputs"}}
+
+   Paths are globs inside outputs/; commands run in the run directory and
+   pass on exit code 0.
+3. LLM grader: the remaining plain-string expectations of a run go to one
+   `claude -p` grader (agents/grader.md); runs are graded in parallel.
+
+The grader version covers agents/grader.md and the model, so editing the
+grader or switching model invalidates the cache. Verdicts are keyed by
+outputs/ only: expectations about the process (the transcript) are reused
+as long as the outputs are identical; use --no-cache to grade afresh.
+
+Runs whose grading.json was written for exactly the current expectations
+(texts and checks, via a digest stored in it) are skipped unless --force.
+
+Usage:
+    python -m scripts.grade_runs <workspace>/iteration-N [--cache-dir DIR] [--num-workers 8] [--model <model>]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from scripts import profiling
+
+GRADER_PATH = Path(__file__).resolve().parent.parent / "agents" / "grader.md"
+# Bump when the prompt built around grader.md changes meaningfully
+GRADER_PROMPT_VERSION = 1
+# Largest output file read for text checks
+MAX_CHECK_BYTES = 10 * 1024 * 1024
+COMMAND_TIMEOUT = 120
+
+
+def grader_version(model: str | None) -> str:
+    digest = hashlib.sha256(GRADER_PATH.read_bytes() if GRADER_PATH.exists() else b"")
+    digest.update(f"{GRADER_PROMPT_VERSION}:{model or 'default'}".encode())
+    return digest.hexdigest()[:16]
+
+
+def hash_outputs(outputs_dir: Path) -> str:
+    """Hash of every file's relative path and contents under outputs_dir."""
+    digest = hashlib.sha256()
+    if outputs_dir.is_dir():
+        for path in sorted(p for p in outputs_dir.rglob("*") if p.is_file()):
+            digest.update(path.relative_to(outputs_dir).as_posix().encode() + b"\0")
+            file_digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    file_digest.update(chunk)
+            digest.update(file_digest.digest())
+    return digest.hexdigest()
+
+
+def expectation_spec(expectation: dict) -> str:
+    """Canonical JSON of what an expectation asks for: its text and check."""
+    return json.dumps({"text": expectation["text"], "check": expectation.get("check")}, sort_keys=True)
+
+
+def expectations_digest(expectations: list[dict]) -> str:
+    """Digest of every expectation's spec, in order; stored in grading.json."""
+    return hashlib.sha256("\0".join(expectation_spec(e) for e in expectations).encode()).hexdigest()[:16]
+
+
+def cache_key(outputs_hash: str, expectation: dict, version: str) -> str:
+    spec = expectation_spec(expectation)
+    return hashlib.sha256(f"{outputs_hash}\0{spec}\0{version}".encode()).hexdigest()
+
+
+class GradingCache:
+    """One small JSON file per verdict, sharded by key prefix, written atomically."""
+
+    def __init__(self, root: Path | None):
+        self.root = root
+        self.hits = 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        if self.root is None:
+            return None
+        try:
+            entry = json.loads(self._path(key).read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, verdict: dict) -> None:
+        if self.root is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(verdict))
+        os.replace(tmp, path)
+
+
+def normalize_expectations(raw: list) -> list[dict]:
+    """Expectations as {"text", "check"?} dicts; plain strings go to the LLM grader."""
+    expectations = []
+    for item in raw:
+        if isinstance(item, str):
+            expectations.append({"text": item})
+        elif isinstance(item, dict) and "text" in item:
+            expectations.append({"text": item["text"], **({"check": item["check"]} if item.get("check") else {})})
+    return expectations
+
+
+def _matching_files(outputs_dir: Path, pattern: str) -> list[Path]:
+    matches = glob.glob(str(outputs_dir / pattern), recursive=True)
+    return sorted(Path(m) for m in matches if os.path.isfile(m))
+
+
+def _read_text(path: Path) -> str:
+    with open(path, "rb") as f:
+        return f.read(MAX_CHECK_BYTES).decode("utf-8", errors="replace")
+
+
+def run_check(run_dir: str, check: dict) -> tuple[bool, str]:
+    """Evaluate one programmatic check against a run. Returns (passed, evidence)."""
+    run_path = Path(run_dir)
+    outputs_dir = run_path / "outputs"
+    check_type = check.get("type")
+    try:
+        if check_type == "command":
+            command = check["command"]
+            args = shlex.split(command) if isinstance(command, str) else list(command)
+            proc = subprocess.run(
+                args, cwd=run_path, capture_output=True, text=True, timeout=check.get("timeout", COMMAND_TIMEOUT)
+            )
+            tail = (proc.stdout + proc.stderr).strip()[-300:]
+            return proc.returncode == 0, f"`{command}` exited {proc.returncode}" + (f": {tail}" if tail else "")
+
+        files = _matching_files(outputs_dir, check.get("path", "**/*"))
+        names = ", ".join(p.relative_to(outputs_dir).as_posix() for p in files[:5]) + (" ..." if len(files) > 5 else "")
+        if check_type == "file_exists":
+            return (bool(files), f"Found {names}") if files else (False, f"No file matches {check.get('path')}")
+        if check_type in ("file_contains", "file_not_contains"):
+            pattern = re.compile(check["pattern"], re.MULTILINE)
+            hits = []
+            for path in files:
+                match = pattern.search(_read_text(path))
+                if match:
+                    hits.append(f"{path.relative_to(outputs_dir).as_posix()}: {match.group(0)[:80]!r}")
+            if check_type == "file_contains":
+                if not files:
+                    return False, f"No file matches {check.get('path')}"
+                return (True, f"Found in {hits[0]}") if hits else (False, f"/{check['pattern']}/ not found in {names}")
+            return (False, f"Found in {hits[0]}") if hits else (True, f"/{check['pattern']}/ absent from {len(files)} files")
+        if check_type == "json_valid":
+            if not files:
+                return False, f"No file matches {check.get('path')}"
+            for path in files:
+                try:
+                    json.loads(path.read_bytes())
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                    return False, f"{path.relative_to(outputs_dir).as_posix()} is not valid JSON: {e}"
+            return True, f"Valid JSON: {names}"
+    except (KeyError, re.error, OSError, subprocess.SubprocessError, ValueError) as e:
+        return False, f"Check failed to run: {type(e).__name__}: {e}"
+    return False, f"Unknown check type: {check_type!r}"
+
+
+def build_grader_prompt(run_dir: Path, texts: list[str], output_path: Path) -> str:
+    listed = "\n".join(f"- {text}" for text in texts)
+    return (
+        f"Read {GRADER_PATH} and act as that Grader.\n\n"
+        f"expectations:\n{listed}\n\n"
+        f"transcript_path: {run_dir / 'transcript.md'}\n"
+        f"outputs_dir: {run_dir / 'outputs'}\n\n"
+        f"Grade exactly these expectations, keeping their text verbatim. "
+        f"Save the grading JSON to {output_path} instead of grading.json."
+    )
+
+
+def grade_with_llm(run_dir: Path, texts: list[str], claude_bin: str, model: str | None, timeout: int) -> dict:
+    """Run the LLM grader on one run's remaining expectations and return its grading JSON."""
+    run_dir = run_dir.resolve()
+    output_path = run_dir / "grading.llm.json"
+    output_path.unlink(missing_ok=True)
+    cmd = [
+        claude_bin, "-p", build_grader_prompt(run_dir, texts, output_path),
+        "--output-format", "json", "--permission-mode", "acceptEdits", "--add-dir", str(GRADER_PATH.parent),
+    ]
+    if model:
+        cmd.extend(["--model", model])
+    env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
+    proc = subprocess.run(cmd, cwd=run_dir, env=env, capture_output=True, timeout=timeout, stdin=subprocess.DEVNULL)
+    if proc.returncode != 0:
+        tail = proc.stderr.decode("utf-8", errors="replace").strip().splitlines()[-1:] or [""]
+        raise RuntimeError(f"grader exited {proc.returncode}: {tail[0][:200]}")
+    try:
+        return json.loads(output_path.read_text())
+    except (OSError, json.JSONDecodeError) as e:
+        raise RuntimeError(f"grader wrote no usable {output_path.name}: {e}") from e
+    finally:
+        output_path.unlink(missing_ok=True)
+
+
+def _already_graded(run_dir: Path, expectations: list[dict]) -> bool:
+    """grading.json was written by grade_runs for exactly these expectations, checks included."""
+    try:
+        grading = json.loads((run_dir / "grading.json").read_text())
+    except (OSError, json.JSONDecodeError):
+        return False
+    return grading.get("expectations_digest") == expectations_digest(expectations)
+
+
+def write_grading(run_dir: Path, expectations: list[dict], verdicts: list[dict], llm_grading: dict | None) -> None:
+    passed = sum(1 for v in verdicts if v["passed"])
+    grading = dict(llm_grading or {})
+    grading["expectations"] = verdicts
+    grading["expectations_digest"] = expectations_digest(expectations)
+    grading["summary"] = {
+        "passed": passed,
+        "failed": len(verdicts) - passed,
+        "total": len(verdicts),
+        "pass_rate": round(passed / len(verdicts), 4) if verdicts else 0.0,
+    }
+    metrics_file = run_dir / "outputs" / "metrics.json"
+    if "execution_metrics" not in grading and metrics_file.exists():
+        try:
+            grading["execution_metrics"] = json.loads(metrics_file.read_text())
+        except json.JSONDecodeError:
+            pass
+    tmp = run_dir / "grading.json.tmp"
+    tmp.write_text(json.dumps(grading, indent=2))
+    os.replace(tmp, run_dir / "grading.json")
+
+
+def find_run_dirs(workspace: Path) -> list[tuple[Path, list[dict]]]:
+    """(run_dir, expectations) for every run with outputs/, expectations from eval_metadata.json."""
+    runs = []
+    for eval_dir in sorted(workspace.glob("eval-*")):
+        try:
+            metadata = json.loads((eval_dir / "eval_metadata.json").read_text())
+        except (OSError, json.JSONDecodeError):
+            print(f"Warning: no readable eval_metadata.json in {eval_dir}", file=sys.stderr)
+            continue
+        expectations = normalize_expectations(metadata.get("assertions") or metadata.get("expectations") or [])
+        if not expectations:
+            continue
+        for run_dir in sorted(eval_dir.glob("*/run-*")):
+            if (run_dir / "outputs").is_dir():
+                runs.append((run_dir, expectations))
+    return runs
+
+
+def grade_workspace(
+    workspace: Path,
+    cache: GradingCache,
+    num_workers: int = 8,
+    model: str | None = None,
+    claude_bin: str = "claude",
+    timeout: int = 600,
+    force: bool = False,
+) -> dict:
+    version = grader_version(model)
+    stats = {"runs": 0, "skipped": 0, "cached": 0, "local": 0, "llm": 0, "llm_calls": 0, "failed": []}
+    start = time.perf_counter()
+
+    # Pass 1: cache lookups; collect local checks and LLM work
+    pending = []  # (run_dir, expectations, verdicts, keys)
+    check_jobs = []  # (run index, expectation index, run_dir, check)
+    for run_dir, expectations in find_run_dirs(workspace):
+        if not force and _already_graded(run_dir, expectations):
+            stats["skipped"] += 1
+            continue
+        stats["runs"] += 1
+        outputs_hash = hash_outputs(run_dir / "outputs")
+        keys = [cache_key(outputs_hash, e, version) for e in expectations]
+        verdicts = [cache.get(key) for key in keys]
+        stats["cached"] += sum(v is not None for v in verdicts)
+        for i, expectation in enumerate(expectations):
+            if verdicts[i] is None and "check" in expectation:
+                check_jobs.append((len(pending), i, str(run_dir), expectation["check"]))
+        pending.append((run_dir, expectations, verdicts, keys))
+
+    # Pass 2: programmatic checks in a process pool
+    if check_jobs:
+        with ProcessPoolExecutor(max_workers=max(1, num_workers), initializer=profiling.worker_initializer) as executor:
+            futures = {executor.submit(run_check, run_dir, check): (run_idx, exp_idx) for run_idx, exp_idx, run_dir, check in check_jobs}
+            for future in as_completed(futures):
+                run_idx, exp_idx = futures[future]
+                _, expectations, verdicts, keys = pending[run_idx]
+                passed, evidence = future.result()
+                verdicts[exp_idx] = {"text": expectations[exp_idx]["text"], "passed": passed, "evidence": evidence}
+                cache.put(keys[exp_idx], verdicts[exp_idx])
+                stats["local"] += 1
+
+    # Pass 3: one LLM grader call per run for whatever is left, in parallel
+    def finish(run_idx: int, llm_grading: dict | None) -> None:
+        run_dir, expectations, verdicts, keys = pending[run_idx]
+        by_text = {e.get("text"): e for e in (llm_grading or {}).get("expectations", [])}
+        for i, expectation in enumerate(expectations):
+            if verdicts[i] is None:
+                graded = by_text.get(expectation["text"])
+                if graded is None:
+                    verdicts[i] = {"text": expectation["text"], "passed": False, "evidence": "Not graded: missing from grader output"}
+                    continue
+                verdicts[i] = {"text": expectation["text"], "passed": bool(graded.get("passed")), "evidence": graded.get("evidence", "")}
+                cache.put(keys[i], verdicts[i])
+                stats["llm"] += 1
+        write_grading(run_dir, expectations, verdicts, llm_grading)
+
+    llm_jobs = {}
+    with ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+        for run_idx, (run_dir, expectations, verdicts, _) in enumerate(pending):
+            remaining = [e["text"] for e, v in zip(expectations, verdicts) if v is None]
+            if remaining:
+                llm_jobs[executor.submit(grade_with_llm, run_dir, remaining, claude_bin, model, timeout)] = run_idx
+            else:
+                finish(run_idx, None)
+        stats["llm_calls"] = len(llm_jobs)
+        for future in as_completed(llm_jobs):
+            run_idx = llm_jobs[future]
+            run_dir = pending[run_idx][0]
+            try:
+                llm_grading = future.result()
+            except (RuntimeError, OSError, subprocess.SubprocessError) as e:
+                stats["failed"].append({"run": run_dir.relative_to(workspace).as_posix(), "error": str(e)})
+                print(f"Warning: grading {run_dir} failed: {e}", file=sys.stderr)
+                continue
+            finish(run_idx, llm_grading)
+
+    stats["cache_hits"] = cache.hits
+    stats["wall_seconds"] = round(time.perf_counter() - start, 2)
+    stats["grader_version"] = version
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade benchmark runs: cached verdicts, local checks, then the LLM grader in parallel")
+    parser.add_argument("workspace", type=Path, help="Iteration directory containing eval-N/<config>/run-K")
+    parser.add_argument("--cache-dir", type=Path, default=None, help="Verdict cache (default: <workspace>/../.grading-cache, shared across iterations)")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the verdict cache")
+    parser.add_argument("--num-workers", type=int, default=8, help="Parallel check processes and grader calls")
+    parser.add_argument("--model", default=None, help="Model for the LLM grader (part of the cache key)")
+    parser.add_argument("--timeout", type=int, default=600, help="Timeout per LLM grader call in seconds")
+    parser.add_argument("--claude-bin", default="claude", help="CLI to run the grader with (default: claude)")
+    parser.add_argument("--force", action="store_true", help="Regrade runs whose grading.json is already current")
+    args = parser.parse_args()
+
+    if not args.workspace.is_dir():
+        print(f"Error: Directory not found: {args.workspace}", file=sys.stderr)
+        sys.exit(1)
+    if shutil.which(args.claude_bin) is None:
+        print(f"Warning: '{args.claude_bin}' not found on PATH; only cached and local checks can be graded", file=sys.stderr)
+
+    cache_dir = None if args.no_cache else (args.cache_dir or args.workspace.resolve().parent / ".grading-cache")
+    stats = grade_workspace(
+        args.workspace, GradingCache(cache_dir), args.num_workers, args.model, args.claude_bin, args.timeout, args.force
+    )
+    print(
+        f"Graded {stats['runs']} runs ({stats['skipped']} already current): "
+        f"{stats['cached']} cached, {stats['local']} local checks, {stats['llm']} by LLM in {stats['llm_calls']} calls, "
+        f"{stats['wall_seconds']}s",
+        file=sys.stderr,
+    )
+    print(json.dumps(stats, indent=2))
+    if stats["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "grade_runs")
@@ -10,14 +10,19 @@ import json
 import re
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import anthropic
-
+from scripts import tracing
+from scripts.token_usage import add_usage, empty_usage, usage_from_api
+from scripts.transcript_store import TranscriptStore
 from scripts.utils import parse_skill_md
 
+if TYPE_CHECKING:
+    import anthropic
+
 
 def improve_description(
-    client: anthropic.Anthropic,
+    client: "anthropic.Anthropic",
     skill_name: str,
     skill_content: str,
     current_description: str,
@@ -27,8 +32,17 @@ def improve_description(
     test_results: dict | None = None,
     log_dir: Path | None = None,
     iteration: int | None = None,
+    transcript_store: TranscriptStore | None = None,
+    run_id: str | None = None,
+    usage_totals: dict | None = None,
 ) -> str:
-    """Call Claude to improve the description based on eval results."""
+    """Call Claude to improve the description based on eval results.
+
+    The transcript goes to transcript_store (indexed under run_id) when one is
+    given, otherwise to log_dir/improve_iter_N.json. Token usage of every API
+    call is added to usage_totals in place, if provided.
+    """
+    call_usage = empty_usage()
     failed_triggers = [
         r for r in eval_results["results"]
         if r["should_trigger"] and not r["pass"]
@@ -111,15 +125,16 @@ I'd encourage you to be creative and mix up the style in different iterations si
 
 Please respond with only the new description text in <new_description> tags, nothing else."""
 
-    response = client.messages.create(
-        model=model,
-        max_tokens=16000,
-        thinking={
-            "type": "enabled",
-            "budget_tokens": 10000,
-        },
-        messages=[{"role": "user", "content": prompt}],
-    )
+    with tracing.span("api_call", cat="improve", model=model, purpose="improve") as span_args:
+        response = client.messages.create(
+            model=model,
+            max_tokens=16000,
+            thinking={
+                "type": "enabled",
+                "budget_tokens": 10000,
+            },
+            messages=[{"role": "user", "content": prompt}],
+        )
 
     # Extract thinking and text from response
     thinking_text = ""
@@ -130,6 +145,10 @@ Please respond with only the new description text in <new_description> tags, not
         elif block.type == "text":
             text = block.text
 
+    improve_usage = usage_from_api(response.usage, model, thinking_text)
+    add_usage(call_usage, improve_usage)
+    span_args.update(input_tokens=improve_usage["input_tokens"], output_tokens=improve_usage["output_tokens"])
+
     # Parse out the <new_description> tags
     match = re.search(r"<new_description>(.*?)</new_description>", text, re.DOTALL)
     description = match.group(1).strip().strip('"') if match else text.strip().strip('"')
@@ -148,19 +167,20 @@ Please respond with only the new description text in <new_description> tags, not
     # If over 1024 chars, ask the model to shorten it
     if len(description) > 1024:
         shorten_prompt = f"Your description is {len(description)} characters, which exceeds the hard 1024 character limit. Please rewrite it to be under 1024 characters while preserving the most important trigger words and intent coverage. Respond with only the new description in <new_description> tags."
-        shorten_response = client.messages.create(
-            model=model,
-            max_tokens=16000,
-            thinking={
-                "type": "enabled",
-                "budget_tokens": 10000,
-            },
-            messages=[
-                {"role": "user", "content": prompt},
-                {"role": "assistant", "content": text},
-                {"role": "user", "content": shorten_prompt},
-            ],
-        )
+        with tracing.span("api_call", cat="improve", model=model, purpose="shorten") as span_args:
+            shorten_response = client.messages.create(
+                model=model,
+                max_tokens=16000,
+                thinking={
+                    "type": "enabled",
+                    "budget_tokens": 10000,
+                },
+                messages=[
+                    {"role": "user", "content": prompt},
+                    {"role": "assistant", "content": text},
+                    {"role": "user", "content": shorten_prompt},
+                ],
+            )
 
         shorten_thinking = ""
         shorten_text = ""
@@ -170,6 +190,10 @@ Please respond with only the new description text in <new_description> tags, not
             elif block.type == "text":
                 shorten_text = block.text
 
+        shorten_usage = usage_from_api(shorten_response.usage, model, shorten_thinking)
+        add_usage(call_usage, shorten_usage)
+        span_args.update(input_tokens=shorten_usage["input_tokens"], output_tokens=shorten_usage["output_tokens"])
+
         match = re.search(r"<new_description>(.*?)</new_description>", shorten_text, re.DOTALL)
         shortened = match.group(1).strip().strip('"') if match else shorten_text.strip().strip('"')
 
@@ -181,8 +205,19 @@ Please respond with only the new description text in <new_description> tags, not
         description = shortened
 
     transcript["final_description"] = description
-
-    if log_dir:
+    transcript["usage"] = call_usage
+    if usage_totals is not None:
+        add_usage(usage_totals, call_usage)
+
+    if transcript_store:
+        transcript_store.append(
+            run_id or "unknown",
+            skill_name,
+            transcript,
+            passed=eval_results["summary"]["passed"],
+            total=eval_results["summary"]["total"],
+        )
+    elif log_dir:
         log_dir.mkdir(parents=True, exist_ok=True)
         log_file = log_dir / f"improve_iter_{iteration or 'unknown'}.json"
         log_file.write_text(json.dumps(transcript, indent=2))
@@ -197,6 +232,8 @@ def main():
     parser.add_argument("--history", default=None, help="Path to history JSON (previous attempts)")
     parser.add_argument("--model", required=True, help="Model for improvement")
     parser.add_argument("--verbose", action="store_true", help="Print thinking to stderr")
+    parser.add_argument("--trace", type=Path, default=None, help="Write a Chrome trace-event JSON file (open in Perfetto)")
+    parser.add_argument("--trace-otlp", default=None, help="Also export spans as OTLP/JSON to this file or collector URL")
     args = parser.parse_args()
 
     skill_path = Path(args.skill_path)
@@ -216,7 +253,14 @@ def main():
         print(f"Current: {current_description}", file=sys.stderr)
         print(f"Score: {eval_results['summary']['passed']}/{eval_results['summary']['total']}", file=sys.stderr)
 
+    if args.trace or args.trace_otlp:
+        tracing.start_trace("improve_description")
+
+    # Imported here so --help and other subcommands skip the anthropic/httpx/pydantic stack
+    import anthropic
+
     client = anthropic.Anthropic()
+    usage = empty_usage()
     new_description = improve_description(
         client=client,
         skill_name=name,
@@ -225,6 +269,7 @@ def main():
         eval_results=eval_results,
         history=history,
         model=args.model,
+        usage_totals=usage,
     )
 
     if args.verbose:
@@ -233,6 +278,7 @@ def main():
     # Output as JSON with both the new description and updated history
     output = {
         "description": new_description,
+        "usage": usage,
         "history": history + [{
             "description": current_description,
             "passed": eval_results["summary"]["passed"],
@@ -242,7 +288,10 @@ def main():
         }],
     }
     print(json.dumps(output, indent=2))
+    tracing.finish_trace(args.trace, args.trace_otlp)
 
 
 if __name__ == "__main__":
-    main()
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "improve_description")
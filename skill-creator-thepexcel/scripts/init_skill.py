@@ -11,6 +11,7 @@ Examples:
     init_skill.py custom-skill --path /custom/location
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -271,21 +272,27 @@ def init_skill(skill_name, path):
 
 
 def main():
-    if len(sys.argv) < 4 or sys.argv[2] != '--path':
-        print("Usage: init_skill.py <skill-name> --path <path>")
-        print("\nSkill name requirements:")
-        print("  - Hyphen-case identifier (e.g., 'data-analyzer')")
-        print("  - Lowercase letters, digits, and hyphens only")
-        print("  - Max 40 characters")
-        print("  - Must match directory name exactly")
-        print("\nExamples:")
-        print("  init_skill.py my-new-skill --path skills/public")
-        print("  init_skill.py my-api-helper --path skills/private")
-        print("  init_skill.py custom-skill --path /custom/location")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Create a new skill from the template",
+        epilog=(
+            "Skill name requirements:\n"
+            "  - Hyphen-case identifier (e.g., 'data-analyzer')\n"
+            "  - Lowercase letters, digits, and hyphens only\n"
+            "  - Max 40 characters\n"
+            "  - Must match directory name exactly\n"
+            "\nExamples:\n"
+            "  init_skill.py my-new-skill --path skills/public\n"
+            "  init_skill.py my-api-helper --path skills/private\n"
+            "  init_skill.py custom-skill --path /custom/location"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("skill_name", help="Hyphen-case skill name")
+    parser.add_argument("--path", required=True, help="Directory to create the skill in")
+    args = parser.parse_args()
 
-    skill_name = sys.argv[1]
-    path = sys.argv[3]
+    skill_name = args.skill_name
+    path = args.path
 
     print(f"🚀 Initializing skill: {skill_name}")
     print(f"   Location: {path}")
@@ -300,4 +307,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "init_skill")
@@ -10,6 +10,7 @@ Example:
     python utils/package_skill.py skills/public/my-skill ./dist
 """
 
+import argparse
 import fnmatch
 import sys
 import zipfile
@@ -109,15 +110,17 @@ def package_skill(skill_path, output_dir=None):
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
-        sys.exit(1)
-
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    parser = argparse.ArgumentParser(
+        description="Package a skill folder into a .skill file",
+        epilog="Example:\n  python utils/package_skill.py skills/public/my-skill ./dist",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("skill_path", help="Path to the skill folder")
+    parser.add_argument("output_dir", nargs="?", default=None, help="Directory for the .skill file (default: cwd)")
+    args = parser.parse_args()
+
+    skill_path = args.skill_path
+    output_dir = args.output_dir
 
     print(f"📦 Packaging skill: {skill_path}")
     if output_dir:
@@ -133,4 +136,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "package_skill")
@@ -0,0 +1,268 @@
+"""Built-in profiling for skill-creator scripts (--profile).
+
+Every script accepts `--profile[=cprofile|tracemalloc|sampling]` and an
+optional `--profile-dir DIR` (default: the script's --results-dir, else
+./profiles). Modes:
+
+- cprofile: deterministic profile written as <name>.prof (open with pstats,
+  snakeviz or flameprof) plus a text summary of the top functions.
+- sampling: a low-overhead stack sampler written as <name>.collapsed, the
+  "frame;frame;frame count" format read by flamegraph.pl and speedscope.
+- tracemalloc: peak memory, top allocation sites and a snapshot file
+  loadable with tracemalloc.Snapshot.load().
+
+The mode and output directory are exported through environment variables,
+so ProcessPoolExecutor workers started with worker_initializer profile
+themselves too and write worker-<pid>.* files next to the parent's.
+Worker .prof and .collapsed files are merged into workers.* at the end.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+PROFILE_MODE_ENV = "SKILL_CREATOR_PROFILE"
+PROFILE_DIR_ENV = "SKILL_CREATOR_PROFILE_DIR"
+PROFILE_MODES = ("cprofile", "tracemalloc", "sampling")
+
+SAMPLE_INTERVAL_SECONDS = 0.005
+TOP_N = 40
+
+
+class _SamplingProfiler:
+    """Samples every thread's stack on a timer and counts collapsed stacks."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{Path(code.co_filename).stem}:{code.co_name}:{code.co_firstlineno}")
+                    frame = frame.f_back
+                self.counts[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class Profiler:
+    """Runs one profiling mode in the current process and writes its outputs."""
+
+    def __init__(self, mode: str, out_dir: Path, name: str):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}' (expected one of {', '.join(PROFILE_MODES)})")
+        self.mode = mode
+        self.out_dir = Path(out_dir)
+        self.name = name
+        self._impl = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self.mode == "cprofile":
+            import cProfile
+
+            self._impl = cProfile.Profile()
+            self._impl.enable()
+        elif self.mode == "tracemalloc":
+            import tracemalloc
+
+            if tracemalloc.is_tracing():
+                # Forked worker inherited the parent's tracing; measure only its own peak
+                tracemalloc.clear_traces()
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start(25)
+        else:
+            self._impl = _SamplingProfiler()
+            self._impl.start()
+
+    def stop(self) -> list[Path]:
+        """Stop profiling and write output files. Returns the paths written."""
+        elapsed = time.perf_counter() - self._started
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        base = self.out_dir / self.name
+        written = []
+
+        if self.mode == "cprofile":
+            import io
+            import pstats
+
+            self._impl.disable()
+            prof_path = base.with_suffix(".prof")
+            self._impl.dump_stats(prof_path)
+            summary = io.StringIO()
+            pstats.Stats(self._impl, stream=summary).sort_stats("cumulative").print_stats(TOP_N)
+            txt_path = base.with_suffix(".prof.txt")
+            txt_path.write_text(f"wall time: {elapsed:.3f}s\n\n" + summary.getvalue())
+            written += [prof_path, txt_path]
+
+        elif self.mode == "tracemalloc":
+            import tracemalloc
+
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            snapshot_path = base.with_suffix(".tracemalloc")
+            snapshot.dump(str(snapshot_path))
+            lines = [
+                f"wall time: {elapsed:.3f}s",
+                f"peak traced memory: {peak / 1024 / 1024:.2f} MiB",
+                f"traced at exit: {current / 1024 / 1024:.2f} MiB",
+                "",
+                f"Top {TOP_N} allocation sites at exit:",
+            ]
+            for stat in snapshot.statistics("lineno")[:TOP_N]:
+                lines.append(f"  {stat}")
+            txt_path = base.with_suffix(".tracemalloc.txt")
+            txt_path.write_text("\n".join(lines) + "\n")
+            written += [snapshot_path, txt_path]
+
+        else:
+            self._impl.stop()
+            collapsed_path = base.with_suffix(".collapsed")
+            collapsed_path.write_text(
+                "".join(f"{stack} {count}\n" for stack, count in self._impl.counts.most_common())
+            )
+            written.append(collapsed_path)
+
+        return written
+
+
+def extract_profile_args(argv: list[str], prog: str | None = None) -> tuple[str | None, Path | None, list[str]]:
+    """Pull --profile[=MODE] and --profile-dir DIR out of argv.
+
+    Returns (mode, profile_dir, remaining argv) so the script's own argparse
+    never sees the profiling options. An unknown mode exits with status 2
+    and an argparse-style usage error.
+    """
+    mode = None
+    profile_dir = None
+    rest = []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--profile":
+            # Bare --profile, or --profile MODE
+            if i + 1 < len(argv) and argv[i + 1] in PROFILE_MODES:
+                mode = argv[i + 1]
+                i += 1
+            else:
+                mode = "cprofile"
+        elif arg.startswith("--profile="):
+            mode = arg.split("=", 1)[1]
+        elif arg == "--profile-dir" and i + 1 < len(argv):
+            profile_dir = Path(argv[i + 1])
+            i += 1
+        elif arg.startswith("--profile-dir="):
+            profile_dir = Path(arg.split("=", 1)[1])
+        else:
+            rest.append(arg)
+        i += 1
+    if mode is not None and mode not in PROFILE_MODES:
+        choices = ", ".join(repr(m) for m in PROFILE_MODES)
+        print(f"{prog or Path(sys.argv[0]).name}: error: argument --profile: invalid choice: {mode!r} (choose from {choices})", file=sys.stderr)
+        sys.exit(2)
+    return mode, profile_dir, rest
+
+
+def _default_profile_dir(argv: list[str]) -> Path:
+    for i, arg in enumerate(argv):
+        if arg == "--results-dir" and i + 1 < len(argv):
+            return Path(argv[i + 1]) / "profiles"
+        if arg.startswith("--results-dir="):
+            return Path(arg.split("=", 1)[1]) / "profiles"
+    return Path("profiles")
+
+
+def _merge_worker_outputs(out_dir: Path) -> list[Path]:
+    """Combine worker-*.prof and worker-*.collapsed into workers.prof / workers.collapsed."""
+    written = []
+    worker_profs = sorted(out_dir.glob("worker-*.prof"))
+    if worker_profs:
+        import pstats
+
+        stats = pstats.Stats(str(worker_profs[0]))
+        for path in worker_profs[1:]:
+            stats.add(str(path))
+        merged = out_dir / "workers.prof"
+        stats.dump_stats(merged)
+        written.append(merged)
+
+    worker_collapsed = sorted(out_dir.glob("worker-*.collapsed"))
+    if worker_collapsed:
+        counts: Counter[str] = Counter()
+        for path in worker_collapsed:
+            for line in path.read_text().splitlines():
+                stack, _, count = line.rpartition(" ")
+                if stack and count.isdigit():
+                    counts[stack] += int(count)
+        merged = out_dir / "workers.collapsed"
+        merged.write_text("".join(f"{stack} {count}\n" for stack, count in counts.most_common()))
+        written.append(merged)
+    return written
+
+
+def run_profiled(main, name: str, argv: list[str] | None = None) -> None:
+    """Run main() with profiling if --profile is in argv (defaults to sys.argv).
+
+    The profiling options are removed from sys.argv before main() parses it.
+    """
+    argv = sys.argv if argv is None else argv
+    mode, profile_dir, rest = extract_profile_args(argv[1:], Path(argv[0]).name)
+    if mode is None:
+        main()
+        return
+
+    out_dir = (profile_dir or _default_profile_dir(rest)).resolve()
+    # Stale worker files from an earlier run would otherwise be merged in
+    for stale in out_dir.glob("worker-*"):
+        stale.unlink()
+    sys.argv = [argv[0], *rest]
+    # Workers started with worker_initializer pick these up
+    os.environ[PROFILE_MODE_ENV] = mode
+    os.environ[PROFILE_DIR_ENV] = str(out_dir)
+
+    profiler = Profiler(mode, out_dir, name)
+    profiler.start()
+    try:
+        main()
+    finally:
+        written = profiler.stop()
+        written += _merge_worker_outputs(out_dir)
+        print(f"Profile ({mode}) written to: {out_dir}", file=sys.stderr)
+        for path in written:
+            print(f"  {path.name}", file=sys.stderr)
+
+
+def worker_initializer() -> None:
+    """ProcessPoolExecutor initializer: profile this worker for its whole lifetime."""
+    mode = os.environ.get(PROFILE_MODE_ENV)
+    out_dir = os.environ.get(PROFILE_DIR_ENV)
+    if not mode or not out_dir:
+        return
+
+    from multiprocessing import util
+
+    profiler = Profiler(mode, Path(out_dir), f"worker-{os.getpid()}")
+    profiler.start()
+    # Pool workers exit via os._exit, which skips atexit; multiprocessing
+    # finalizers with an exit priority still run on the way out.
+    util.Finalize(None, profiler.stop, exitpriority=10)
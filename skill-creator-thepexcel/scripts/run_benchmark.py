@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""Run benchmark evals in parallel with claude -p.
+
+Fans evals x configurations x runs out over a bounded pool of `claude -p`
+processes and writes the workspace layout aggregate_benchmark and the
+viewer read, each run as soon as it finishes:
+
+    <workspace>/eval-<id>/eval_metadata.json
+    <workspace>/eval-<id>/<config>/run-<k>/inputs/          (copies of evals[].files)
+    <workspace>/eval-<id>/<config>/run-<k>/outputs/         (everything the run produced)
+    <workspace>/eval-<id>/<config>/run-<k>/transcript.md
+    <workspace>/eval-<id>/<config>/run-<k>/timing.json
+
+Configurations are `with_skill` (the skill at --skill-path), `without_skill`
+(no skill) or `name=path` for any other skill directory, e.g.
+`old_skill=workspace/skill-snapshot`. Runs that already finished are skipped
+unless --force, so an interrupted benchmark can be resumed; runs that failed
+or timed out (timing.json has an "error") are retried.
+
+--claude-bin points at another executable speaking claude's stream-json
+output, e.g. a fake CLI for testing.
+
+Usage:
+    python -m scripts.run_benchmark --skill-path ../my-skill --workspace ../my-skill-workspace/iteration-1 \\
+        [--configs with_skill without_skill] [--runs 3] [--num-workers 4] [--model <model>]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+
+from scripts import tracing
+from scripts.token_usage import StreamUsage, sum_usage, total_tokens
+
+DEFAULT_CONFIGS = ("with_skill", "without_skill")
+
+
+def parse_configs(specs: list[str], skill_path: Path) -> dict[str, Path | None]:
+    """Map configuration names to the skill directory each one runs with (None = no skill)."""
+    configs: dict[str, Path | None] = {}
+    for spec in specs:
+        name, sep, path = spec.partition("=")
+        if sep:
+            configs[name] = Path(path).resolve()
+        elif name == "with_skill":
+            configs[name] = skill_path.resolve()
+        elif name == "without_skill":
+            configs[name] = None
+        else:
+            raise ValueError(f"Unknown configuration '{spec}': use with_skill, without_skill or name=<skill-dir>")
+    return configs
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_prompt(eval_item: dict, skill_dir: Path | None, run_dir: Path, inputs: list[str]) -> str:
+    parts = []
+    if skill_dir is not None:
+        parts.append(f"Use the skill at {skill_dir}: read {skill_dir / 'SKILL.md'} first and follow its instructions.")
+    parts.append(f"Task:\n{eval_item['prompt']}")
+    if inputs:
+        listed = "\n".join(f"- {run_dir / 'inputs' / name}" for name in inputs)
+        parts.append(f"Input files:\n{listed}")
+    parts.append(f"Save every file you produce to {run_dir / 'outputs'}/.")
+    return "\n\n".join(parts)
+
+
+def write_eval_metadata(eval_dir: Path, eval_item: dict) -> None:
+    eval_dir.mkdir(parents=True, exist_ok=True)
+    metadata = {
+        "eval_id": eval_item["id"],
+        "eval_name": eval_item.get("name") or f"eval-{eval_item['id']}",
+        "prompt": eval_item["prompt"],
+        "assertions": eval_item.get("expectations", []),
+    }
+    (eval_dir / "eval_metadata.json").write_text(json.dumps(metadata, indent=2))
+
+
+def _transcript(prompt: str, events: list[dict]) -> str:
+    """Markdown transcript from stream-json events: assistant text, tool calls, final result."""
+    lines = ["# Transcript", "", "## Eval Prompt", "", prompt, "", "## Execution", ""]
+    result_text = None
+    for event in events:
+        if event.get("type") == "assistant":
+            for item in event.get("message", {}).get("content", []):
+                if item.get("type") == "text" and item.get("text", "").strip():
+                    lines.extend([item["text"].strip(), ""])
+                elif item.get("type") == "tool_use":
+                    tool_input = json.dumps(item.get("input", {}), ensure_ascii=False)
+                    if len(tool_input) > 500:
+                        tool_input = tool_input[:500] + "..."
+                    lines.extend([f"Tool: {item.get('name', '')} - {tool_input}", ""])
+        elif event.get("type") == "result":
+            result_text = event.get("result")
+    if result_text:
+        lines.extend(["## Result", "", result_text.strip(), ""])
+    return "\n".join(lines)
+
+
+def execute_run(
+    eval_item: dict,
+    config: str,
+    skill_dir: Path | None,
+    run_dir: Path,
+    skill_root: Path,
+    timeout: int,
+    model: str | None,
+    claude_bin: str,
+    permission_mode: str,
+) -> dict:
+    """Run one eval once under one configuration and write its run directory."""
+    with tracing.span("benchmark_run", cat="benchmark", eval_id=eval_item["id"], config=config, run=run_dir.name) as span_args:
+        if run_dir.exists():
+            shutil.rmtree(run_dir)
+        (run_dir / "outputs").mkdir(parents=True)
+
+        inputs = []
+        for rel in eval_item.get("files", []):
+            src = skill_root / rel
+            if src.is_file():
+                (run_dir / "inputs").mkdir(exist_ok=True)
+                shutil.copy2(src, run_dir / "inputs" / src.name)
+                inputs.append(src.name)
+            else:
+                print(f"Warning: input file not found: {src}", file=sys.stderr)
+
+        prompt = build_prompt(eval_item, skill_dir, run_dir.resolve(), inputs)
+        cmd = [claude_bin, "-p", prompt, "--output-format", "stream-json", "--verbose", "--permission-mode", permission_mode]
+        if skill_dir is not None:
+            cmd.extend(["--add-dir", str(skill_dir)])
+        if model:
+            cmd.extend(["--model", model])
+        # Same as run_eval: allow nesting claude -p inside a Claude Code session
+        env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
+
+        started_at = _utc_now()
+        start = time.perf_counter()
+        error = None
+        process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=run_dir, env=env, stdin=subprocess.DEVNULL
+        )
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            stdout, stderr = process.communicate()
+            error = f"timed out after {timeout}s"
+        duration = time.perf_counter() - start
+        if error is None and process.returncode != 0:
+            tail = stderr.decode("utf-8", errors="replace").strip().splitlines()[-1:] or [""]
+            error = f"exit code {process.returncode}: {tail[0][:200]}"
+
+        usage_tracker = StreamUsage(model)
+        events = []
+        for line in stdout.decode("utf-8", errors="replace").splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            usage_tracker.update(event)
+            if event.get("type") in ("assistant", "result"):
+                events.append(event)
+        usage = usage_tracker.result()
+
+        (run_dir / "transcript.md").write_text(_transcript(prompt, events))
+        timing = {
+            "total_tokens": total_tokens(usage),
+            "duration_ms": int(duration * 1000),
+            "total_duration_seconds": round(duration, 1),
+            "executor_start": started_at,
+            "executor_end": _utc_now(),
+            "executor_duration_seconds": round(duration, 1),
+            "usage": usage,
+        }
+        if error:
+            timing["error"] = error
+        (run_dir / "timing.json").write_text(json.dumps(timing, indent=2))
+
+        span_args["duration_s"] = round(duration, 2)
+        span_args["tokens"] = timing["total_tokens"]
+        return timing
+
+
+def _completed(run_dir: Path) -> bool:
+    """A previous run finished without error (failed runs are retried)."""
+    try:
+        return "error" not in json.loads((run_dir / "timing.json").read_text())
+    except (OSError, json.JSONDecodeError):
+        return False
+
+
+def run_benchmark(
+    evals: list[dict],
+    configs: dict[str, Path | None],
+    workspace: Path,
+    skill_root: Path,
+    runs: int = 3,
+    num_workers: int = 4,
+    timeout: int = 600,
+    model: str | None = None,
+    claude_bin: str = "claude",
+    permission_mode: str = "acceptEdits",
+    force: bool = False,
+) -> dict:
+    """Run every eval `runs` times per configuration and return a summary."""
+    jobs = []
+    skipped = 0
+    for eval_item in evals:
+        eval_dir = workspace / f"eval-{eval_item['id']}"
+        write_eval_metadata(eval_dir, eval_item)
+        for config, skill_dir in configs.items():
+            for run_number in range(1, runs + 1):
+                run_dir = eval_dir / config / f"run-{run_number}"
+                if not force and _completed(run_dir):
+                    skipped += 1
+                    continue
+                jobs.append((run_number, eval_item, config, skill_dir, run_dir))
+
+    # Run-1 of every eval and configuration first, so a partial benchmark stays balanced
+    jobs.sort(key=lambda job: job[0])
+
+    start = time.perf_counter()
+    failed = []
+    usages = []
+    with tracing.span("benchmark_sweep", cat="benchmark", runs=len(jobs)), \
+            ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+        futures = {
+            executor.submit(
+                tracing.bind(execute_run), eval_item, config, skill_dir, run_dir, skill_root, timeout, model, claude_bin, permission_mode
+            ): run_dir
+            for _, eval_item, config, skill_dir, run_dir in jobs
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            run_dir = futures[future]
+            label = run_dir.relative_to(workspace).as_posix()
+            try:
+                timing = future.result()
+            except Exception as e:
+                failed.append({"run": label, "error": str(e)})
+                print(f"[{done}/{len(jobs)}] {label}: failed: {e}", file=sys.stderr)
+                continue
+            usages.append(timing["usage"])
+            if timing.get("error"):
+                failed.append({"run": label, "error": timing["error"]})
+            status = f"error: {timing['error']}" if timing.get("error") else "ok"
+            print(
+                f"[{done}/{len(jobs)}] {label}: {status} ({timing['total_duration_seconds']}s, {timing['total_tokens']} tokens)",
+                file=sys.stderr,
+            )
+
+    return {
+        "workspace": str(workspace),
+        "configs": {name: str(path) if path else None for name, path in configs.items()},
+        "runs_started": len(jobs),
+        "runs_skipped": skipped,
+        "failed": failed,
+        "wall_seconds": round(time.perf_counter() - start, 1),
+        "usage": sum_usage(usages),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run benchmark evals in parallel with claude -p")
+    parser.add_argument("--skill-path", required=True, type=Path, help="Path to the skill directory")
+    parser.add_argument("--workspace", required=True, type=Path, help="Iteration directory to write eval-N/<config>/run-K into")
+    parser.add_argument("--evals", type=Path, default=None, help="evals.json (default: <skill-path>/evals/evals.json)")
+    parser.add_argument("--configs", nargs="+", default=list(DEFAULT_CONFIGS), help="with_skill, without_skill or name=<skill-dir>")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per eval per configuration")
+    parser.add_argument("--eval-ids", nargs="+", default=None, help="Only these eval ids")
+    parser.add_argument("--num-workers", type=int, default=4, help="Concurrent claude -p processes")
+    parser.add_argument("--timeout", type=int, default=600, help="Timeout per run in seconds")
+    parser.add_argument("--model", default=None, help="Model to use for claude -p (default: user's configured model)")
+    parser.add_argument("--permission-mode", default="acceptEdits", help="claude -p --permission-mode for each run")
+    parser.add_argument("--claude-bin", default="claude", help="CLI to run (default: claude)")
+    parser.add_argument("--force", action="store_true", help="Rerun runs that already finished")
+    parser.add_argument("--trace", type=Path, default=None, help="Write a Chrome trace-event JSON file (open in Perfetto)")
+    parser.add_argument("--trace-otlp", default=None, help="Also export spans as OTLP/JSON to this file or collector URL")
+    args = parser.parse_args()
+
+    if not (args.skill_path / "SKILL.md").exists():
+        print(f"Error: No SKILL.md found at {args.skill_path}", file=sys.stderr)
+        sys.exit(1)
+    evals_path = args.evals or args.skill_path / "evals" / "evals.json"
+    if not evals_path.exists():
+        print(f"Error: evals file not found: {evals_path}", file=sys.stderr)
+        sys.exit(1)
+    claude_bin = shutil.which(args.claude_bin)
+    if claude_bin is None:
+        print(f"Error: '{args.claude_bin}' not found on PATH", file=sys.stderr)
+        sys.exit(1)
+    # Runs execute inside their run directory, so a relative --claude-bin must be anchored here
+    claude_bin = os.path.abspath(claude_bin)
+
+    evals = json.loads(evals_path.read_text()).get("evals", [])
+    if args.eval_ids:
+        wanted = set(args.eval_ids)
+        evals = [e for e in evals if str(e["id"]) in wanted]
+    if not evals:
+        print("Error: no evals to run", file=sys.stderr)
+        sys.exit(1)
+    try:
+        configs = parse_configs(args.configs, args.skill_path)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    for name, path in configs.items():
+        if path is not None and not (path / "SKILL.md").exists():
+            print(f"Error: configuration '{name}' has no SKILL.md at {path}", file=sys.stderr)
+            sys.exit(1)
+
+    if args.trace or args.trace_otlp:
+        tracing.start_trace("run_benchmark")
+
+    args.workspace.mkdir(parents=True, exist_ok=True)
+    summary = run_benchmark(
+        evals=evals,
+        configs=configs,
+        workspace=args.workspace,
+        skill_root=args.skill_path,
+        runs=args.runs,
+        num_workers=args.num_workers,
+        timeout=args.timeout,
+        model=args.model,
+        claude_bin=claude_bin,
+        permission_mode=args.permission_mode,
+        force=args.force,
+    )
+
+    print(json.dumps(summary, indent=2))
+    tracing.finish_trace(args.trace, args.trace_otlp)
+    if summary["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "run_benchmark")
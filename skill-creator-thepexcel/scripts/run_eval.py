@@ -16,6 +16,8 @@ import uuid
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+from scripts import profiling, tracing
+from scripts.token_usage import StreamUsage, sum_usage
 from scripts.utils import parse_skill_md
 
 
@@ -32,6 +34,11 @@ def find_project_root() -> Path:
     return current
 
 
+def _init_worker(trace_parent: str) -> None:
+    profiling.worker_initializer()
+    tracing.adopt_parent(trace_parent)
+
+
 def run_single_query(
     query: str,
     skill_name: str,
@@ -39,15 +46,37 @@ def run_single_query(
     timeout: int,
     project_root: str,
     model: str | None = None,
-) -> bool:
-    """Run a single query and return whether the skill was triggered.
+) -> tuple[bool, dict]:
+    """Run a single query and return (triggered, token usage).
 
     Creates a command file in .claude/commands/ so it appears in Claude's
     available_skills list, then runs `claude -p` with the raw query.
     Uses --include-partial-messages to detect triggering early from
     stream events (content_block_start) rather than waiting for the
     full assistant message, which only arrives after tool execution.
+    Usage comes from the stream events seen before the decision, so runs
+    stopped early report partial token counts.
     """
+    tracing.name_process("eval worker")
+    with tracing.span("cli_run", cat="eval", query=query[:80]) as span_args:
+        stream_usage = StreamUsage(model)
+        triggered = _run_single_query(query, skill_name, skill_description, timeout, project_root, model, stream_usage)
+        usage = stream_usage.result()
+        span_args["triggered"] = triggered
+        span_args["input_tokens"] = usage["input_tokens"]
+        span_args["output_tokens"] = usage["output_tokens"]
+        return triggered, usage
+
+
+def _run_single_query(
+    query: str,
+    skill_name: str,
+    skill_description: str,
+    timeout: int,
+    project_root: str,
+    model: str | None,
+    stream_usage: StreamUsage,
+) -> bool:
     unique_id = uuid.uuid4().hex[:8]
     clean_name = f"{skill_name}-skill-{unique_id}"
     project_commands_dir = Path(project_root) / ".claude" / "commands"
@@ -82,105 +111,120 @@ def run_single_query(
         # programmatic subprocess usage is safe.
         env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
 
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            cwd=project_root,
-            env=env,
-        )
-
-        triggered = False
-        start_time = time.time()
-        buffer = ""
-        # Track state for stream event detection
-        pending_tool_name = None
-        accumulated_json = ""
+        with tracing.span("spawn", cat="eval"):
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=project_root,
+                env=env,
+            )
 
         try:
-            while time.time() - start_time < timeout:
-                if process.poll() is not None:
-                    remaining = process.stdout.read()
-                    if remaining:
-                        buffer += remaining.decode("utf-8", errors="replace")
-                    break
-
-                ready, _, _ = select.select([process.stdout], [], [], 1.0)
-                if not ready:
-                    continue
-
-                chunk = os.read(process.stdout.fileno(), 8192)
-                if not chunk:
-                    break
-                buffer += chunk.decode("utf-8", errors="replace")
-
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        event = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
-
-                    # Early detection via stream events
-                    if event.get("type") == "stream_event":
-                        se = event.get("event", {})
-                        se_type = se.get("type", "")
-
-                        if se_type == "content_block_start":
-                            cb = se.get("content_block", {})
-                            if cb.get("type") == "tool_use":
-                                tool_name = cb.get("name", "")
-                                if tool_name in ("Skill", "Read"):
-                                    pending_tool_name = tool_name
-                                    accumulated_json = ""
-                                else:
-                                    return False
-
-                        elif se_type == "content_block_delta" and pending_tool_name:
-                            delta = se.get("delta", {})
-                            if delta.get("type") == "input_json_delta":
-                                accumulated_json += delta.get("partial_json", "")
-                                if clean_name in accumulated_json:
-                                    return True
-
-                        elif se_type in ("content_block_stop", "message_stop"):
-                            if pending_tool_name:
-                                return clean_name in accumulated_json
-                            if se_type == "message_stop":
-                                return False
-
-                    # Fallback: full assistant message
-                    elif event.get("type") == "assistant":
-                        message = event.get("message", {})
-                        for content_item in message.get("content", []):
-                            if content_item.get("type") != "tool_use":
-                                continue
-                            tool_name = content_item.get("name", "")
-                            tool_input = content_item.get("input", {})
-                            if tool_name == "Skill" and clean_name in tool_input.get("skill", ""):
-                                triggered = True
-                            elif tool_name == "Read" and clean_name in tool_input.get("file_path", ""):
-                                triggered = True
-                            return triggered
-
-                    elif event.get("type") == "result":
-                        return triggered
+            triggered = _watch_stream(process, clean_name, timeout, stream_usage)
+            tracing.instant("decision", cat="eval", triggered=triggered)
+            return triggered
         finally:
             # Clean up process on any exit path (return, exception, timeout)
             if process.poll() is None:
-                process.kill()
-                process.wait()
-
-        return triggered
+                with tracing.span("kill", cat="eval"):
+                    process.kill()
+                    process.wait()
     finally:
         if command_file.exists():
             command_file.unlink()
 
 
+def _watch_stream(process: subprocess.Popen, clean_name: str, timeout: int, stream_usage: StreamUsage) -> bool:
+    """Read the stream-json output until the trigger decision is known."""
+    triggered = False
+    start_time = time.time()
+    buffer = ""
+    # Track state for stream event detection
+    pending_tool_name = None
+    accumulated_json = ""
+    seen_first_event = False
+
+    while time.time() - start_time < timeout:
+        if process.poll() is not None:
+            remaining = process.stdout.read()
+            if remaining:
+                buffer += remaining.decode("utf-8", errors="replace")
+            break
+
+        ready, _, _ = select.select([process.stdout], [], [], 1.0)
+        if not ready:
+            continue
+
+        chunk = os.read(process.stdout.fileno(), 8192)
+        if not chunk:
+            break
+        buffer += chunk.decode("utf-8", errors="replace")
+
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            if not seen_first_event:
+                seen_first_event = True
+                tracing.instant("first_event", cat="eval", type=event.get("type", ""))
+            stream_usage.update(event)
+
+            # Early detection via stream events
+            if event.get("type") == "stream_event":
+                se = event.get("event", {})
+                se_type = se.get("type", "")
+
+                if se_type == "content_block_start":
+                    cb = se.get("content_block", {})
+                    if cb.get("type") == "tool_use":
+                        tool_name = cb.get("name", "")
+                        if tool_name in ("Skill", "Read"):
+                            pending_tool_name = tool_name
+                            accumulated_json = ""
+                        else:
+                            return False
+
+                elif se_type == "content_block_delta" and pending_tool_name:
+                    delta = se.get("delta", {})
+                    if delta.get("type") == "input_json_delta":
+                        accumulated_json += delta.get("partial_json", "")
+                        if clean_name in accumulated_json:
+                            return True
+
+                elif se_type in ("content_block_stop", "message_stop"):
+                    if pending_tool_name:
+                        return clean_name in accumulated_json
+                    if se_type == "message_stop":
+                        return False
+
+            # Fallback: full assistant message
+            elif event.get("type") == "assistant":
+                message = event.get("message", {})
+                for content_item in message.get("content", []):
+                    if content_item.get("type") != "tool_use":
+                        continue
+                    tool_name = content_item.get("name", "")
+                    tool_input = content_item.get("input", {})
+                    if tool_name == "Skill" and clean_name in tool_input.get("skill", ""):
+                        triggered = True
+                    elif tool_name == "Read" and clean_name in tool_input.get("file_path", ""):
+                        triggered = True
+                    return triggered
+
+            elif event.get("type") == "result":
+                return triggered
+
+    return triggered
+
+
 def run_eval(
     eval_set: list[dict],
     skill_name: str,
@@ -195,7 +239,10 @@ def run_eval(
     """Run the full eval set and return results."""
     results = []
 
-    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+    with tracing.span("eval_sweep", cat="eval", queries=len(eval_set), runs_per_query=runs_per_query), \
+            ProcessPoolExecutor(
+                max_workers=num_workers, initializer=_init_worker, initargs=(tracing.current_parent(),)
+            ) as executor:
         future_to_info = {}
         for item in eval_set:
             for run_idx in range(runs_per_query):
@@ -212,6 +259,7 @@ def run_eval(
 
         query_triggers: dict[str, list[bool]] = {}
         query_items: dict[str, dict] = {}
+        run_usages: list[dict] = []
         for future in as_completed(future_to_info):
             item, _ = future_to_info[future]
             query = item["query"]
@@ -219,7 +267,9 @@ def run_eval(
             if query not in query_triggers:
                 query_triggers[query] = []
             try:
-                query_triggers[query].append(future.result())
+                triggered, usage = future.result()
+                query_triggers[query].append(triggered)
+                run_usages.append(usage)
             except Exception as e:
                 print(f"Warning: query failed: {e}", file=sys.stderr)
                 query_triggers[query].append(False)
@@ -253,6 +303,7 @@ def run_eval(
             "passed": passed,
             "failed": total - passed,
         },
+        "usage": sum_usage(run_usages),
     }
 
 
@@ -267,6 +318,8 @@ def main():
     parser.add_argument("--trigger-threshold", type=float, default=0.5, help="Trigger rate threshold")
     parser.add_argument("--model", default=None, help="Model to use for claude -p (default: user's configured model)")
     parser.add_argument("--verbose", action="store_true", help="Print progress to stderr")
+    parser.add_argument("--trace", type=Path, default=None, help="Write a Chrome trace-event JSON file (open in Perfetto)")
+    parser.add_argument("--trace-otlp", default=None, help="Also export spans as OTLP/JSON to this file or collector URL")
     args = parser.parse_args()
 
     eval_set = json.loads(Path(args.eval_set).read_text())
@@ -283,6 +336,9 @@ def main():
     if args.verbose:
         print(f"Evaluating: {description}", file=sys.stderr)
 
+    if args.trace or args.trace_otlp:
+        tracing.start_trace("run_eval")
+
     output = run_eval(
         eval_set=eval_set,
         skill_name=name,
@@ -298,13 +354,18 @@ def main():
     if args.verbose:
         summary = output["summary"]
         print(f"Results: {summary['passed']}/{summary['total']} passed", file=sys.stderr)
+        usage = output["usage"]
+        print(f"Tokens: {usage['input_tokens']} in / {usage['output_tokens']} out, cost ${usage['cost_usd']:.4f}", file=sys.stderr)
         for r in output["results"]:
             status = "PASS" if r["pass"] else "FAIL"
             rate_str = f"{r['triggers']}/{r['runs']}"
             print(f"  [{status}] rate={rate_str} expected={r['should_trigger']}: {r['query'][:70]}", file=sys.stderr)
 
     print(json.dumps(output, indent=2))
+    tracing.finish_trace(args.trace, args.trace_otlp)
 
 
 if __name__ == "__main__":
-    main()
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "run_eval")
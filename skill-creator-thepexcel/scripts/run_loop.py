@@ -7,22 +7,29 @@ overfitting.
 """
 
 import argparse
+import contextlib
 import json
 import random
 import sys
 import tempfile
 import time
-import webbrowser
 from pathlib import Path
 
-import anthropic
-
-from scripts.generate_report import generate_html
+from scripts import tracing
 from scripts.improve_description import improve_description
 from scripts.run_eval import find_project_root, run_eval
+from scripts.token_usage import add_usage, empty_usage, sum_usage, total_tokens
+from scripts.transcript_store import TranscriptStore
 from scripts.utils import parse_skill_md
 
 
+def write_report(path: Path, output: dict, auto_refresh: bool, skill_name: str) -> None:
+    """Render the HTML report to path (the report generator is only imported when one is written)."""
+    from scripts.generate_report import generate_html
+
+    path.write_text(generate_html(output, auto_refresh=auto_refresh, skill_name=skill_name))
+
+
 def split_eval_set(eval_set: list[dict], holdout: float, seed: int = 42) -> tuple[list[dict], list[dict]]:
     """Split eval set into train and test sets, stratified by should_trigger."""
     random.seed(seed)
@@ -60,8 +67,15 @@ def run_loop(
     verbose: bool,
     live_report_path: Path | None = None,
     log_dir: Path | None = None,
+    transcript_store: TranscriptStore | None = None,
+    run_id: str | None = None,
+    max_tokens_budget: int | None = None,
 ) -> dict:
-    """Run the eval + improvement loop."""
+    """Run the eval + improvement loop.
+
+    If max_tokens_budget is set, the loop stops once the tokens used by eval
+    runs and API calls so far reach it.
+    """
     project_root = find_project_root()
     name, original_description, content = parse_skill_md(skill_path)
     current_description = description_override or original_description
@@ -75,150 +89,191 @@ def run_loop(
         train_set = eval_set
         test_set = []
 
+    # Imported here so importing run_loop (or --help) skips the anthropic/httpx/pydantic stack
+    import anthropic
+
     client = anthropic.Anthropic()
     history = []
     exit_reason = "unknown"
-
-    for iteration in range(1, max_iterations + 1):
-        if verbose:
-            print(f"\n{'='*60}", file=sys.stderr)
-            print(f"Iteration {iteration}/{max_iterations}", file=sys.stderr)
-            print(f"Description: {current_description}", file=sys.stderr)
-            print(f"{'='*60}", file=sys.stderr)
-
-        # Evaluate train + test together in one batch for parallelism
-        all_queries = train_set + test_set
-        t0 = time.time()
-        all_results = run_eval(
-            eval_set=all_queries,
-            skill_name=name,
-            description=current_description,
-            num_workers=num_workers,
-            timeout=timeout,
-            project_root=project_root,
-            runs_per_query=runs_per_query,
-            trigger_threshold=trigger_threshold,
-            model=model,
-        )
-        eval_elapsed = time.time() - t0
-
-        # Split results back into train/test by matching queries
-        train_queries_set = {q["query"] for q in train_set}
-        train_result_list = [r for r in all_results["results"] if r["query"] in train_queries_set]
-        test_result_list = [r for r in all_results["results"] if r["query"] not in train_queries_set]
-
-        train_passed = sum(1 for r in train_result_list if r["pass"])
-        train_total = len(train_result_list)
-        train_summary = {"passed": train_passed, "failed": train_total - train_passed, "total": train_total}
-        train_results = {"results": train_result_list, "summary": train_summary}
-
-        if test_set:
-            test_passed = sum(1 for r in test_result_list if r["pass"])
-            test_total = len(test_result_list)
-            test_summary = {"passed": test_passed, "failed": test_total - test_passed, "total": test_total}
-            test_results = {"results": test_result_list, "summary": test_summary}
-        else:
-            test_results = None
-            test_summary = None
-
-        history.append({
-            "iteration": iteration,
-            "description": current_description,
-            "train_passed": train_summary["passed"],
-            "train_failed": train_summary["failed"],
-            "train_total": train_summary["total"],
-            "train_results": train_results["results"],
-            "test_passed": test_summary["passed"] if test_summary else None,
-            "test_failed": test_summary["failed"] if test_summary else None,
-            "test_total": test_summary["total"] if test_summary else None,
-            "test_results": test_results["results"] if test_results else None,
-            # For backward compat with report generator
-            "passed": train_summary["passed"],
-            "failed": train_summary["failed"],
-            "total": train_summary["total"],
-            "results": train_results["results"],
-        })
-
-        # Write live report if path provided
-        if live_report_path:
-            partial_output = {
-                "original_description": original_description,
-                "best_description": current_description,
-                "best_score": "in progress",
-                "iterations_run": len(history),
-                "holdout": holdout,
-                "train_size": len(train_set),
-                "test_size": len(test_set),
-                "history": history,
-            }
-            live_report_path.write_text(generate_html(partial_output, auto_refresh=True, skill_name=name))
-
-        if verbose:
-            def print_eval_stats(label, results, elapsed):
-                pos = [r for r in results if r["should_trigger"]]
-                neg = [r for r in results if not r["should_trigger"]]
-                tp = sum(r["triggers"] for r in pos)
-                pos_runs = sum(r["runs"] for r in pos)
-                fn = pos_runs - tp
-                fp = sum(r["triggers"] for r in neg)
-                neg_runs = sum(r["runs"] for r in neg)
-                tn = neg_runs - fp
-                total = tp + tn + fp + fn
-                precision = tp / (tp + fp) if (tp + fp) > 0 else 1.0
-                recall = tp / (tp + fn) if (tp + fn) > 0 else 1.0
-                accuracy = (tp + tn) / total if total > 0 else 0.0
-                print(f"{label}: {tp+tn}/{total} correct, precision={precision:.0%} recall={recall:.0%} accuracy={accuracy:.0%} ({elapsed:.1f}s)", file=sys.stderr)
-                for r in results:
-                    status = "PASS" if r["pass"] else "FAIL"
-                    rate_str = f"{r['triggers']}/{r['runs']}"
-                    print(f"  [{status}] rate={rate_str} expected={r['should_trigger']}: {r['query'][:60]}", file=sys.stderr)
-
-            print_eval_stats("Train", train_results["results"], eval_elapsed)
-            if test_summary:
-                print_eval_stats("Test ", test_results["results"], 0)
-
-        if train_summary["failed"] == 0:
-            exit_reason = f"all_passed (iteration {iteration})"
+    usage_so_far = empty_usage()
+
+    def over_budget() -> bool:
+        return max_tokens_budget is not None and total_tokens(usage_so_far) >= max_tokens_budget
+
+    # One span per iteration, closed when the next one starts or the loop ends,
+    # including by an exception
+    with contextlib.ExitStack() as iteration_span:
+        for iteration in range(1, max_iterations + 1):
+            iteration_span.close()
+            if over_budget():
+                exit_reason = f"token_budget ({total_tokens(usage_so_far)}/{max_tokens_budget})"
+                if verbose:
+                    print(f"\nToken budget reached before iteration {iteration}.", file=sys.stderr)
+                break
+
+            iteration_args = iteration_span.enter_context(
+                tracing.span("loop_iteration", cat="loop", iteration=iteration)
+            )
             if verbose:
-                print(f"\nAll train queries passed on iteration {iteration}!", file=sys.stderr)
-            break
+                print(f"\n{'='*60}", file=sys.stderr)
+                print(f"Iteration {iteration}/{max_iterations}", file=sys.stderr)
+                print(f"Description: {current_description}", file=sys.stderr)
+                print(f"{'='*60}", file=sys.stderr)
+
+            # Evaluate train + test together in one batch for parallelism
+            all_queries = train_set + test_set
+            t0 = time.time()
+            all_results = run_eval(
+                eval_set=all_queries,
+                skill_name=name,
+                description=current_description,
+                num_workers=num_workers,
+                timeout=timeout,
+                project_root=project_root,
+                runs_per_query=runs_per_query,
+                trigger_threshold=trigger_threshold,
+                model=model,
+            )
+            eval_elapsed = time.time() - t0
+            add_usage(usage_so_far, all_results["usage"])
+
+            # Split results back into train/test by matching queries
+            train_queries_set = {q["query"] for q in train_set}
+            train_result_list = [r for r in all_results["results"] if r["query"] in train_queries_set]
+            test_result_list = [r for r in all_results["results"] if r["query"] not in train_queries_set]
+
+            train_passed = sum(1 for r in train_result_list if r["pass"])
+            train_total = len(train_result_list)
+            train_summary = {"passed": train_passed, "failed": train_total - train_passed, "total": train_total}
+            train_results = {"results": train_result_list, "summary": train_summary}
+
+            if test_set:
+                test_passed = sum(1 for r in test_result_list if r["pass"])
+                test_total = len(test_result_list)
+                test_summary = {"passed": test_passed, "failed": test_total - test_passed, "total": test_total}
+                test_results = {"results": test_result_list, "summary": test_summary}
+            else:
+                test_results = None
+                test_summary = None
+
+            history.append({
+                "iteration": iteration,
+                "description": current_description,
+                "train_passed": train_summary["passed"],
+                "train_failed": train_summary["failed"],
+                "train_total": train_summary["total"],
+                "train_results": train_results["results"],
+                "test_passed": test_summary["passed"] if test_summary else None,
+                "test_failed": test_summary["failed"] if test_summary else None,
+                "test_total": test_summary["total"] if test_summary else None,
+                "test_results": test_results["results"] if test_results else None,
+                # For backward compat with report generator
+                "passed": train_summary["passed"],
+                "failed": train_summary["failed"],
+                "total": train_summary["total"],
+                "results": train_results["results"],
+                "usage": {"eval": all_results["usage"], "improve": empty_usage()},
+            })
+
+            # Write live report if path provided
+            if live_report_path:
+                partial_output = {
+                    "original_description": original_description,
+                    "best_description": current_description,
+                    "best_score": "in progress",
+                    "iterations_run": len(history),
+                    "holdout": holdout,
+                    "train_size": len(train_set),
+                    "test_size": len(test_set),
+                    "cost_summary": build_cost_summary(history, max_tokens_budget),
+                    "history": history,
+                }
+                write_report(live_report_path, partial_output, auto_refresh=True, skill_name=name)
 
-        if iteration == max_iterations:
-            exit_reason = f"max_iterations ({max_iterations})"
             if verbose:
-                print(f"\nMax iterations reached ({max_iterations}).", file=sys.stderr)
-            break
-
-        # Improve the description based on train results
-        if verbose:
-            print(f"\nImproving description...", file=sys.stderr)
-
-        t0 = time.time()
-        # Strip test scores from history so improvement model can't see them
-        blinded_history = [
-            {k: v for k, v in h.items() if not k.startswith("test_")}
-            for h in history
-        ]
-        new_description = improve_description(
-            client=client,
-            skill_name=name,
-            skill_content=content,
-            current_description=current_description,
-            eval_results=train_results,
-            history=blinded_history,
-            model=model,
-            log_dir=log_dir,
-            iteration=iteration,
-        )
-        improve_elapsed = time.time() - t0
+                def print_eval_stats(label, results, elapsed):
+                    pos = [r for r in results if r["should_trigger"]]
+                    neg = [r for r in results if not r["should_trigger"]]
+                    tp = sum(r["triggers"] for r in pos)
+                    pos_runs = sum(r["runs"] for r in pos)
+                    fn = pos_runs - tp
+                    fp = sum(r["triggers"] for r in neg)
+                    neg_runs = sum(r["runs"] for r in neg)
+                    tn = neg_runs - fp
+                    total = tp + tn + fp + fn
+                    precision = tp / (tp + fp) if (tp + fp) > 0 else 1.0
+                    recall = tp / (tp + fn) if (tp + fn) > 0 else 1.0
+                    accuracy = (tp + tn) / total if total > 0 else 0.0
+                    print(f"{label}: {tp+tn}/{total} correct, precision={precision:.0%} recall={recall:.0%} accuracy={accuracy:.0%} ({elapsed:.1f}s)", file=sys.stderr)
+                    for r in results:
+                        status = "PASS" if r["pass"] else "FAIL"
+                        rate_str = f"{r['triggers']}/{r['runs']}"
+                        print(f"  [{status}] rate={rate_str} expected={r['should_trigger']}: {r['query'][:60]}", file=sys.stderr)
+
+                print_eval_stats("Train", train_results["results"], eval_elapsed)
+                if test_summary:
+                    print_eval_stats("Test ", test_results["results"], 0)
+
+            iteration_args["train_passed"] = train_summary["passed"]
+            iteration_args["eval_seconds"] = round(eval_elapsed, 2)
+
+            if train_summary["failed"] == 0:
+                exit_reason = f"all_passed (iteration {iteration})"
+                if verbose:
+                    print(f"\nAll train queries passed on iteration {iteration}!", file=sys.stderr)
+                break
+
+            if iteration == max_iterations:
+                exit_reason = f"max_iterations ({max_iterations})"
+                if verbose:
+                    print(f"\nMax iterations reached ({max_iterations}).", file=sys.stderr)
+                break
+
+            if over_budget():
+                exit_reason = f"token_budget ({total_tokens(usage_so_far)}/{max_tokens_budget})"
+                if verbose:
+                    print(f"\nToken budget reached ({total_tokens(usage_so_far)}/{max_tokens_budget}).", file=sys.stderr)
+                break
+
+            # Improve the description based on train results
+            if verbose:
+                print(f"\nImproving description...", file=sys.stderr)
+
+            t0 = time.time()
+            # Strip test scores from history so improvement model can't see them
+            blinded_history = [
+                {k: v for k, v in h.items() if not k.startswith("test_")}
+                for h in history
+            ]
+            with tracing.span("improve", cat="loop", iteration=iteration):
+                new_description = improve_description(
+                    client=client,
+                    skill_name=name,
+                    skill_content=content,
+                    current_description=current_description,
+                    eval_results=train_results,
+                    history=blinded_history,
+                    model=model,
+                    log_dir=log_dir,
+                    iteration=iteration,
+                    transcript_store=transcript_store,
+                    run_id=run_id,
+                    usage_totals=history[-1]["usage"]["improve"],
+                )
+            improve_elapsed = time.time() - t0
+            add_usage(usage_so_far, history[-1]["usage"]["improve"])
 
-        if verbose:
-            print(f"Proposed ({improve_elapsed:.1f}s): {new_description}", file=sys.stderr)
+            if verbose:
+                print(f"Proposed ({improve_elapsed:.1f}s): {new_description}", file=sys.stderr)
 
-        current_description = new_description
+            current_description = new_description
 
     # Find the best iteration by TEST score (or train if no test set)
-    if test_set:
+    if not history:
+        # Nothing was evaluated, so the original description stands unscored
+        best = None
+        best_score = None
+    elif test_set:
         best = max(history, key=lambda h: h["test_passed"] or 0)
         best_score = f"{best['test_passed']}/{best['test_total']}"
     else:
@@ -227,24 +282,66 @@ def run_loop(
 
     if verbose:
         print(f"\nExit reason: {exit_reason}", file=sys.stderr)
-        print(f"Best score: {best_score} (iteration {best['iteration']})", file=sys.stderr)
+        if best:
+            print(f"Best score: {best_score} (iteration {best['iteration']})", file=sys.stderr)
+        else:
+            print("No iterations ran.", file=sys.stderr)
+        print(f"Tokens used: {total_tokens(usage_so_far)} (cost ${usage_so_far['cost_usd']:.4f}, {usage_so_far['unpriced_calls']} unpriced calls)", file=sys.stderr)
 
     return {
         "exit_reason": exit_reason,
         "original_description": original_description,
-        "best_description": best["description"],
+        "best_description": best["description"] if best else original_description,
         "best_score": best_score,
-        "best_train_score": f"{best['train_passed']}/{best['train_total']}",
-        "best_test_score": f"{best['test_passed']}/{best['test_total']}" if test_set else None,
+        "best_train_score": f"{best['train_passed']}/{best['train_total']}" if best else None,
+        "best_test_score": f"{best['test_passed']}/{best['test_total']}" if best and test_set else None,
         "final_description": current_description,
         "iterations_run": len(history),
         "holdout": holdout,
         "train_size": len(train_set),
         "test_size": len(test_set),
+        "cost_summary": build_cost_summary(history, max_tokens_budget),
         "history": history,
     }
 
 
+def build_cost_summary(history: list[dict], max_tokens_budget: int | None = None) -> dict:
+    """Aggregate token usage per iteration (one description each) and for the whole run."""
+    eval_usage = sum_usage(h["usage"]["eval"] for h in history if "usage" in h)
+    improve_usage = sum_usage(h["usage"]["improve"] for h in history if "usage" in h)
+    total = sum_usage([eval_usage, improve_usage])
+    per_iteration = []
+    for h in history:
+        if "usage" not in h:
+            continue
+        iteration_total = sum_usage([h["usage"]["eval"], h["usage"]["improve"]])
+        per_iteration.append({
+            "iteration": h["iteration"],
+            "description": h["description"],
+            "eval_tokens": total_tokens(h["usage"]["eval"]),
+            "improve_tokens": total_tokens(h["usage"]["improve"]),
+            "total_tokens": total_tokens(iteration_total),
+            "cost_usd": iteration_total["cost_usd"],
+        })
+    return {
+        "total_tokens": total_tokens(total),
+        "cost_usd": total["cost_usd"],
+        "unpriced_calls": total["unpriced_calls"],
+        "max_tokens_budget": max_tokens_budget,
+        "total": total,
+        "eval": eval_usage,
+        "improve": improve_usage,
+        "per_iteration": per_iteration,
+    }
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run eval + improve loop")
     parser.add_argument("--eval-set", required=True, help="Path to eval set JSON file")
@@ -260,6 +357,10 @@ def main():
     parser.add_argument("--verbose", action="store_true", help="Print progress to stderr")
     parser.add_argument("--report", default="auto", help="Generate HTML report at this path (default: 'auto' for temp file, 'none' to disable)")
     parser.add_argument("--results-dir", default=None, help="Save all outputs (results.json, report.html, log.txt) to a timestamped subdirectory here")
+    parser.add_argument("--max-tokens-budget", type=_positive_int, default=None, help="Stop the loop once eval runs and API calls have used this many tokens (input + output + cache)")
+    parser.add_argument("--trace", type=Path, default=None, help="Write a Chrome trace-event JSON file of loop, eval and API spans (open in Perfetto)")
+    parser.add_argument("--trace-otlp", default=None, help="Also export spans as OTLP/JSON to this file or collector URL")
+    parser.add_argument("--transcript-store", default=None, help="Append improve transcripts to this compressed, indexed store (default: <results-dir>/transcripts; 'none' to write plain JSON logs)")
     args = parser.parse_args()
 
     eval_set = json.loads(Path(args.eval_set).read_text())
@@ -280,6 +381,8 @@ def main():
             live_report_path = Path(args.report)
         # Open the report immediately so the user can watch
         live_report_path.write_text("<html><body><h1>Starting optimization loop...</h1><meta http-equiv='refresh' content='5'></body></html>")
+        import webbrowser
+
         webbrowser.open(str(live_report_path))
     else:
         live_report_path = None
@@ -294,6 +397,18 @@ def main():
 
     log_dir = results_dir / "logs" if results_dir else None
 
+    # Transcripts from every run share one store so prompt text is deduplicated across runs
+    if args.transcript_store and args.transcript_store != "none":
+        transcript_store = TranscriptStore(Path(args.transcript_store))
+    elif args.transcript_store is None and args.results_dir:
+        transcript_store = TranscriptStore(Path(args.results_dir) / "transcripts")
+    else:
+        transcript_store = None
+    run_id = f"{skill_path.name}_{time.strftime('%Y%m%d_%H%M%S')}"
+
+    if args.trace or args.trace_otlp:
+        tracing.start_trace("run_loop")
+
     output = run_loop(
         eval_set=eval_set,
         skill_path=skill_path,
@@ -308,7 +423,12 @@ def main():
         verbose=args.verbose,
         live_report_path=live_report_path,
         log_dir=log_dir,
+        transcript_store=transcript_store,
+        run_id=run_id,
+        max_tokens_budget=args.max_tokens_budget,
     )
+    if transcript_store:
+        transcript_store.close()
 
     # Save JSON output
     json_output = json.dumps(output, indent=2)
@@ -318,15 +438,21 @@ def main():
 
     # Write final HTML report (without auto-refresh)
     if live_report_path:
-        live_report_path.write_text(generate_html(output, auto_refresh=False, skill_name=name))
+        write_report(live_report_path, output, auto_refresh=False, skill_name=name)
         print(f"\nReport: {live_report_path}", file=sys.stderr)
 
     if results_dir and live_report_path:
-        (results_dir / "report.html").write_text(generate_html(output, auto_refresh=False, skill_name=name))
+        write_report(results_dir / "report.html", output, auto_refresh=False, skill_name=name)
 
     if results_dir:
         print(f"Results saved to: {results_dir}", file=sys.stderr)
 
+    tracing.finish_trace(args.trace, args.trace_otlp)
+    if args.trace:
+        print(f"Trace: {args.trace}", file=sys.stderr)
+
 
 if __name__ == "__main__":
-    main()
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "run_loop")
@@ -0,0 +1,195 @@
+"""Bootstrap confidence intervals, permutation tests and effect sizes.
+
+compare_samples(a, b) answers "is config A really different from config B,
+or is that just noise?" for one metric:
+
+- delta: mean(a) - mean(b)
+- ci_low / ci_high: percentile bootstrap CI of that difference, resampling
+  each config independently; exact (every resample enumerated) when there
+  are fewer distinct resamples than the resample budget
+- p_value: two-sided permutation test on the difference of means; exact
+  (every relabelling enumerated) when that is cheaper than sampling, which
+  covers the usual 3-runs-per-config case
+- hedges_g: standardized mean difference with small-sample correction
+- cliffs_delta: P(a > b) - P(a < b), robust to outliers and skew
+
+NumPy is used when installed (vectorized, chunked to bound memory), with a
+pure-Python fallback giving the same estimates. Both cap resamples x values
+so very large inputs use fewer resamples (never fewer than MIN_RESAMPLES),
+and report how many they used. NumPy is imported on first use so it never
+costs CLI startup.
+"""
+
+import itertools
+import math
+import random
+from bisect import bisect_left, bisect_right
+
+from scripts.streaming_stats import interpolate_quantile
+
+DEFAULT_RESAMPLES = 10_000
+CONFIDENCE = 0.95
+
+# Work budget (resamples x values) before resamples are reduced
+PURE_PYTHON_BUDGET = 2_000_000
+NUMPY_BUDGET = 10_000_000
+MIN_RESAMPLES = 1000
+# NumPy chunk size in array elements, to keep resample matrices small
+NUMPY_CHUNK_ELEMENTS = 2_000_000
+
+_numpy = None
+
+
+def _np():
+    """NumPy module, or None if it isn't installed. Imported once, on first use."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+def _mean(values: list[float]) -> float:
+    return sum(values) / len(values)
+
+
+def _resample_budget(resamples: int, n: int) -> int:
+    budget = NUMPY_BUDGET if _np() is not None else PURE_PYTHON_BUDGET
+    return min(resamples, max(MIN_RESAMPLES, budget // max(n, 1)))
+
+
+def _exact_bootstrap_size(n_a: int, n_b: int) -> int:
+    return n_a ** n_a * n_b ** n_b
+
+
+def bootstrap_ci(a: list[float], b: list[float], resamples: int = DEFAULT_RESAMPLES, seed: int = 0) -> tuple[float, float]:
+    """Percentile bootstrap CI for mean(a) - mean(b)."""
+    alpha = (1 - CONFIDENCE) / 2
+    if _exact_bootstrap_size(len(a), len(b)) <= resamples:
+        # Every ordered resample is equally likely, so enumerate them all
+        means_a = [sum(t) / len(a) for t in itertools.product(a, repeat=len(a))]
+        means_b = [sum(t) / len(b) for t in itertools.product(b, repeat=len(b))]
+        diffs = sorted(x - y for x in means_a for y in means_b)
+        return interpolate_quantile(diffs, alpha), interpolate_quantile(diffs, 1 - alpha)
+
+    np = _np()
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        arr_a, arr_b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+        rows = max(1, NUMPY_CHUNK_ELEMENTS // (len(a) + len(b)))
+        diffs = []
+        for start in range(0, resamples, rows):
+            size = min(rows, resamples - start)
+            means_a = arr_a[rng.integers(0, len(a), size=(size, len(a)))].mean(axis=1)
+            means_b = arr_b[rng.integers(0, len(b), size=(size, len(b)))].mean(axis=1)
+            diffs.append(means_a - means_b)
+        diffs = np.concatenate(diffs)
+        low, high = np.quantile(diffs, [alpha, 1 - alpha])
+        return float(low), float(high)
+
+    rng = random.Random(seed)
+    n_a, n_b = len(a), len(b)
+    diffs = []
+    for _ in range(resamples):
+        diffs.append(sum(rng.choices(a, k=n_a)) / n_a - sum(rng.choices(b, k=n_b)) / n_b)
+    diffs.sort()
+    return interpolate_quantile(diffs, alpha), interpolate_quantile(diffs, 1 - alpha)
+
+
+def permutation_test(a: list[float], b: list[float], resamples: int = DEFAULT_RESAMPLES, seed: int = 0) -> tuple[float, bool]:
+    """Two-sided p-value for mean(a) != mean(b). Returns (p_value, exact)."""
+    pooled = list(a) + list(b)
+    n_a, n = len(a), len(a) + len(b)
+    observed = abs(_mean(a) - _mean(b))
+    total = sum(pooled)
+    # Tolerance so ties with the observed split count as "at least as extreme"
+    tolerance = 1e-12 * max(1.0, abs(observed))
+
+    if math.comb(n, n_a) <= resamples:
+        extreme = 0
+        count = 0
+        for idx in itertools.combinations(range(n), n_a):
+            sum_a = sum(pooled[i] for i in idx)
+            diff = sum_a / n_a - (total - sum_a) / (n - n_a)
+            extreme += abs(diff) >= observed - tolerance
+            count += 1
+        return extreme / count, True
+
+    np = _np()
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        arr = np.asarray(pooled, dtype=float)
+        rows = max(1, NUMPY_CHUNK_ELEMENTS // n)
+        extreme = 0
+        for start in range(0, resamples, rows):
+            size = min(rows, resamples - start)
+            shuffled = rng.permuted(np.broadcast_to(arr, (size, n)), axis=1)
+            sum_a = shuffled[:, :n_a].sum(axis=1)
+            diffs = sum_a / n_a - (total - sum_a) / (n - n_a)
+            extreme += int((np.abs(diffs) >= observed - tolerance).sum())
+    else:
+        rng = random.Random(seed)
+        extreme = 0
+        for _ in range(resamples):
+            # A random relabelling only needs which values land in group a
+            sum_a = sum(rng.sample(pooled, n_a))
+            diff = sum_a / n_a - (total - sum_a) / (n - n_a)
+            extreme += abs(diff) >= observed - tolerance
+    # +1 so a sampled test never reports p = 0
+    return (extreme + 1) / (resamples + 1), False
+
+
+def hedges_g(a: list[float], b: list[float]) -> float | None:
+    """Bias-corrected standardized mean difference; None when undefined."""
+    n_a, n_b = len(a), len(b)
+    if n_a < 2 or n_b < 2:
+        return None
+    mean_a, mean_b = _mean(a), _mean(b)
+    var_a = sum((x - mean_a) ** 2 for x in a) / (n_a - 1)
+    var_b = sum((x - mean_b) ** 2 for x in b) / (n_b - 1)
+    pooled_sd = math.sqrt(((n_a - 1) * var_a + (n_b - 1) * var_b) / (n_a + n_b - 2))
+    if pooled_sd == 0:
+        return None
+    correction = 1 - 3 / (4 * (n_a + n_b) - 9)
+    return (mean_a - mean_b) / pooled_sd * correction
+
+
+def cliffs_delta(a: list[float], b: list[float]) -> float:
+    """P(a > b) - P(a < b) over all pairs, in O(n log n)."""
+    ordered_b = sorted(b)
+    greater = less = 0
+    for x in a:
+        less += len(ordered_b) - bisect_right(ordered_b, x)
+        greater += bisect_left(ordered_b, x)
+    return (greater - less) / (len(a) * len(b))
+
+
+def compare_samples(a: list[float], b: list[float], resamples: int = DEFAULT_RESAMPLES, seed: int = 0) -> dict | None:
+    """All statistics for mean(a) - mean(b); None if either side is empty."""
+    if not a or not b:
+        return None
+    budget = _resample_budget(resamples, len(a) + len(b))
+    ci_low, ci_high = bootstrap_ci(a, b, budget, seed)
+    p_value, exact = permutation_test(a, b, budget, seed)
+    g = hedges_g(a, b)
+    return {
+        "n_a": len(a),
+        "n_b": len(b),
+        "delta": round(_mean(a) - _mean(b), 4),
+        "ci_low": round(ci_low, 4),
+        "ci_high": round(ci_high, 4),
+        "confidence": CONFIDENCE,
+        "ci_exact": _exact_bootstrap_size(len(a), len(b)) <= budget,
+        "p_value": round(p_value, 4),
+        "p_exact": exact,
+        "hedges_g": round(g, 3) if g is not None else None,
+        "cliffs_delta": round(cliffs_delta(a, b), 3),
+        "resamples": budget,
+    }
+
+
+def backend() -> str:
+    return "numpy" if _np() is not None else "python"
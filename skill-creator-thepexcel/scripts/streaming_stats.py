@@ -0,0 +1,145 @@
+"""Mergeable streaming statistics for benchmark aggregation.
+
+RunningStats keeps count, mean and variance (Welford's online algorithm),
+min and max, plus a bounded reservoir sample for percentiles. Two
+accumulators built on different shards combine exactly for count, mean,
+variance, min and max (Chan et al.'s parallel update); the reservoir is
+exact until it holds more than RESERVOIR_SIZE values and a proportional
+random sample after that.
+
+Accumulators serialize with to_dict()/from_dict(), which is what
+aggregate_benchmark --partial writes and --merge reads.
+"""
+
+import math
+import random
+
+RESERVOIR_SIZE = 1024
+PERCENTILES = (50, 90, 95, 99)
+
+
+def interpolate_quantile(ordered: list[float], q: float) -> float:
+    """Linearly interpolated quantile q (0..1) of an already sorted, non-empty list."""
+    pos = q * (len(ordered) - 1)
+    lower = math.floor(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+class RunningStats:
+    """Online count/mean/variance/min/max with a reservoir for percentiles."""
+
+    def __init__(self, reservoir_size: int = RESERVOIR_SIZE, seed: int = 0):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.reservoir: list[float] = []
+        self.reservoir_size = reservoir_size
+        self._rng = random.Random(seed)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        # Algorithm R: every value seen so far is equally likely to be kept
+        if len(self.reservoir) < self.reservoir_size:
+            self.reservoir.append(value)
+        else:
+            slot = self._rng.randrange(self.count)
+            if slot < self.reservoir_size:
+                self.reservoir[slot] = value
+
+    def extend(self, values) -> "RunningStats":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Fold another accumulator into this one (in place) and return self."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            self.reservoir = list(other.reservoir)
+            return self
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        combined = self.reservoir + other.reservoir
+        if len(combined) > self.reservoir_size:
+            # Keep each side in proportion to how many values it represents
+            from_self = round(self.reservoir_size * self.count / total)
+            from_self = min(from_self, len(self.reservoir))
+            from_other = min(self.reservoir_size - from_self, len(other.reservoir))
+            combined = self._rng.sample(self.reservoir, from_self) + self._rng.sample(other.reservoir, from_other)
+        self.reservoir = combined
+        self.count = total
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (n - 1)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(max(self.variance, 0.0))
+
+    def quantile(self, q: float) -> float:
+        """Linearly interpolated quantile of the reservoir (exact while it holds every value)."""
+        if not self.reservoir:
+            return 0.0
+        return interpolate_quantile(sorted(self.reservoir), q)
+
+    def percentiles(self, percentiles: tuple[int, ...] = PERCENTILES) -> dict:
+        """{"p50": ..., "p90": ...} from the reservoir, rounded like summary()."""
+        if not self.reservoir:
+            return {f"p{p}": 0.0 for p in percentiles}
+        ordered = sorted(self.reservoir)
+        return {f"p{p}": round(interpolate_quantile(ordered, p / 100), 4) for p in percentiles}
+
+    def summary(self) -> dict:
+        """mean/stddev/min/max rounded to 4 places, as in benchmark.json run_summary."""
+        if self.count == 0:
+            return {"mean": 0.0, "stddev": 0.0, "min": 0.0, "max": 0.0}
+        return {
+            "mean": round(self.mean, 4),
+            "stddev": round(self.stddev, 4),
+            "min": round(self.min, 4),
+            "max": round(self.max, 4),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "reservoir": self.reservoir,
+            "reservoir_size": self.reservoir_size,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunningStats":
+        stats = cls(data.get("reservoir_size", RESERVOIR_SIZE), seed=data.get("count", 0))
+        stats.count = data["count"]
+        stats.mean = data["mean"]
+        stats.m2 = data["m2"]
+        if stats.count:
+            stats.min = data["min"]
+            stats.max = data["max"]
+        stats.reservoir = list(data.get("reservoir", []))
+        return stats
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Stand-in for `claude -p` that speaks just enough stream-json for run_benchmark.
+
+Writes answer.txt into the run's outputs/ (the working directory is the run
+directory), then prints an assistant event and a final result event with
+fixed usage, so a benchmark can be run end to end without the real CLI:
+
+    python -m scripts.run_benchmark --skill-path ../my-skill --workspace /tmp/ws \\
+        --claude-bin scripts/testing/fake_claude.py
+
+A prompt containing FAKE_FAIL makes the run print to stderr and exit 2, for
+exercising the error path.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+USAGE = {
+    "input_tokens": 120,
+    "output_tokens": 30,
+    "cache_creation_input_tokens": 0,
+    "cache_read_input_tokens": 50,
+}
+COST_USD = 0.001
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake claude -p for testing")
+    parser.add_argument("-p", dest="prompt", required=True)
+    parser.add_argument("--output-format", default="text")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--permission-mode", default=None)
+    parser.add_argument("--add-dir", action="append", default=[])
+    parser.add_argument("--model", default=None)
+    args = parser.parse_args()
+
+    if "FAKE_FAIL" in args.prompt:
+        print("fake_claude: failing as asked", file=sys.stderr)
+        sys.exit(2)
+
+    outputs = Path("outputs")
+    outputs.mkdir(exist_ok=True)
+    (outputs / "answer.txt").write_text(args.prompt.split("Task:\n", 1)[-1].split("\n\n", 1)[0])
+
+    events = [
+        {"type": "system", "subtype": "init", "model": args.model or "fake"},
+        {
+            "type": "assistant",
+            "message": {"content": [
+                {"type": "tool_use", "name": "Write", "input": {"file_path": "outputs/answer.txt"}},
+                {"type": "text", "text": "Wrote outputs/answer.txt."},
+            ]},
+        },
+        {"type": "result", "subtype": "success", "result": "Done.", "usage": USAGE, "total_cost_usd": COST_USD},
+    ]
+    for event in events:
+        print(json.dumps(event), flush=True)
+
+
+if __name__ == "__main__":
+    main()
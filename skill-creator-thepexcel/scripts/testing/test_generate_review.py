@@ -0,0 +1,199 @@
+"""Review server building blocks: RunIndex, FeedbackStore and read_text_range."""
+
+import json
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "eval-viewer"))
+import generate_review as gr  # noqa: E402
+
+
+def _add_run(workspace: Path, eval_id: int, config: str, run: int, answer: str = "42") -> Path:
+    run_dir = workspace / f"eval-{eval_id}" / config / f"run-{run}"
+    (run_dir / "outputs").mkdir(parents=True)
+    (run_dir / "eval_metadata.json").write_text(json.dumps({"eval_id": eval_id, "prompt": f"Prompt {eval_id}"}))
+    (run_dir / "outputs" / "answer.txt").write_text(answer)
+    return run_dir
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    workspace = tmp_path / "iteration-1"
+    for eval_id in range(2):
+        for config in ("with_skill", "without_skill"):
+            _add_run(workspace, eval_id, config, 1)
+    return workspace
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_run_index_scan_and_events(workspace: Path, use_inotify: bool):
+    built = []
+    index = gr.RunIndex(workspace, "/files", use_inotify=use_inotify, on_build=lambda d, r: built.append(r["id"]))
+    generation = index.refresh()
+    assert generation == 1
+    assert [r["id"] for r in index.runs()] == [
+        "eval-0-with_skill-run-1", "eval-0-without_skill-run-1",
+        "eval-1-with_skill-run-1", "eval-1-without_skill-run-1",
+    ]
+    assert sorted(built) == sorted(r["id"] for r in index.runs())
+    # The first scan is not reported as events
+    assert index.events_since(0, timeout=0) == []
+
+    # Unchanged: nothing rebuilt, generation kept
+    built.clear()
+    assert index.refresh() == generation
+    assert built == []
+
+    run_dir = workspace / "eval-0" / "with_skill" / "run-1"
+    assert index.run_dir("eval-0-with_skill-run-1") == run_dir
+    assert index.get("eval-0-with_skill-run-1")["prompt"] == "Prompt 0"
+    assert index.get("no-such-run") is None
+
+    _add_run(workspace, 2, "with_skill", 1)
+    (run_dir / "outputs" / "answer.txt").write_text("forty-two")
+    (workspace / "eval-1" / "with_skill" / "run-1" / "grading.json").write_text(
+        json.dumps({"summary": {"pass_rate": 0.5}})
+    )
+    shutil.rmtree(workspace / "eval-1" / "without_skill")
+    assert index.refresh() == generation + 1
+    assert sorted(built) == ["eval-0-with_skill-run-1", "eval-1-with_skill-run-1", "eval-2-with_skill-run-1"]
+
+    events = {event["id"]: event for _, event in index.events_since(0, timeout=0)}
+    assert {run_id: event["type"] for run_id, event in events.items()} == {
+        "eval-2-with_skill-run-1": "added",
+        "eval-0-with_skill-run-1": "updated",
+        "eval-1-with_skill-run-1": "graded",
+        "eval-1-without_skill-run-1": "removed",
+    }
+    assert events["eval-1-with_skill-run-1"]["summary"]["pass_rate"] == 0.5
+    assert all(event["generation"] == generation + 1 and event["count"] == 4 for event in events.values())
+    assert index.get("eval-1-without_skill-run-1") is None
+    assert len(index.runs()) == 4
+
+    last = index.event_seq
+    assert index.events_since(last, timeout=0) == []
+    index.close()
+
+
+def test_events_since_wakes_on_refresh(workspace: Path):
+    index = gr.RunIndex(workspace, use_inotify=False)
+    index.refresh()
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(index.events_since(index.event_seq, timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    _add_run(workspace, 3, "with_skill", 1)
+    index.refresh()
+    waiter.join(5)
+    assert [event["id"] for _, event in result[0]] == ["eval-3-with_skill-run-1"]
+    index.close()
+
+
+def test_events_since_too_old(workspace: Path):
+    index = gr.RunIndex(workspace, use_inotify=False)
+    index.refresh()
+    index._events = gr.deque(maxlen=2)
+    for k in range(2, 6):
+        _add_run(workspace, 0, "with_skill", k)
+    index.refresh()
+    # Four events, only the last two kept: seq 0 can't catch up, seq 2 can
+    assert index.events_since(0, timeout=0) is None
+    assert [n for n, _ in index.events_since(2, timeout=0)] == [3, 4]
+    index.close()
+
+
+def test_subscribe_limit(workspace: Path):
+    index = gr.RunIndex(workspace, use_inotify=False)
+    assert index.subscribe(1)
+    assert not index.subscribe(1)
+    index.unsubscribe()
+    assert index.subscribe(1)
+
+
+def test_feedback_store_upsert(tmp_path: Path):
+    store = gr.FeedbackStore(tmp_path / "feedback.json")
+    assert store.read_bytes() == b"{}"
+    assert store.upsert("run-a", "Too long", "2026-01-01T00:00:00Z") == 1
+    assert store.upsert("run-b", "Good") == 2
+    assert store.upsert("run-a", "Still too long", "2026-01-02T00:00:00Z", status="complete") == 2
+
+    data = json.loads(store.read_bytes())
+    assert data["status"] == "complete"
+    assert [(r["run_id"], r["feedback"]) for r in data["reviews"]] == [("run-b", "Good"), ("run-a", "Still too long")]
+    assert data["reviews"][1]["timestamp"] == "2026-01-02T00:00:00Z"
+    assert data["reviews"][0]["timestamp"].endswith("Z")
+
+    # Blank feedback removes the review; status falls back to in_progress
+    assert store.upsert("run-b", "   ") == 1
+    data = json.loads(store.read_bytes())
+    assert [r["run_id"] for r in data["reviews"]] == ["run-a"]
+    assert data["status"] == "in_progress"
+    assert not list(tmp_path.glob(".feedback.json.*.tmp"))
+
+
+def test_feedback_store_replace_and_bad_file(tmp_path: Path):
+    store = gr.FeedbackStore(tmp_path / "feedback.json")
+    store.replace({"reviews": [{"run_id": "run-a", "feedback": "ok"}], "status": "complete"})
+    assert json.loads(store.read_bytes())["status"] == "complete"
+    assert store.upsert("run-b", "more") == 2
+
+    (tmp_path / "feedback.json").write_text("[]")
+    with pytest.raises(ValueError):
+        store.upsert("run-a", "x")
+
+
+def test_feedback_store_concurrent_upserts(tmp_path: Path):
+    store = gr.FeedbackStore(tmp_path / "feedback.json")
+    threads = [threading.Thread(target=store.upsert, args=(f"run-{k}", f"note {k}")) for k in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(json.loads(store.read_bytes())["reviews"]) == 20
+
+
+def test_read_text_range_ascii(tmp_path: Path):
+    path = tmp_path / "a.txt"
+    path.write_text("0123456789")
+    assert gr.read_text_range(path, 2, 4) == {"offset": 2, "end": 6, "size": 10, "content": "2345"}
+    assert gr.read_text_range(path, 8, 100) == {"offset": 8, "end": 10, "size": 10, "content": "89"}
+    assert gr.read_text_range(path, 10, 4) == {"offset": 10, "end": 10, "size": 10, "content": ""}
+
+
+def test_read_text_range_utf8_boundaries(tmp_path: Path):
+    path = tmp_path / "thai.txt"
+    text = "ab" + "สวัสดี" + "€😀z"
+    path.write_text(text, encoding="utf-8")
+    data = text.encode()
+
+    # Cut through a 3-byte character at the end: stop before it
+    cut = gr.read_text_range(path, 0, 4)
+    assert cut == {"offset": 0, "end": 2, "size": len(data), "content": "ab"}
+
+    # Start mid-character: skip its continuation bytes
+    mid = gr.read_text_range(path, 3, 6)
+    assert mid["offset"] == 5 and mid["end"] == 8
+    assert mid["content"] == "ว"
+
+    # Paging from start to end covers the file exactly, whatever the page size
+    for page in (4, 5, 7, 16):
+        offset, parts = 0, []
+        while offset < len(data):
+            chunk = gr.read_text_range(path, offset, page)
+            assert chunk["offset"] == offset
+            parts.append(chunk["content"])
+            offset = chunk["end"]
+        assert "".join(parts) == text
+
+
+def test_read_text_range_smaller_than_a_character(tmp_path: Path):
+    path = tmp_path / "emoji.txt"
+    path.write_text("😀😀", encoding="utf-8")
+    # Too short to hold a whole character: returned undecoded rather than empty, so paging advances
+    chunk = gr.read_text_range(path, 0, 2)
+    assert chunk["end"] == 2 and chunk["content"]
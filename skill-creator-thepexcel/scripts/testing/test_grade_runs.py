@@ -0,0 +1,177 @@
+"""grade_runs: cache keys, local checks, the LLM tier and skipping already-graded runs."""
+
+import json
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts.grade_runs import (
+    GradingCache,
+    cache_key,
+    expectations_digest,
+    grade_workspace,
+    hash_outputs,
+    normalize_expectations,
+    run_check,
+)
+
+# Stands in for `claude -p`: passes every expectation it is asked about and counts its calls
+FAKE_GRADER = '''
+import json, re, sys
+from pathlib import Path
+prompt = sys.argv[sys.argv.index("-p") + 1]
+texts = re.search(r"expectations:\\n(.*?)\\n\\n", prompt, re.S).group(1).split("\\n")
+output = re.search(r"Save the grading JSON to (.+) instead", prompt).group(1)
+verdicts = [{"text": t[2:], "passed": True, "evidence": "fake"} for t in texts]
+Path(output).write_text(json.dumps({"expectations": verdicts}))
+with open(sys.argv[0] + ".calls", "a") as f:
+    f.write("call\\n")
+'''
+
+EXPECTATIONS = [
+    {"text": "Writes a report", "check": {"type": "file_exists", "path": "*.md"}},
+    {"text": "Total is 42", "check": {"type": "file_contains", "path": "*.md", "pattern": r"Total:\s*42"}},
+    "Explains the method",
+]
+
+
+@pytest.fixture
+def grader(tmp_path: Path) -> Path:
+    script = tmp_path / "fake_grader.py"
+    script.write_text(FAKE_GRADER)
+    wrapper = tmp_path / "claude"
+    wrapper.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n')
+    wrapper.chmod(wrapper.stat().st_mode | stat.S_IXUSR)
+    return script
+
+
+def _calls(grader: Path) -> int:
+    calls = Path(str(grader) + ".calls")
+    return len(calls.read_text().splitlines()) if calls.exists() else 0
+
+
+def _workspace(root: Path, expectations: list, runs: dict[str, str]) -> Path:
+    workspace = root / "iteration-1"
+    eval_dir = workspace / "eval-0"
+    eval_dir.mkdir(parents=True)
+    (eval_dir / "eval_metadata.json").write_text(json.dumps({"eval_id": 0, "assertions": expectations}))
+    for name, report in runs.items():
+        outputs = eval_dir / "with_skill" / name / "outputs"
+        outputs.mkdir(parents=True)
+        (outputs / "report.md").write_text(report)
+    return workspace
+
+
+def _set_expectations(workspace: Path, expectations: list) -> None:
+    path = workspace / "eval-0" / "eval_metadata.json"
+    path.write_text(json.dumps({"eval_id": 0, "assertions": expectations}))
+
+
+def _grade(workspace: Path, cache_dir: Path | None, grader: Path, **kwargs) -> dict:
+    return grade_workspace(workspace, GradingCache(cache_dir), num_workers=2, claude_bin=str(grader.parent / "claude"), **kwargs)
+
+
+def test_cache_key_covers_text_check_outputs_and_version():
+    exp = {"text": "Total is 42", "check": {"type": "file_contains", "path": "*.md", "pattern": "42"}}
+    base = cache_key("h", exp, "v1")
+    assert cache_key("h", dict(exp), "v1") == base
+    assert cache_key("h", {**exp, "check": {**exp["check"], "pattern": "43"}}, "v1") != base
+    assert cache_key("h", {"text": "Total is 42"}, "v1") != base
+    assert cache_key("h2", exp, "v1") != base
+    assert cache_key("h", exp, "v2") != base
+
+
+def test_expectations_digest_sees_check_changes():
+    exps = normalize_expectations(EXPECTATIONS)
+    changed = normalize_expectations([{**EXPECTATIONS[0], "check": {"type": "file_exists", "path": "*.txt"}}, *EXPECTATIONS[1:]])
+    assert expectations_digest(exps) == expectations_digest(normalize_expectations(EXPECTATIONS))
+    assert expectations_digest(exps) != expectations_digest(changed)
+    assert expectations_digest(exps) != expectations_digest(exps[::-1])
+
+
+def test_hash_outputs_tracks_names_and_contents(tmp_path: Path):
+    outputs = tmp_path / "outputs"
+    outputs.mkdir()
+    (outputs / "a.txt").write_text("one")
+    first = hash_outputs(outputs)
+    (outputs / "a.txt").write_text("two")
+    assert hash_outputs(outputs) != first
+    (outputs / "a.txt").rename(outputs / "b.txt")
+    (outputs / "b.txt").write_text("one")
+    assert hash_outputs(outputs) != first
+    assert hash_outputs(tmp_path / "missing") == hash_outputs(tmp_path / "also-missing")
+
+
+def test_grading_cache(tmp_path: Path):
+    cache = GradingCache(tmp_path / "cache")
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, {"text": "t", "passed": True, "evidence": "e"})
+    assert cache.get("ab" * 32)["passed"] is True
+    assert cache.hits == 1
+    disabled = GradingCache(None)
+    disabled.put("ab" * 32, {"passed": True})
+    assert disabled.get("ab" * 32) is None
+
+
+def test_run_check_types(tmp_path: Path):
+    outputs = tmp_path / "outputs"
+    outputs.mkdir()
+    (outputs / "report.md").write_text("Total: 42\nTODO: tidy\n")
+    (outputs / "data.json").write_text("{bad")
+    assert run_check(str(tmp_path), {"type": "file_exists", "path": "*.md"})[0]
+    assert not run_check(str(tmp_path), {"type": "file_exists", "path": "*.pdf"})[0]
+    assert run_check(str(tmp_path), {"type": "file_contains", "path": "*.md", "pattern": r"Total:\s*42"})[0]
+    assert not run_check(str(tmp_path), {"type": "file_not_contains", "path": "**/*", "pattern": "TODO"})[0]
+    assert not run_check(str(tmp_path), {"type": "json_valid", "path": "*.json"})[0]
+    assert run_check(str(tmp_path), {"type": "command", "command": [sys.executable, "-c", "pass"]})[0]
+    assert not run_check(str(tmp_path), {"type": "file_contains", "path": "*.md", "pattern": "("})[0]
+    assert run_check(str(tmp_path), {"type": "nope"}) == (False, "Unknown check type: 'nope'")
+
+
+def test_grades_caches_and_skips(tmp_path: Path, grader: Path):
+    workspace = _workspace(tmp_path, EXPECTATIONS, {"run-1": "Total: 42", "run-2": "Total: 41"})
+    cache_dir = tmp_path / "cache"
+
+    stats = _grade(workspace, cache_dir, grader)
+    assert stats["runs"] == 2 and stats["local"] == 4 and stats["llm"] == 2
+    assert _calls(grader) == 2
+    grading = json.loads((workspace / "eval-0" / "with_skill" / "run-2" / "grading.json").read_text())
+    assert [e["passed"] for e in grading["expectations"]] == [True, False, True]
+    assert grading["summary"]["passed"] == 2
+    assert grading["expectations_digest"] == expectations_digest(normalize_expectations(EXPECTATIONS))
+
+    # Nothing changed: both runs skipped
+    stats = _grade(workspace, cache_dir, grader)
+    assert stats["skipped"] == 2 and stats["runs"] == 0
+
+    # Forced: every verdict comes from the cache, no grader calls
+    stats = _grade(workspace, cache_dir, grader, force=True)
+    assert stats["runs"] == 2 and stats["cached"] == 6 and stats["llm_calls"] == 0
+    assert _calls(grader) == 2
+
+
+def test_changed_check_is_regraded(tmp_path: Path, grader: Path):
+    workspace = _workspace(tmp_path, EXPECTATIONS, {"run-1": "Total: 42"})
+    _grade(workspace, tmp_path / "cache", grader)
+
+    # Same text, different check: the stored verdict no longer applies
+    edited = [EXPECTATIONS[0], {**EXPECTATIONS[1], "check": {**EXPECTATIONS[1]["check"], "pattern": r"Total:\s*43"}}, EXPECTATIONS[2]]
+    _set_expectations(workspace, edited)
+    stats = _grade(workspace, tmp_path / "cache", grader)
+    assert stats["skipped"] == 0 and stats["local"] == 1 and stats["cached"] == 2
+    grading = json.loads((workspace / "eval-0" / "with_skill" / "run-1" / "grading.json").read_text())
+    assert [e["passed"] for e in grading["expectations"]] == [True, False, True]
+
+
+def test_grading_without_digest_is_regraded(tmp_path: Path, grader: Path):
+    workspace = _workspace(tmp_path, EXPECTATIONS, {"run-1": "Total: 42"})
+    run_dir = workspace / "eval-0" / "with_skill" / "run-1"
+    # Written by the grader agent directly, with matching texts but no digest
+    (run_dir / "grading.json").write_text(json.dumps({
+        "expectations": [{"text": e if isinstance(e, str) else e["text"], "passed": False, "evidence": ""} for e in EXPECTATIONS],
+    }))
+    stats = _grade(workspace, None, grader)
+    assert stats["runs"] == 1 and stats["skipped"] == 0
+    assert json.loads((run_dir / "grading.json").read_text())["summary"]["passed"] == 3
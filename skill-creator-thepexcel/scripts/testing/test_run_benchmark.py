@@ -0,0 +1,102 @@
+"""End-to-end run_benchmark test against fake_claude.py.
+
+    python -m pytest scripts/testing
+"""
+
+import json
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts.run_benchmark import parse_configs, run_benchmark
+from scripts.testing import fake_claude
+
+FAKE_CLAUDE = Path(fake_claude.__file__).resolve()
+
+EVALS = [
+    {"id": 1, "prompt": "Say hello", "expectations": ["Says hello"]},
+    {"id": 2, "prompt": "FAKE_FAIL please", "expectations": []},
+]
+
+
+@pytest.fixture
+def claude_bin(tmp_path: Path) -> str:
+    """Wrapper so the fake runs under this interpreter whatever python3 is on PATH."""
+    wrapper = tmp_path / "claude"
+    wrapper.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_CLAUDE}" "$@"\n')
+    wrapper.chmod(wrapper.stat().st_mode | stat.S_IXUSR)
+    return str(wrapper)
+
+
+@pytest.fixture
+def skill(tmp_path: Path) -> Path:
+    skill_dir = tmp_path / "my-skill"
+    skill_dir.mkdir()
+    (skill_dir / "SKILL.md").write_text("---\nname: my-skill\ndescription: test\n---\n")
+    return skill_dir
+
+
+def _run(workspace: Path, skill: Path, claude_bin: str, **kwargs) -> dict:
+    return run_benchmark(
+        evals=EVALS,
+        configs=parse_configs(["with_skill", "without_skill"], skill),
+        workspace=workspace,
+        skill_root=skill,
+        runs=2,
+        num_workers=4,
+        timeout=30,
+        claude_bin=claude_bin,
+        **kwargs,
+    )
+
+
+def test_run_benchmark_end_to_end(tmp_path: Path, skill: Path, claude_bin: str):
+    workspace = tmp_path / "ws" / "iteration-1"
+    summary = _run(workspace, skill, claude_bin)
+
+    assert summary["runs_started"] == 8
+    assert summary["runs_skipped"] == 0
+    assert sorted(f["run"] for f in summary["failed"]) == [
+        f"eval-2/{config}/run-{k}" for config in ("with_skill", "without_skill") for k in (1, 2)
+    ]
+    metadata = json.loads((workspace / "eval-1" / "eval_metadata.json").read_text())
+    assert metadata["assertions"] == ["Says hello"]
+
+    run_dir = workspace / "eval-1" / "with_skill" / "run-1"
+    assert (run_dir / "outputs" / "answer.txt").read_text() == "Say hello"
+    transcript = (run_dir / "transcript.md").read_text()
+    assert "Tool: Write" in transcript and "Done." in transcript
+    timing = json.loads((run_dir / "timing.json").read_text())
+    assert "error" not in timing
+    assert timing["usage"]["input_tokens"] == fake_claude.USAGE["input_tokens"]
+    assert timing["usage"]["output_tokens"] == fake_claude.USAGE["output_tokens"]
+    assert timing["usage"]["cost_usd"] == fake_claude.COST_USD
+    assert timing["total_tokens"] == sum(fake_claude.USAGE.values())
+    assert summary["usage"]["input_tokens"] == 4 * fake_claude.USAGE["input_tokens"]
+
+    failed_timing = json.loads((workspace / "eval-2" / "without_skill" / "run-2" / "timing.json").read_text())
+    assert failed_timing["error"] == "exit code 2: fake_claude: failing as asked"
+    assert not any((workspace / "eval-2" / "without_skill" / "run-2" / "outputs").iterdir())
+
+
+def test_run_benchmark_resumes(tmp_path: Path, skill: Path, claude_bin: str):
+    workspace = tmp_path / "ws" / "iteration-1"
+    _run(workspace, skill, claude_bin)
+    finished = workspace / "eval-1" / "without_skill" / "run-2" / "timing.json"
+    before = finished.read_text()
+
+    # Finished runs are skipped, failed ones retried
+    summary = _run(workspace, skill, claude_bin)
+    assert summary["runs_skipped"] == 4
+    assert summary["runs_started"] == 4
+    assert len(summary["failed"]) == 4
+    assert finished.read_text() == before
+
+    marker = finished.parent / "outputs" / "stale.txt"
+    marker.write_text("from the previous run")
+    summary = _run(workspace, skill, claude_bin, force=True)
+    assert summary["runs_skipped"] == 0
+    assert summary["runs_started"] == 8
+    assert not marker.exists()
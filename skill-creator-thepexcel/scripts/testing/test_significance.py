@@ -0,0 +1,102 @@
+"""Bootstrap CIs, permutation tests and effect sizes, exact and sampled, NumPy and pure Python."""
+
+import random
+
+import pytest
+
+from scripts import significance
+from scripts.significance import bootstrap_ci, cliffs_delta, compare_samples, hedges_g, permutation_test
+
+
+@pytest.fixture
+def pure_python(monkeypatch):
+    monkeypatch.setattr(significance, "_numpy", False)
+    assert significance.backend() == "python"
+
+
+def _samples(n: int, shift: float, seed: int) -> tuple[list[float], list[float]]:
+    rng = random.Random(seed)
+    return [rng.gauss(10 + shift, 2) for _ in range(n)], [rng.gauss(10, 2) for _ in range(n)]
+
+
+def test_permutation_exact_enumeration():
+    # Of the 20 ways to pick group a from six values, only {1,2,3} and {0,0,0} are as extreme
+    p_value, exact = permutation_test([1.0, 2.0, 3.0], [0.0, 0.0, 0.0])
+    assert exact
+    assert p_value == pytest.approx(2 / 20)
+
+
+def test_permutation_identical_groups():
+    p_value, exact = permutation_test([1.0, 1.0, 1.0], [1.0, 1.0, 1.0])
+    assert exact and p_value == 1.0
+
+
+def test_bootstrap_exact_enumeration():
+    low, high = bootstrap_ci([1.0, 2.0, 3.0], [0.0, 0.0, 0.0], resamples=1000)
+    # 27 equally likely resampled means of a, b is constant
+    assert 1.0 <= low < 2.0 < high <= 3.0
+    stats = compare_samples([1.0, 2.0, 3.0], [0.0, 0.0, 0.0], resamples=1000)
+    assert stats["ci_exact"] and stats["p_exact"]
+    assert stats["delta"] == 2.0
+
+
+def test_sampled_bootstrap_agrees_with_exact():
+    a, b = [1.0, 4.0, 2.0], [0.0, 1.0, 3.0]
+    exact = bootstrap_ci(a, b, resamples=1000)
+    sampled = bootstrap_ci(a, b, resamples=700)  # below 3^3 * 3^3 = 729, so sampled
+    assert sampled == pytest.approx(exact, abs=0.35)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "python"])
+def test_sampled_paths_detect_a_real_difference(backend, monkeypatch):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(significance, "_numpy", False)
+    assert significance.backend() == backend
+    a, b = _samples(40, shift=3.0, seed=1)
+    stats = compare_samples(a, b, resamples=4000)
+    assert not stats["ci_exact"] and not stats["p_exact"]
+    assert stats["ci_low"] > 0
+    assert stats["p_value"] < 0.01
+    assert stats["resamples"] == 4000
+
+
+def test_numpy_and_python_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    a, b = _samples(30, shift=0.5, seed=2)
+    with_numpy = compare_samples(a, b, resamples=20000)
+    monkeypatch.setattr(significance, "_numpy", False)
+    without = compare_samples(a, b, resamples=20000)
+    assert with_numpy["delta"] == without["delta"]
+    assert with_numpy["ci_low"] == pytest.approx(without["ci_low"], abs=0.15)
+    assert with_numpy["ci_high"] == pytest.approx(without["ci_high"], abs=0.15)
+    assert with_numpy["p_value"] == pytest.approx(without["p_value"], abs=0.03)
+
+
+def test_resamples_capped_for_large_inputs(monkeypatch, pure_python):
+    monkeypatch.setattr(significance, "PURE_PYTHON_BUDGET", 100_000)
+    a, b = _samples(500, shift=1.0, seed=3)
+    assert compare_samples(a, b, resamples=10_000)["resamples"] == significance.MIN_RESAMPLES
+    # A request below the floor is honoured as is
+    assert compare_samples(a[:5], b[:5], resamples=200)["resamples"] == 200
+
+
+def test_hedges_g():
+    # Means 2 and 5, both variances 1: d = -3, corrected by 1 - 3 / (4 * 6 - 9)
+    assert hedges_g([1.0, 2.0, 3.0], [4.0, 5.0, 6.0]) == pytest.approx(-3 * 0.8)
+    assert hedges_g([1.0], [2.0, 3.0]) is None
+    assert hedges_g([1.0, 1.0], [1.0, 1.0]) is None
+
+
+def test_cliffs_delta():
+    assert cliffs_delta([5.0, 6.0], [1.0, 2.0]) == 1.0
+    assert cliffs_delta([1.0, 2.0], [5.0, 6.0]) == -1.0
+    assert cliffs_delta([1.0, 2.0, 3.0], [2.0]) == 0.0
+    assert cliffs_delta([2.0, 2.0], [2.0, 2.0]) == 0.0
+    assert cliffs_delta([3.0, 1.0], [2.0]) == 0.0
+
+
+def test_compare_samples_empty_side():
+    assert compare_samples([], [1.0]) is None
+    assert compare_samples([1.0], []) is None
@@ -0,0 +1,104 @@
+"""RunningStats: Welford accumulation, Chan merge, reservoir merge and serialization."""
+
+import json
+import math
+import random
+import statistics
+
+import pytest
+
+from scripts.streaming_stats import RunningStats, interpolate_quantile
+
+
+def _values(n: int, seed: int) -> list[float]:
+    rng = random.Random(seed)
+    return [rng.gauss(50, 12) for _ in range(n)]
+
+
+def test_matches_direct_statistics():
+    values = _values(500, 1)
+    stats = RunningStats().extend(values)
+    assert stats.count == 500
+    assert stats.mean == pytest.approx(statistics.fmean(values))
+    assert stats.variance == pytest.approx(statistics.variance(values))
+    assert (stats.min, stats.max) == (min(values), max(values))
+
+
+def test_single_value_and_empty():
+    assert RunningStats().summary() == {"mean": 0.0, "stddev": 0.0, "min": 0.0, "max": 0.0}
+    assert RunningStats().percentiles() == {"p50": 0.0, "p90": 0.0, "p95": 0.0, "p99": 0.0}
+    one = RunningStats().extend([3.0])
+    assert one.variance == 0.0
+    assert one.summary() == {"mean": 3.0, "stddev": 0.0, "min": 3.0, "max": 3.0}
+
+
+@pytest.mark.parametrize("split", [0, 1, 137, 400])
+def test_chan_merge_equals_one_pass(split):
+    values = _values(400, 2)
+    merged = RunningStats().extend(values[:split]).merge(RunningStats().extend(values[split:]))
+    whole = RunningStats().extend(values)
+    assert merged.count == whole.count
+    assert merged.mean == pytest.approx(whole.mean)
+    assert merged.m2 == pytest.approx(whole.m2)
+    assert (merged.min, merged.max) == (whole.min, whole.max)
+
+
+def test_merge_of_many_shards():
+    values = _values(1000, 3)
+    shards = [RunningStats().extend(values[i:i + 77]) for i in range(0, len(values), 77)]
+    merged = RunningStats()
+    for shard in shards:
+        merged.merge(shard)
+    assert merged.mean == pytest.approx(statistics.fmean(values))
+    assert merged.variance == pytest.approx(statistics.variance(values))
+
+
+def test_reservoir_exact_until_full():
+    values = _values(300, 4)
+    stats = RunningStats(reservoir_size=1024).extend(values)
+    ordered = sorted(values)
+    assert sorted(stats.reservoir) == ordered
+    assert stats.quantile(0.5) == pytest.approx(statistics.median(values))
+    assert stats.quantile(0.0) == ordered[0]
+    assert stats.quantile(1.0) == ordered[-1]
+
+
+def test_reservoir_merge_is_bounded_and_proportional():
+    big = RunningStats(reservoir_size=100).extend([0.0] * 3000)
+    small = RunningStats(reservoir_size=100).extend([1.0] * 1000)
+    big.merge(small)
+    assert len(big.reservoir) == 100
+    # 3000:1000 runs, so about three quarters of the sample comes from the first shard
+    assert big.reservoir.count(0.0) == 75
+    assert big.reservoir.count(1.0) == 25
+
+
+def test_reservoir_merge_keeps_everything_when_it_fits():
+    a = RunningStats(reservoir_size=100).extend([1.0, 2.0])
+    b = RunningStats(reservoir_size=100).extend([3.0])
+    assert sorted(a.merge(b).reservoir) == [1.0, 2.0, 3.0]
+
+
+def test_to_dict_from_dict_round_trip():
+    stats = RunningStats(reservoir_size=50).extend(_values(200, 5))
+    restored = RunningStats.from_dict(json.loads(json.dumps(stats.to_dict())))
+    assert restored.count == stats.count
+    assert restored.mean == stats.mean
+    assert restored.m2 == stats.m2
+    assert (restored.min, restored.max) == (stats.min, stats.max)
+    assert restored.reservoir == stats.reservoir
+    assert restored.reservoir_size == 50
+    assert restored.summary() == stats.summary()
+
+
+def test_from_dict_of_empty_accumulator():
+    restored = RunningStats.from_dict(RunningStats().to_dict())
+    assert restored.count == 0
+    assert (restored.min, restored.max) == (math.inf, -math.inf)
+    merged = restored.merge(RunningStats().extend([2.0, 4.0]))
+    assert (merged.min, merged.max, merged.mean) == (2.0, 4.0, 3.0)
+
+
+def test_interpolate_quantile():
+    assert interpolate_quantile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+    assert interpolate_quantile([7.0], 0.9) == 7.0
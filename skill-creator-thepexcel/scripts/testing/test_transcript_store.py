@@ -0,0 +1,131 @@
+"""TranscriptStore: append/read round trips, chunk dedup, concurrent appends and failed appends."""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from scripts.transcript_store import TranscriptStore
+
+SHARED = "You are improving a skill description.\n\n" + "".join(f"Skill content paragraph {k}.\n\n" for k in range(20))
+
+
+def _transcript(iteration: int, tail: str = "") -> dict:
+    return {
+        "iteration": iteration,
+        "prompt": SHARED + f"Iteration {iteration} results{tail}.",
+        "thinking": f"Thinking about iteration {iteration}.",
+        "parsed_description": f"description {iteration}",
+        "char_count": 100 + iteration,
+    }
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    store = TranscriptStore(tmp_path / "store")
+    yield store
+    store.close()
+
+
+def test_round_trip(store: TranscriptStore):
+    ids = [store.append("run-a", "my-skill", _transcript(i), passed=i, total=4) for i in range(1, 4)]
+    for i, record_id in enumerate(ids, 1):
+        assert store.get(record_id) == _transcript(i)
+    assert [t["iteration"] for t in store.iter_run("run-a")] == [1, 2, 3]
+
+    rows = store.query(skill="my-skill", min_score=0.5)
+    assert sorted(r["iteration"] for r in rows) == [2, 3]
+    assert rows[0]["description"] in ("description 2", "description 3")
+
+
+def test_shared_prompt_text_is_stored_once(store: TranscriptStore):
+    for i in range(5):
+        store.append("run-a", "my-skill", _transcript(i))
+    stats = store.stats()
+    assert stats["records"] == 5
+    # 21 shared paragraphs plus one tail and one thinking chunk per record
+    assert stats["unique_chunks"] == 21 + 5 * 2
+
+
+def test_unknown_ids(store: TranscriptStore):
+    with pytest.raises(KeyError):
+        store.get(999)
+    with pytest.raises(KeyError):
+        list(store.iter_run("no-such-run"))
+
+
+def test_concurrent_appends_from_separate_connections(tmp_path: Path):
+    root = tmp_path / "store"
+    TranscriptStore(root).close()
+    errors = []
+
+    def worker(thread: int) -> None:
+        store = TranscriptStore(root)
+        try:
+            for i in range(20):
+                store.append("shared-run", "my-skill", _transcript(i, tail=f" from {thread}"))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            store.close()
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+
+    store = TranscriptStore(root)
+    try:
+        rows = store.db.execute("SELECT id, line FROM transcripts").fetchall()
+        assert len(rows) == 120
+        assert len({line for _, line in rows}) == 120
+        records = [store.get(record_id) for record_id, _ in rows]
+        assert sorted(r["prompt"] for r in records) == sorted(
+            _transcript(i, tail=f" from {t}")["prompt"] for t in range(6) for i in range(20)
+        )
+        assert len(list(store.iter_run("shared-run"))) == 120
+    finally:
+        store.close()
+
+
+class _FailingInsert:
+    """Wraps a connection so the transcripts INSERT fails after the segment was written."""
+
+    def __init__(self, db):
+        self._db = db
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def execute(self, sql, *args):
+        if sql.startswith("INSERT INTO transcripts"):
+            raise sqlite3.OperationalError("disk I/O error")
+        return self._db.execute(sql, *args)
+
+
+def test_failed_append_leaves_later_records_readable(store: TranscriptStore):
+    first = store.append("run-a", "my-skill", _transcript(1))
+    db = store.db
+    store.db = _FailingInsert(db)
+    with pytest.raises(sqlite3.OperationalError):
+        store.append("run-a", "my-skill", _transcript(2))
+    store.db = db
+    assert not db.in_transaction
+
+    third = store.append("run-a", "my-skill", _transcript(3))
+    assert store.get(first)["iteration"] == 1
+    assert store.get(third)["iteration"] == 3
+    # The orphaned member is still in the segment but never read
+    assert [t["iteration"] for t in store.iter_run("run-a")] == [1, 3]
+
+
+def test_rows_without_offsets_are_read_by_line(store: TranscriptStore):
+    ids = [store.append("run-a", "my-skill", _transcript(i)) for i in range(3)]
+    # As written before byte offsets were indexed
+    store.db.execute("UPDATE transcripts SET byte_offset = NULL, byte_length = NULL")
+    store.db.commit()
+    assert [store.get(record_id)["iteration"] for record_id in ids] == [0, 1, 2]
+    assert [t["iteration"] for t in store.iter_run("run-a")] == [0, 1, 2]
@@ -0,0 +1,143 @@
+"""Token and cost accounting for API calls and claude -p runs.
+
+Usage is tracked as plain dicts with the same keys everywhere, so totals can
+be summed across CLI runs, API calls, iterations and whole optimization runs
+and written straight into results JSON.
+"""
+
+USAGE_KEYS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+    "thinking_tokens",
+)
+
+# USD per million tokens: (input, output). Cache writes bill at 1.25x input,
+# cache reads at 0.1x input. Matched by longest prefix of the model id.
+MODEL_PRICING = {
+    "claude-opus-4-5": (5.0, 25.0),
+    "claude-opus-4-1": (15.0, 75.0),
+    "claude-opus-4": (15.0, 75.0),
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-3-7-sonnet": (3.0, 15.0),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-haiku-4-5": (1.0, 5.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "claude-3-haiku": (0.25, 1.25),
+}
+CACHE_WRITE_MULTIPLIER = 1.25
+CACHE_READ_MULTIPLIER = 0.1
+
+# Rough chars-per-token ratio, used only to estimate thinking tokens since
+# the API reports them inside output_tokens rather than separately
+CHARS_PER_TOKEN = 4
+
+
+def empty_usage() -> dict:
+    return {key: 0 for key in USAGE_KEYS} | {"cost_usd": 0.0, "unpriced_calls": 0}
+
+
+def add_usage(total: dict, usage: dict | None) -> dict:
+    """Add usage into total in place and return total."""
+    if not usage:
+        return total
+    for key in USAGE_KEYS:
+        total[key] = total.get(key, 0) + (usage.get(key) or 0)
+    # Unknown costs are counted rather than treated as zero, so a low total is never silent
+    if usage.get("cost_usd") is None:
+        total["unpriced_calls"] = total.get("unpriced_calls", 0) + 1
+    else:
+        total["cost_usd"] = round(total.get("cost_usd", 0.0) + usage["cost_usd"], 6)
+    total["unpriced_calls"] = total.get("unpriced_calls", 0) + usage.get("unpriced_calls", 0)
+    return total
+
+
+def sum_usage(usages) -> dict:
+    total = empty_usage()
+    for usage in usages:
+        add_usage(total, usage)
+    return total
+
+
+def total_tokens(usage: dict) -> int:
+    """Billed tokens counted against --max-tokens-budget (thinking is already in output)."""
+    return (
+        usage.get("input_tokens", 0)
+        + usage.get("output_tokens", 0)
+        + usage.get("cache_creation_input_tokens", 0)
+        + usage.get("cache_read_input_tokens", 0)
+    )
+
+
+def estimate_cost(usage: dict, model: str | None) -> float | None:
+    """Estimate USD cost from token counts, or None for unknown models."""
+    if not model:
+        return None
+    prefix = max((p for p in MODEL_PRICING if model.startswith(p)), key=len, default=None)
+    if prefix is None:
+        return None
+    input_price, output_price = MODEL_PRICING[prefix]
+    cost = (
+        usage.get("input_tokens", 0) * input_price
+        + usage.get("cache_creation_input_tokens", 0) * input_price * CACHE_WRITE_MULTIPLIER
+        + usage.get("cache_read_input_tokens", 0) * input_price * CACHE_READ_MULTIPLIER
+        + usage.get("output_tokens", 0) * output_price
+    ) / 1_000_000
+    return round(cost, 6)
+
+
+def usage_from_api(response_usage, model: str, thinking_text: str = "") -> dict:
+    """Convert an anthropic Message.usage object into a usage dict."""
+    usage = empty_usage()
+    for key in USAGE_KEYS:
+        usage[key] = getattr(response_usage, key, None) or 0
+    if not usage["thinking_tokens"] and thinking_text:
+        usage["thinking_tokens"] = len(thinking_text) // CHARS_PER_TOKEN
+    usage["cost_usd"] = estimate_cost(usage, model)
+    return usage
+
+
+class StreamUsage:
+    """Accumulates a claude -p run's usage from its stream-json events.
+
+    The final `result` event carries authoritative totals and cost, but runs
+    are usually killed as soon as the trigger decision is known, so partial
+    counts are also taken from message_start / message_delta stream events.
+    """
+
+    def __init__(self, model: str | None = None):
+        self.model = model
+        self.usage = empty_usage()
+        self.usage["cost_usd"] = None
+        self._message_output = 0
+        self._final = False
+
+    def update(self, event: dict) -> None:
+        event_type = event.get("type")
+        if event_type == "result":
+            reported = event.get("usage") or {}
+            for key in USAGE_KEYS:
+                if key in reported:
+                    self.usage[key] = reported[key] or 0
+            self.usage["cost_usd"] = event.get("total_cost_usd")
+            self._final = True
+        elif event_type == "stream_event" and not self._final:
+            se = event.get("event", {})
+            if se.get("type") == "message_start":
+                reported = se.get("message", {}).get("usage") or {}
+                for key in ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens", "output_tokens"):
+                    self.usage[key] += reported.get(key) or 0
+                self._message_output = reported.get("output_tokens") or 0
+            elif se.get("type") == "message_delta":
+                # output_tokens in message_delta is cumulative for the current message
+                reported = se.get("usage") or {}
+                if reported.get("output_tokens") is not None:
+                    self.usage["output_tokens"] += max(0, reported["output_tokens"] - self._message_output)
+                    self._message_output = reported["output_tokens"]
+
+    def result(self) -> dict:
+        usage = dict(self.usage)
+        if usage["cost_usd"] is None:
+            usage["cost_usd"] = estimate_cost(usage, self.model)
+        return usage
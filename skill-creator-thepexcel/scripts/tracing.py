@@ -0,0 +1,254 @@
+"""Lightweight span tracing for skill-creator scripts.
+
+Spans are recorded with wall-clock microsecond timestamps and appended to a
+per-process JSONL file in a shared trace directory. The directory and trace
+id are passed through environment variables, so ProcessPoolExecutor workers
+(fork or spawn) record into the same trace. The current span is a context
+variable, so threads never see each other's spans; work handed to a thread
+pool keeps its parent with bind(), and a process pool's workers with
+initializer=adopt_parent, initargs=(current_parent(),). Tracing is a no-op
+until start_trace() is called.
+
+After the run, export_chrome_trace() merges the parts into a Chrome
+trace-event JSON file that opens in Perfetto or chrome://tracing, and
+export_otlp() writes the same spans as OTLP/JSON, either to a file or by
+POSTing to a local collector's /v1/traces endpoint.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import secrets
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+TRACE_DIR_ENV = "SKILL_CREATOR_TRACE_DIR"
+TRACE_ID_ENV = "SKILL_CREATOR_TRACE_ID"
+TRACE_PARENT_ENV = "SKILL_CREATOR_TRACE_PARENT"
+
+# Innermost open span in this thread/task; a process pool worker falls back
+# to the parent it was started under (TRACE_PARENT_ENV)
+_parent: contextvars.ContextVar[str] = contextvars.ContextVar("trace_parent", default="")
+_named_pids: set[int] = set()
+
+
+def enabled() -> bool:
+    return bool(os.environ.get(TRACE_DIR_ENV))
+
+
+def start_trace(process_name: str = "") -> Path:
+    """Enable tracing for this process and any children it starts."""
+    trace_dir = Path(tempfile.mkdtemp(prefix="skill_creator_trace_"))
+    os.environ[TRACE_DIR_ENV] = str(trace_dir)
+    os.environ[TRACE_ID_ENV] = secrets.token_hex(16)
+    if process_name:
+        name_process(process_name)
+    return trace_dir
+
+
+def _now_us() -> int:
+    return time.time_ns() // 1000
+
+
+def _emit(event: dict) -> None:
+    trace_dir = os.environ.get(TRACE_DIR_ENV)
+    if not trace_dir:
+        return
+    event.setdefault("pid", os.getpid())
+    event.setdefault("tid", threading.get_ident() % 2**31)
+    # One small append per event; survives workers that are killed mid-run
+    with open(Path(trace_dir) / f"events-{os.getpid()}.jsonl", "a") as f:
+        f.write(json.dumps(event) + "\n")
+
+
+def name_process(name: str) -> None:
+    """Label this process in the trace viewer (e.g. "run_loop", "eval worker")."""
+    if enabled() and os.getpid() not in _named_pids:
+        _named_pids.add(os.getpid())
+        _emit({"name": "process_name", "ph": "M", "args": {"name": name}})
+
+
+def current_parent() -> str:
+    """Id of the innermost open span, or "" outside any span."""
+    return _parent.get() or os.environ.get(TRACE_PARENT_ENV, "")
+
+
+def adopt_parent(parent_id: str) -> None:
+    """ProcessPoolExecutor initializer: nest this worker's spans under parent_id."""
+    os.environ[TRACE_PARENT_ENV] = parent_id
+
+
+def bind(fn):
+    """fn, nested under the current span when it runs on another thread (e.g. a ThreadPoolExecutor)."""
+    parent_id = current_parent()
+
+    @functools.wraps(fn)
+    def bound(*args, **kwargs):
+        token = _parent.set(parent_id)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _parent.reset(token)
+
+    return bound
+
+
+@contextmanager
+def span(name: str, cat: str = "", **args):
+    """Record a span around the block. Yields the args dict so callers can add results."""
+    if not enabled():
+        yield args
+        return
+
+    span_id = secrets.token_hex(8)
+    parent_id = current_parent()
+    token = _parent.set(span_id)
+    start = _now_us()
+    try:
+        yield args
+    except BaseException as e:
+        args["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _parent.reset(token)
+        _emit({
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": start,
+            "dur": _now_us() - start,
+            "args": args,
+            "id": span_id,
+            "parent": parent_id,
+        })
+
+
+def instant(name: str, cat: str = "", **args) -> None:
+    """Record a point-in-time event (e.g. first stream event, trigger decision)."""
+    if not enabled():
+        return
+    _emit({
+        "name": name,
+        "cat": cat,
+        "ph": "i",
+        "s": "t",
+        "ts": _now_us(),
+        "args": args,
+        "parent": current_parent(),
+    })
+
+
+def collect_events() -> list[dict]:
+    """Read all events recorded so far by this process and its children."""
+    trace_dir = os.environ.get(TRACE_DIR_ENV)
+    if not trace_dir:
+        return []
+    events = []
+    for part in sorted(Path(trace_dir).glob("events-*.jsonl")):
+        for line in part.read_text().splitlines():
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Partial line from a worker killed mid-write
+                continue
+    events.sort(key=lambda e: e.get("ts", 0))
+    return events
+
+
+def export_chrome_trace(path: Path) -> int:
+    """Write the trace as Chrome trace-event JSON. Returns the number of events."""
+    events = collect_events()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+    return len(events)
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(events: list[dict], service_name: str = "skill-creator") -> dict:
+    """Convert recorded spans to an OTLP/JSON ExportTraceServiceRequest."""
+    trace_id = os.environ.get(TRACE_ID_ENV, "0" * 32)
+    spans = []
+    for e in events:
+        if e.get("ph") != "X":
+            continue
+        attributes = [{"key": k, "value": _otlp_value(v)} for k, v in e.get("args", {}).items()]
+        attributes.append({"key": "process.pid", "value": _otlp_value(e.get("pid", 0))})
+        otlp_span = {
+            "traceId": trace_id,
+            "spanId": e["id"],
+            "name": e["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(e["ts"] * 1000),
+            "endTimeUnixNano": str((e["ts"] + e["dur"]) * 1000),
+            "attributes": attributes,
+        }
+        if e.get("parent"):
+            otlp_span["parentSpanId"] = e["parent"]
+        if "error" in e.get("args", {}):
+            otlp_span["status"] = {"code": 2, "message": e["args"]["error"]}
+        spans.append(otlp_span)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "scripts.tracing"}, "spans": spans}],
+        }]
+    }
+
+
+def export_otlp(target: str, service_name: str = "skill-creator") -> int:
+    """Write OTLP/JSON to a file, or POST it to a collector if target is an http(s) URL."""
+    payload = to_otlp(collect_events(), service_name)
+    body = json.dumps(payload).encode("utf-8")
+    if target.startswith(("http://", "https://")):
+        import urllib.request
+
+        url = target.rstrip("/")
+        if not url.endswith("/v1/traces"):
+            url += "/v1/traces"
+        request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=10):
+            pass
+    else:
+        Path(target).parent.mkdir(parents=True, exist_ok=True)
+        Path(target).write_bytes(body)
+    return len(payload["resourceSpans"][0]["scopeSpans"][0]["spans"])
+
+
+def finish_trace(chrome_path: Path | None = None, otlp_target: str | None = None) -> None:
+    """Export the trace and remove the temporary per-process parts.
+
+    Call it after the run's results are written: a failed export (e.g. an
+    unreachable collector) only prints a warning.
+    """
+    trace_dir = os.environ.get(TRACE_DIR_ENV)
+    if not trace_dir:
+        return
+    try:
+        if chrome_path:
+            try:
+                export_chrome_trace(chrome_path)
+            except OSError as e:
+                print(f"Warning: could not write trace to {chrome_path}: {e}", file=sys.stderr)
+        if otlp_target:
+            try:
+                export_otlp(otlp_target)
+            except (OSError, ValueError) as e:
+                print(f"Warning: could not export trace to {otlp_target}: {e}", file=sys.stderr)
+    finally:
+        shutil.rmtree(trace_dir, ignore_errors=True)
+        os.environ.pop(TRACE_DIR_ENV, None)
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""Compressed, indexed store for improve_description transcripts.
+
+Each optimization run appends its transcripts to one gzip-compressed JSONL
+segment (segments/<run_id>.jsonl.gz), one gzip member per record. Every
+record is indexed in a SQLite database (index.sqlite) by skill, run,
+iteration, timestamp and score, together with its member's byte offset and
+length, so transcripts can be searched and read without decompressing
+whole segments. A member whose index row was rolled back is never read.
+
+Long text fields (prompts, thinking) are split into paragraph chunks and
+stored once per content hash in the index database. Prompts across
+iterations and runs share most of their text (instructions, skill content),
+so each record only keeps the list of chunk hashes for those fields.
+
+Usage:
+    python -m scripts.transcript_store <store_dir> list [--skill NAME] [--min-score 0.8]
+    python -m scripts.transcript_store <store_dir> show <record_id>
+    python -m scripts.transcript_store <store_dir> extract <run_id> -o <dir>
+    python -m scripts.transcript_store <store_dir> ingest <logs_dir> --skill NAME
+    python -m scripts.transcript_store <store_dir> stats
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import time
+import zlib
+from pathlib import Path
+
+# Fields whose text is chunked and deduplicated by content hash
+CHUNKED_FIELDS = ("prompt", "thinking", "rewrite_prompt", "rewrite_thinking")
+
+# Paragraph breaks are the natural seams between the fixed and the
+# per-iteration parts of the improve prompt
+CHUNK_SPLIT = re.compile(r"(?<=\n\n)")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    iteration INTEGER,
+    timestamp TEXT NOT NULL,
+    score REAL,
+    passed INTEGER,
+    total INTEGER,
+    char_count INTEGER,
+    description TEXT,
+    segment TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    byte_offset INTEGER,
+    byte_length INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_transcripts_skill ON transcripts(skill);
+CREATE INDEX IF NOT EXISTS idx_transcripts_run ON transcripts(run_id, iteration);
+CREATE INDEX IF NOT EXISTS idx_transcripts_timestamp ON transcripts(timestamp);
+CREATE INDEX IF NOT EXISTS idx_transcripts_score ON transcripts(score);
+CREATE TABLE IF NOT EXISTS chunks (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
+
+def _chunk_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+class TranscriptStore:
+    """Append-only transcript segments plus a SQLite index and chunk table."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.segments_dir = self.root / "segments"
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.root / "index.sqlite", timeout=30)
+        self.db.executescript(SCHEMA)
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(transcripts)")}
+        if "byte_offset" not in columns:
+            # Stores written before offsets were indexed; their rows are read by line
+            self.db.execute("ALTER TABLE transcripts ADD COLUMN byte_offset INTEGER")
+            self.db.execute("ALTER TABLE transcripts ADD COLUMN byte_length INTEGER")
+            self.db.commit()
+
+    def close(self) -> None:
+        self.db.close()
+
+    # -- Writing ----------------------------------------------------------
+
+    def _store_text(self, text: str) -> list[str]:
+        """Split text into chunks, store unseen ones, return their hashes."""
+        hashes = []
+        for chunk in CHUNK_SPLIT.split(text):
+            if not chunk:
+                continue
+            h = _chunk_hash(chunk)
+            data = zlib.compress(chunk.encode("utf-8"))
+            self.db.execute(
+                "INSERT OR IGNORE INTO chunks (hash, size, data) VALUES (?, ?, ?)",
+                (h, len(chunk), data),
+            )
+            hashes.append(h)
+        return hashes
+
+    def append(
+        self,
+        run_id: str,
+        skill: str,
+        transcript: dict,
+        passed: int | None = None,
+        total: int | None = None,
+    ) -> int:
+        """Append one transcript to the run's segment and index it. Returns the record id."""
+        # Hold the write lock from choosing the line number and segment offset
+        # until the row is committed, so concurrent appenders never overlap
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            record_id = self._append_locked(run_id, skill, transcript, passed, total)
+        except BaseException:
+            self.db.rollback()
+            raise
+        self.db.commit()
+        return record_id
+
+    def _append_locked(self, run_id: str, skill: str, transcript: dict, passed: int | None, total: int | None) -> int:
+        record = dict(transcript)
+        for field in CHUNKED_FIELDS:
+            if isinstance(record.get(field), str):
+                record[field] = {"$chunks": self._store_text(record[field])}
+
+        segment = f"{run_id}.jsonl.gz"
+        segment_path = self.segments_dir / segment
+        line = self.db.execute(
+            "SELECT COALESCE(MAX(line) + 1, 0) FROM transcripts WHERE segment = ?", (segment,)
+        ).fetchone()[0]
+        # Each append adds a new gzip member, indexed by where it starts
+        member = gzip.compress((json.dumps(record) + "\n").encode("utf-8"))
+        with open(segment_path, "ab") as f:
+            offset = f.tell()
+            f.write(member)
+
+        score = passed / total if passed is not None and total else None
+        cursor = self.db.execute(
+            "INSERT INTO transcripts (run_id, skill, iteration, timestamp, score, passed, total,"
+            " char_count, description, segment, line, byte_offset, byte_length)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                run_id,
+                skill,
+                transcript.get("iteration"),
+                time.strftime("%Y-%m-%dT%H:%M:%S"),
+                score,
+                passed,
+                total,
+                transcript.get("char_count"),
+                transcript.get("final_description", transcript.get("parsed_description")),
+                segment,
+                line,
+                offset,
+                len(member),
+            ),
+        )
+        return cursor.lastrowid
+
+    # -- Reading ----------------------------------------------------------
+
+    def _load_text(self, hashes: list[str]) -> str:
+        rows = dict(self.db.execute(
+            f"SELECT hash, data FROM chunks WHERE hash IN ({','.join('?' * len(hashes))})",
+            hashes,
+        ).fetchall()) if hashes else {}
+        return "".join(zlib.decompress(rows[h]).decode("utf-8") for h in hashes)
+
+    def _read_segment_line(self, segment: str, line: int) -> dict:
+        """Read a record by line number, for rows indexed before byte offsets were."""
+        with gzip.open(self.segments_dir / segment, "rt", encoding="utf-8") as f:
+            for i, raw in enumerate(f):
+                if i == line:
+                    return json.loads(raw)
+        raise KeyError(f"Line {line} not found in segment {segment}")
+
+    @staticmethod
+    def _read_member(f, offset: int, length: int) -> dict:
+        f.seek(offset)
+        return json.loads(gzip.decompress(f.read(length)))
+
+    def _expand(self, record: dict) -> dict:
+        for field in CHUNKED_FIELDS:
+            value = record.get(field)
+            if isinstance(value, dict) and "$chunks" in value:
+                record[field] = self._load_text(value["$chunks"])
+        return record
+
+    def query(
+        self,
+        skill: str | None = None,
+        run_id: str | None = None,
+        min_score: float | None = None,
+        since: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Return index rows matching the filters, newest first."""
+        clauses = []
+        params: list = []
+        if skill:
+            clauses.append("skill = ?")
+            params.append(skill)
+        if run_id:
+            clauses.append("run_id = ?")
+            params.append(run_id)
+        if min_score is not None:
+            clauses.append("score >= ?")
+            params.append(min_score)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        sql = "SELECT * FROM transcripts"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC, id DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        cursor = self.db.execute(sql, params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def get(self, record_id: int) -> dict:
+        """Return the full transcript for an index row, with chunked fields restored."""
+        row = self.db.execute(
+            "SELECT segment, line, byte_offset, byte_length FROM transcripts WHERE id = ?", (record_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"No transcript with id {record_id}")
+        segment, line, offset, length = row
+        if offset is None:
+            return self._expand(self._read_segment_line(segment, line))
+        with open(self.segments_dir / segment, "rb") as f:
+            return self._expand(self._read_member(f, offset, length))
+
+    def iter_run(self, run_id: str):
+        """Yield every indexed transcript of a run in append order, opening its segment once."""
+        segment = f"{run_id}.jsonl.gz"
+        segment_path = self.segments_dir / segment
+        if not segment_path.exists():
+            raise KeyError(f"No segment for run {run_id}")
+        rows = self.db.execute(
+            "SELECT byte_offset, byte_length FROM transcripts WHERE segment = ? ORDER BY line", (segment,)
+        ).fetchall()
+        if any(offset is None for offset, _ in rows):
+            # Indexed before byte offsets: every line of the segment is a record
+            with gzip.open(segment_path, "rt", encoding="utf-8") as f:
+                for raw in f:
+                    yield self._expand(json.loads(raw))
+            return
+        with open(segment_path, "rb") as f:
+            for offset, length in rows:
+                yield self._expand(self._read_member(f, offset, length))
+
+    def stats(self) -> dict:
+        records, runs, skills = self.db.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT run_id), COUNT(DISTINCT skill) FROM transcripts"
+        ).fetchone()
+        chunk_count, raw_bytes, stored_bytes = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM chunks"
+        ).fetchone()
+        segment_bytes = sum(p.stat().st_size for p in self.segments_dir.glob("*.jsonl.gz"))
+        return {
+            "records": records,
+            "runs": runs,
+            "skills": skills,
+            "unique_chunks": chunk_count,
+            "unique_chunk_chars": raw_bytes,
+            "chunk_bytes_compressed": stored_bytes,
+            "segment_bytes": segment_bytes,
+        }
+
+
+def ingest_logs(store: TranscriptStore, logs_dir: Path, skill: str, run_id: str | None = None) -> int:
+    """Import legacy improve_iter_N.json files from a run_loop logs/ directory."""
+    run_id = run_id or logs_dir.parent.name or logs_dir.name
+    count = 0
+    for log_file in sorted(logs_dir.glob("improve_iter_*.json")):
+        try:
+            transcript = json.loads(log_file.read_text())
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Warning: skipping {log_file}: {e}", file=sys.stderr)
+            continue
+        store.append(run_id, skill, transcript)
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query and extract stored improve_description transcripts")
+    parser.add_argument("store", type=Path, help="Path to the transcript store directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_list = sub.add_parser("list", help="List indexed transcripts")
+    p_list.add_argument("--skill", default=None, help="Only this skill")
+    p_list.add_argument("--run", default=None, help="Only this run id")
+    p_list.add_argument("--min-score", type=float, default=None, help="Only transcripts scoring at least this (0-1)")
+    p_list.add_argument("--since", default=None, help="Only transcripts at or after this timestamp (YYYY-MM-DD[THH:MM:SS])")
+    p_list.add_argument("--limit", type=int, default=50, help="Max rows to print")
+    p_list.add_argument("--json", action="store_true", help="Print rows as JSON")
+
+    p_show = sub.add_parser("show", help="Print one full transcript as JSON")
+    p_show.add_argument("record_id", type=int, help="Transcript id (from list)")
+    p_show.add_argument("--field", default=None, help="Print only this field (e.g. prompt, thinking)")
+
+    p_extract = sub.add_parser("extract", help="Write a run's transcripts back out as improve_iter_N.json files")
+    p_extract.add_argument("run_id", help="Run id (from list)")
+    p_extract.add_argument("--output", "-o", type=Path, required=True, help="Output directory")
+
+    p_ingest = sub.add_parser("ingest", help="Import improve_iter_N.json files from a logs directory")
+    p_ingest.add_argument("logs_dir", type=Path, help="Directory containing improve_iter_*.json")
+    p_ingest.add_argument("--skill", required=True, help="Skill name to index them under")
+    p_ingest.add_argument("--run", default=None, help="Run id (default: name of the logs dir's parent)")
+
+    sub.add_parser("stats", help="Show store size and deduplication stats")
+
+    args = parser.parse_args()
+
+    if args.command != "ingest" and not (args.store / "index.sqlite").exists():
+        print(f"Error: No transcript store found at {args.store}", file=sys.stderr)
+        sys.exit(1)
+
+    store = TranscriptStore(args.store)
+    try:
+        if args.command == "list":
+            rows = store.query(args.skill, args.run, args.min_score, args.since, args.limit)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+                return
+            for row in rows:
+                score = f"{row['score']:.0%}" if row["score"] is not None else "  ?"
+                desc = (row["description"] or "")[:60]
+                print(f"{row['id']:>6}  {row['timestamp']}  {row['skill']:<24} {row['run_id']:<20} iter={row['iteration']}  score={score}  {desc}")
+        elif args.command == "show":
+            transcript = store.get(args.record_id)
+            if args.field:
+                print(transcript.get(args.field, ""))
+            else:
+                print(json.dumps(transcript, indent=2))
+        elif args.command == "extract":
+            args.output.mkdir(parents=True, exist_ok=True)
+            for transcript in store.iter_run(args.run_id):
+                out = args.output / f"improve_iter_{transcript.get('iteration') or 'unknown'}.json"
+                out.write_text(json.dumps(transcript, indent=2))
+                print(f"Extracted: {out}")
+        elif args.command == "ingest":
+            count = ingest_logs(store, args.logs_dir, args.skill, args.run)
+            print(f"Ingested {count} transcripts from {args.logs_dir}")
+        elif args.command == "stats":
+            print(json.dumps(store.stats(), indent=2))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    from scripts.profiling import run_profiled
+
+    run_profiled(main, "transcript_store")